@@ -0,0 +1,21 @@
+import os
+import sys
+
+APP_NAME = "github_publisher"
+
+
+def user_cache_dir(*parts):
+    """Возвращает (и при необходимости создает) каталог кэша приложения.
+    Базовый каталог можно переопределить переменной окружения GITHUB_PUBLISHER_CACHE_DIR."""
+    base = os.environ.get("GITHUB_PUBLISHER_CACHE_DIR")
+    if not base:
+        if sys.platform == "win32":
+            root = os.environ.get("LOCALAPPDATA") or os.path.expanduser("~\\AppData\\Local")
+        elif sys.platform == "darwin":
+            root = os.path.expanduser("~/Library/Caches")
+        else:
+            root = os.environ.get("XDG_CACHE_HOME") or os.path.expanduser("~/.cache")
+        base = os.path.join(root, APP_NAME)
+    path = os.path.join(base, *parts)
+    os.makedirs(path, exist_ok=True)
+    return path
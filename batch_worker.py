@@ -0,0 +1,64 @@
+import time
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+from PyQt6.QtCore import QThread, pyqtSignal
+
+from job_queue import ResourceLimiter
+
+
+class BatchWorker(QThread):
+    """Выполняет задания очереди пакетной публикации: несколько проектов одновременно,
+    с ограничением параллельности по классам ресурсов и повтором неудачных заданий"""
+    log_signal = pyqtSignal(str)
+    job_updated_signal = pyqtSignal()
+    finished_signal = pyqtSignal()
+
+    def __init__(self, job_queue, pipeline_factory, max_parallel_jobs=4, resource_limits=None):
+        super().__init__()
+        self.job_queue = job_queue
+        # pipeline_factory(project_path, repo_name, options, resources, log) -> объект с методом publish()
+        self.pipeline_factory = pipeline_factory
+        self.max_parallel_jobs = max_parallel_jobs
+        self.resources = ResourceLimiter(resource_limits)
+        self._stop_requested = False
+
+    def stop(self):
+        """Не берет новые задания; уже запущенные доводятся до конца"""
+        self._stop_requested = True
+
+    def run(self):
+        self.log_signal.emit(f"Пакетная публикация запущена (одновременно до {self.max_parallel_jobs} проектов).")
+        running = set()
+        with ThreadPoolExecutor(max_workers=self.max_parallel_jobs) as executor:
+            while True:
+                while not self._stop_requested and len(running) < self.max_parallel_jobs:
+                    job = self.job_queue.claim_next()
+                    if job is None:
+                        break
+                    self.job_updated_signal.emit()
+                    running.add(executor.submit(self._run_job, job))
+
+                if running:
+                    _, running = wait(running, timeout=1, return_when=FIRST_COMPLETED)
+                elif not self._stop_requested and self.job_queue.has_pending():
+                    # Остались только задания, ожидающие повторной попытки
+                    time.sleep(1)
+                else:
+                    break
+        self.log_signal.emit("Пакетная публикация завершена.")
+        self.finished_signal.emit()
+
+    def _run_job(self, job):
+        repo_name = job["repo_name"]
+        self.log_signal.emit(f"[{repo_name}] Попытка {job['attempts']} из {job['max_attempts']}: {job['project_path']}")
+        try:
+            pipeline = self.pipeline_factory(job["project_path"], repo_name, job["options"], self.resources,
+                                             lambda message: self.log_signal.emit(f"[{repo_name}] {message}"))
+            pipeline.publish()
+            self.job_queue.mark_done(job["id"])
+            self.log_signal.emit(f"[{repo_name}] Публикация завершена.")
+        except Exception as e:
+            if self.job_queue.mark_failed(job["id"], e):
+                self.log_signal.emit(f"[{repo_name}] Ошибка: {e}. Задание будет повторено.")
+            else:
+                self.log_signal.emit(f"[{repo_name}] Ошибка: {e}. Попытки исчерпаны.")
+        self.job_updated_signal.emit()
@@ -0,0 +1,100 @@
+"""Бенчмарк первого коммита нового репозитория на синтетических деревьях файлов.
+
+Сравнивает два способа: обычные git add . и git commit (add) и потоковую передачу файлов
+в git fast-import (fast-import, см. bulk_commit.py). Для каждого способа измеряется время коммита
+и, с --push, время отправки результата в локальный bare-репозиторий. Деревья коммитов обоих
+способов сравниваются: они должны совпадать.
+
+    python benchmark_commit.py [--sizes 1k,100k] [--repeat 3] [--push]
+
+Деревья создаются так же, как в benchmark_scanner.py, и переиспользуются.
+"""
+import sys
+import os
+import time
+import shutil
+import argparse
+import statistics
+import tempfile
+import subprocess
+
+from benchmark_scanner import ensure_tree, parse_size
+from bulk_commit import BulkCommit
+
+METHODS = ("add", "fast-import")
+
+
+def git(root, *args):
+    subprocess.run(["git", *args], cwd=root, check=True, stdout=subprocess.PIPE, stderr=subprocess.DEVNULL)
+
+
+def run_method(root, method, remote):
+    """Создает первый коммит в дереве и возвращает (секунды коммита, секунды push, хэш дерева)"""
+    shutil.rmtree(os.path.join(root, ".git"), ignore_errors=True)
+    git(root, "init", "-q")
+    started = time.perf_counter()
+    if method == "add":
+        git(root, "add", ".")
+        git(root, "commit", "-q", "-m", "Initial commit")
+    else:
+        BulkCommit(root).commit("Initial commit")
+    commit_seconds = time.perf_counter() - started
+
+    push_seconds = None
+    if remote:
+        shutil.rmtree(remote, ignore_errors=True)
+        subprocess.run(["git", "init", "-q", "--bare", remote], check=True)
+        started = time.perf_counter()
+        git(root, "push", "-q", remote, "HEAD:refs/heads/master")
+        push_seconds = time.perf_counter() - started
+    tree = subprocess.run(["git", "rev-parse", "HEAD^{tree}"], cwd=root, check=True, capture_output=True,
+                          text=True).stdout.strip()
+    return commit_seconds, push_seconds, tree
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Бенчмарк первого коммита: git add/commit и git fast-import")
+    parser.add_argument("--sizes", default="1k,100k", help="размеры деревьев через запятую (1k, 100k, 1m)")
+    parser.add_argument("--work-dir", default=os.path.join(tempfile.gettempdir(), "github_publisher_bench"),
+                        help="каталог для синтетических деревьев (они переиспользуются между запусками)")
+    parser.add_argument("--repeat", type=int, default=3, help="число повторов; время берется как медиана")
+    parser.add_argument("--push", action="store_true", help="измерить и отправку коммита в локальный bare-репозиторий")
+    args = parser.parse_args(argv)
+
+    log = lambda message: print(message, file=sys.stderr)
+    os.makedirs(args.work_dir, exist_ok=True)
+    remote = os.path.join(args.work_dir, "remote.git") if args.push else None
+    failed = False
+    for label in [size.strip() for size in args.sizes.split(",") if size.strip()]:
+        root = ensure_tree(args.work_dir, label, parse_size(label), log)
+        runs = {method: [] for method in METHODS}
+        try:
+            for _ in range(max(1, args.repeat)):
+                # Способы чередуются, чтобы оба работали с одинаково прогретым кэшем файловой системы
+                for method in METHODS:
+                    runs[method].append(run_method(root, method, remote))
+        finally:
+            shutil.rmtree(os.path.join(root, ".git"), ignore_errors=True)
+            if remote:
+                shutil.rmtree(remote, ignore_errors=True)
+
+        trees = {run[2] for method_runs in runs.values() for run in method_runs}
+        if len(trees) != 1:
+            print(f"{label:>5}: ОШИБКА: деревья коммитов различаются: {', '.join(sorted(trees))}")
+            failed = True
+        medians = {method: (statistics.median(run[0] for run in method_runs),
+                            statistics.median(run[1] for run in method_runs) if args.push else None)
+                   for method, method_runs in runs.items()}
+        for method in METHODS:
+            commit_seconds, push_seconds = medians[method]
+            line = f"{label:>5} {method:<11} коммит {commit_seconds * 1000:9.1f} мс"
+            if push_seconds is not None:
+                line += f", push {push_seconds * 1000:9.1f} мс"
+            print(line)
+        speedup = medians["add"][0] / medians["fast-import"][0] if medians["fast-import"][0] else 0
+        print(f"{label:>5} ускорение коммита: x{speedup:.2f}")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
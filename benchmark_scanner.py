@@ -0,0 +1,295 @@
+"""Бенчмарк анализа проекта на синтетических деревьях файлов.
+
+Генерирует деревья заданного размера (вложенные node_modules, манифесты package.json,
+requirements.txt, .csproj, pom.xml, длинные имена файлов) и в отдельных процессах
+выполняет analyze_project и generate_readme_content без ИИ. Для каждого дерева измеряются
+два режима: cold (без индекса сканирования) и warm (индекс от предыдущего запуска).
+Выводятся время, пиковое потребление памяти (RSS) и число системных вызовов: через strace -c,
+если он установлен, иначе - счетчики чтения/записи из /proc/self/io и события аудита Python
+(open, os.scandir, os.listdir).
+
+    python benchmark_scanner.py [--sizes 1k,100k,1m] [--repeat 3] [--save-baseline] [--threshold 0.25]
+
+Результаты сравниваются с benchmark_baseline.json; --save-baseline записывает их как новую базу.
+Код возврата 1 означает, что время или память выросли больше, чем на threshold.
+"""
+import sys
+import os
+import json
+import random
+import shutil
+import argparse
+import platform
+import statistics
+import tempfile
+import subprocess
+
+APP_DIR = os.path.dirname(os.path.abspath(__file__))
+BASELINE_PATH = os.path.join(APP_DIR, "benchmark_baseline.json")
+
+# Формат дерева; при изменении генератора деревья создаются заново
+TREE_FORMAT = 1
+FILES_PER_DIR = 40
+NODE_MODULES_SHARE = 0.3
+# Рост времени меньше этого значения (секунды) не считается регрессией: на маленьких деревьях это шум
+MIN_REGRESSION_SECONDS = 0.02
+SOURCE_SUFFIXES = [".py", ".js", ".ts", ".cs", ".java", ".cpp", ".h", ".go", ".rs", ".md", ".json", ".txt",
+                   ".png", ".yml"]
+DIR_NAMES = ["src", "lib", "app", "services", "modules", "tests", "docs", "assets", "core", "utils"]
+WORDS = ["alpha", "bravo", "charlie", "delta", "echo", "foxtrot", "golf", "hotel", "india", "juliett",
+         "kilo", "lima", "mike", "november", "oscar", "papa", "quebec", "romeo", "sierra", "tango"]
+SUBPROJECT_MANIFESTS = {
+    "package.json": '{"name": "service", "description": "Synthetic service", "dependencies": {"express": "^4.0.0"}}',
+    "requirements.txt": "requests>=2.28.0\nPyQt6>=6.4.0\n",
+    "Service.csproj": '<Project Sdk="Microsoft.NET.Sdk"><PropertyGroup>'
+                      '<TargetFramework>net8.0</TargetFramework></PropertyGroup></Project>',
+    "pom.xml": "<project><modelVersion>4.0.0</modelVersion><groupId>bench</groupId>"
+               "<artifactId>service</artifactId><version>1.0</version></project>",
+}
+
+CHILD_SCRIPT = """
+import sys, os, json, time, collections
+app_dir, project_path = sys.argv[1], sys.argv[2]
+sys.path.insert(0, app_dir)
+AUDITED = ("open", "os.scandir", "os.listdir")
+events = collections.Counter()
+def audit(event, args):
+    if event in AUDITED:
+        events[event] += 1
+sys.addaudithook(audit)
+
+def proc_io():
+    try:
+        with open("/proc/self/io", "r") as f:
+            return {key: int(value) for key, value in (line.split(": ") for line in f.read().splitlines())}
+    except OSError:
+        return {}
+
+from project_scanner import analyze_project
+from publisher_core import PublishPipeline
+io_before = proc_io()
+started = time.perf_counter()
+project_info = analyze_project(project_path, "bench")
+analyzed = time.perf_counter()
+readme = PublishPipeline(project_path, "bench", use_llm=False).generate_readme_content(project_info)
+finished = time.perf_counter()
+io_after = proc_io()
+try:
+    import resource
+    peak_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    peak_rss_kb = peak_rss // 1024 if sys.platform == "darwin" else peak_rss
+except ImportError:
+    peak_rss_kb = None
+print(json.dumps({
+    "analyze_seconds": analyzed - started,
+    "readme_seconds": finished - analyzed,
+    "peak_rss_kb": peak_rss_kb,
+    "read_syscalls": io_after["syscr"] - io_before["syscr"] if io_before else None,
+    "write_syscalls": io_after["syscw"] - io_before["syscw"] if io_before else None,
+    "audit_events": dict(events),
+    "main_files": len(project_info["main_files"]),
+    "technologies": sorted(project_info["technologies"]),
+    "readme_bytes": len(readme.encode("utf-8")),
+}))
+"""
+
+
+def parse_size(text):
+    text = text.strip().lower()
+    multiplier = {"k": 1000, "m": 1000000}.get(text[-1:], 1)
+    return int(float(text.rstrip("km")) * multiplier)
+
+
+def _long_name(rng, suffix):
+    name = "_".join(rng.choice(WORDS) for _ in range(rng.randint(15, 25)))
+    return name[:200] + suffix
+
+
+class TreeGenerator:
+    """Детерминированно создает синтетический проект из file_count файлов"""
+
+    def __init__(self, root, file_count, seed=1):
+        self.root = root
+        self.file_count = file_count
+        self.rng = random.Random(seed)
+        self.created = 0
+
+    def touch(self, path, content=""):
+        with open(path, "w", encoding="utf-8") as f:
+            if content:
+                f.write(content)
+        self.created += 1
+
+    def generate(self):
+        os.makedirs(self.root, exist_ok=True)
+        self.touch(os.path.join(self.root, ".gitignore"), "*.log\n/generated/\n")
+        self.touch(os.path.join(self.root, "main.py"), "def main():\n    pass\n")
+        self.touch(os.path.join(self.root, "LICENSE"), "MIT License\n")
+        for name, content in SUBPROJECT_MANIFESTS.items():
+            self.touch(os.path.join(self.root, name), content)
+
+        # Вложенные зависимости в стиле npm: node_modules/a/node_modules/b/...
+        node_modules_budget = int(self.file_count * NODE_MODULES_SHARE)
+        index = 0
+        while self.created < node_modules_budget:
+            path = self.root
+            for level in range(self.rng.randint(1, 8)):
+                path = os.path.join(path, "node_modules", f"pkg{index}_{level}")
+            os.makedirs(path, exist_ok=True)
+            self.touch(os.path.join(path, "package.json"), f'{{"name": "pkg{index}"}}')
+            for number in range(min(FILES_PER_DIR, node_modules_budget - self.created)):
+                self.touch(os.path.join(path, f"module_{number}.js"))
+            index += 1
+
+        # Исходный код с подпроектами и длинными именами файлов
+        while self.created < self.file_count:
+            parts = [self.rng.choice(DIR_NAMES) for _ in range(self.rng.randint(1, 6))]
+            path = os.path.join(self.root, *parts, f"d{index}")
+            os.makedirs(path, exist_ok=True)
+            if self.rng.random() < 0.02:
+                name = self.rng.choice(list(SUBPROJECT_MANIFESTS))
+                self.touch(os.path.join(path, name), SUBPROJECT_MANIFESTS[name])
+            for number in range(min(FILES_PER_DIR, self.file_count - self.created)):
+                suffix = self.rng.choice(SOURCE_SUFFIXES)
+                name = _long_name(self.rng, suffix) if self.rng.random() < 0.05 else f"file_{number}{suffix}"
+                self.touch(os.path.join(path, name))
+            index += 1
+        return self.created
+
+
+def ensure_tree(work_dir, label, file_count, log):
+    """Создает дерево или переиспользует созданное ранее"""
+    root = os.path.join(work_dir, f"tree_{label}")
+    marker_path = os.path.join(work_dir, f"tree_{label}.json")
+    marker = {"format": TREE_FORMAT, "files": file_count}
+    try:
+        with open(marker_path, "r", encoding="utf-8") as f:
+            if json.load(f) == marker and os.path.isdir(root):
+                return root
+    except (OSError, ValueError):
+        pass
+    if os.path.exists(root):
+        shutil.rmtree(root)
+    log(f"Создание дерева {label} ({file_count} файлов) в {root}...")
+    TreeGenerator(root, file_count).generate()
+    with open(marker_path, "w", encoding="utf-8") as f:
+        json.dump(marker, f)
+    return root
+
+
+def _parse_strace_total(path):
+    # Последняя строка сводки strace -c: "100.00  0.012345  ...  calls  errors  total"
+    with open(path, "r", encoding="utf-8", errors="replace") as f:
+        for line in reversed(f.read().splitlines()):
+            fields = line.split()
+            if fields and fields[-1] == "total":
+                numbers = [field for field in fields[:-1] if field.isdigit()]
+                return int(numbers[0]) if numbers else None
+    return None
+
+
+def run_child(project_path, cache_dir):
+    env = dict(os.environ, GITHUB_PUBLISHER_CACHE_DIR=cache_dir)
+    command = [sys.executable, "-c", CHILD_SCRIPT, APP_DIR, project_path]
+    strace = shutil.which("strace")
+    strace_output = None
+    if strace:
+        strace_output = os.path.join(cache_dir, "strace.txt")
+        command = [strace, "-f", "-c", "-o", strace_output] + command
+    process = subprocess.run(command, env=env, capture_output=True, text=True)
+    if process.returncode != 0:
+        raise RuntimeError(f"Бенчмарк завершился с ошибкой:\n{process.stderr}")
+    result = json.loads(process.stdout.strip().splitlines()[-1])
+    result["syscalls"] = _parse_strace_total(strace_output) if strace_output else None
+    return result
+
+
+def compare(result, base, threshold):
+    """Возвращает (строка сравнения, есть ли регрессия)"""
+    notes = []
+    regressed = False
+    for key, title in (("analyze_seconds", "время"), ("peak_rss_kb", "память")):
+        if not base.get(key) or result.get(key) is None:
+            continue
+        change = result[key] / base[key] - 1
+        notes.append(f"{title} {change:+.0%}")
+        if key == "analyze_seconds" and result[key] - base[key] < MIN_REGRESSION_SECONDS:
+            continue
+        regressed = regressed or change > threshold
+    return ", ".join(notes), regressed
+
+
+def format_result(label, mode, result):
+    syscalls = (f"syscalls {result['syscalls']}" if result["syscalls"] is not None else
+                f"read {result['read_syscalls']}, write {result['write_syscalls']}, "
+                f"scandir {result['audit_events'].get('os.scandir', 0)}, open {result['audit_events'].get('open', 0)}")
+    rss = f"{result['peak_rss_kb'] / 1024:.1f} МБ" if result["peak_rss_kb"] is not None else "н/д"
+    return (f"{label:>5} {mode:<5} анализ {result['analyze_seconds'] * 1000:9.1f} мс, "
+            f"README {result['readme_seconds'] * 1000:6.1f} мс, RSS {rss}, {syscalls}")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Бенчмарк анализа проекта на синтетических деревьях")
+    parser.add_argument("--sizes", default="1k,100k", help="размеры деревьев через запятую (1k, 100k, 1m)")
+    parser.add_argument("--work-dir", default=os.path.join(tempfile.gettempdir(), "github_publisher_bench"),
+                        help="каталог для синтетических деревьев (они переиспользуются между запусками)")
+    parser.add_argument("--baseline", default=BASELINE_PATH, help="файл базовых результатов")
+    parser.add_argument("--save-baseline", action="store_true", help="записать результаты как новую базу")
+    parser.add_argument("--threshold", type=float, default=0.25,
+                        help="допустимый рост времени и памяти относительно базы (доля)")
+    parser.add_argument("--repeat", type=int, default=3, help="число повторов; время берется как медиана")
+    parser.add_argument("--clean", action="store_true", help="удалить синтетические деревья после запуска")
+    args = parser.parse_args(argv)
+
+    log = lambda message: print(message, file=sys.stderr)
+    os.makedirs(args.work_dir, exist_ok=True)
+    try:
+        with open(args.baseline, "r", encoding="utf-8") as f:
+            baseline = json.load(f)
+    except (OSError, ValueError):
+        baseline = {"results": {}}
+
+    results = {}
+    failed = False
+    for label in [size.strip() for size in args.sizes.split(",") if size.strip()]:
+        root = ensure_tree(args.work_dir, label, parse_size(label), log)
+        runs = {"cold": [], "warm": []}
+        for _ in range(max(1, args.repeat)):
+            cache_dir = tempfile.mkdtemp(prefix="cache_", dir=args.work_dir)
+            try:
+                # cold: индекса еще нет; warm: индекс записан предыдущим запуском в тот же каталог кэша
+                for mode in ("cold", "warm"):
+                    runs[mode].append(run_child(root, cache_dir))
+            finally:
+                shutil.rmtree(cache_dir, ignore_errors=True)
+        for mode, mode_runs in runs.items():
+            result = dict(mode_runs[0])
+            for key in ("analyze_seconds", "readme_seconds"):
+                result[key] = statistics.median(run[key] for run in mode_runs)
+            if result["peak_rss_kb"] is not None:
+                result["peak_rss_kb"] = max(run["peak_rss_kb"] for run in mode_runs)
+            results.setdefault(label, {})[mode] = result
+            line = format_result(label, mode, result)
+            base = baseline["results"].get(label, {}).get(mode)
+            if base:
+                notes, regressed = compare(result, base, args.threshold)
+                line += f" | к базе: {notes}{' РЕГРЕССИЯ' if regressed else ''}"
+                failed = failed or regressed
+            print(line)
+        if args.clean:
+            shutil.rmtree(root, ignore_errors=True)
+            os.remove(os.path.join(args.work_dir, f"tree_{label}.json"))
+
+    if args.save_baseline:
+        baseline["machine"] = {"platform": platform.platform(), "python": platform.python_version(),
+                               "cpu_count": os.cpu_count()}
+        baseline["results"].update(results)
+        with open(args.baseline, "w", encoding="utf-8") as f:
+            json.dump(baseline, f, ensure_ascii=False, indent=2, sort_keys=True)
+            f.write("\n")
+        print(f"Базовые результаты сохранены: {args.baseline}")
+    return 1 if failed and not args.save_baseline else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,209 @@
+import os
+import stat
+import subprocess
+
+# Первый коммит нового репозитория создается через git fast-import; 0 - обычные git add и git commit
+BULK_COMMIT = os.environ.get("GITHUB_PUBLISHER_BULK_COMMIT", "1") != "0"
+# Файлы больше этого размера передаются в git fast-import частями, а не читаются в память целиком
+STREAM_BLOCK_SIZE = 1024 * 1024
+
+_TRUE_VALUES = ("true", "yes", "on", "1")
+# Байты, которые git считает печатными при определении текстовых файлов (convert.c: gather_stats)
+_PRINTABLE = bytes(range(32, 127)) + bytes(range(128, 256)) + b"\b\t\x1b\x0c\r\n"
+
+
+def _is_binary(data):
+    """Та же проверка, что в git (convert_is_binary): NUL, одиночный CR или много непечатных байт"""
+    if b"\0" in data:
+        return True
+    crlf = data.count(b"\r\n")
+    if data.count(b"\r") != crlf:
+        return True
+    nonprintable = len(data.translate(None, _PRINTABLE))
+    if data.endswith(b"\x1a"):
+        nonprintable -= 1
+    printable = len(data) - nonprintable - crlf - data.count(b"\n")
+    return (printable >> 7) < nonprintable
+
+
+def _quote_path(path):
+    # Путь в команде fast-import заключается в кавычки, только если иначе он читается неоднозначно
+    if not path.startswith(b'"') and b"\n" not in path:
+        return path
+    escaped = path.replace(b"\\", b"\\\\").replace(b'"', b'\\"').replace(b"\n", b"\\n")
+    return b'"' + escaped + b'"'
+
+
+class BulkCommit:
+    """Первый коммит нового репозитория без индекса: список файлов берется из git ls-files
+    (те же правила .gitignore, что у git add), содержимое потоком передается в git fast-import,
+    который сразу пишет один pack-файл и обновляет ветку. Индекс затем строится из дерева коммита
+    (git read-tree), без повторного чтения файлов.
+    stage_files() можно вызвать заранее, пока отложенные файлы (README.md) еще создаются;
+    commit() добавляет их и создает коммит. Если результат мог бы отличаться от git add
+    (.gitattributes, вложенные репозитории), коммит нужно создать обычным способом."""
+
+    def __init__(self, repo_path, log=None):
+        self.repo_path = repo_path
+        self.log = log or (lambda message: None)
+        self.subprocesses = 0
+        self.files = 0
+        self.bytes = 0
+        self._process = None
+        self._entries = []  # (режим, метка blob, путь) для команды commit
+        self._deferred = []
+        self._filemode = True
+        self._autocrlf = False
+
+    def _git(self, *args):
+        self.subprocesses += 1
+        process = subprocess.run(["git", *args], cwd=self.repo_path, capture_output=True)
+        if process.returncode != 0:
+            raise Exception(f"Команда git {' '.join(args)} завершилась с ошибкой (код {process.returncode}): "
+                            f"{process.stderr.decode('utf-8', 'replace').strip()}")
+        return process.stdout
+
+    def _config(self):
+        config = {}
+        for item in self._git("config", "-z", "--list").split(b"\0"):
+            if item:
+                key, _, value = item.decode("utf-8", "replace").partition("\n")
+                config[key.lower()] = value
+        return config
+
+    def _unsupported_reason(self, config, paths):
+        """Причина, по которой fast-import может дать другой коммит, чем git add; None - причин нет"""
+        if any(path.endswith(b"/") for path in paths):
+            return "в проекте есть вложенные Git-репозитории"
+        if any(path == b".gitattributes" or path.endswith(b"/.gitattributes") for path in paths):
+            return "в проекте есть .gitattributes"
+        xdg_config = os.environ.get("XDG_CONFIG_HOME") or os.path.join(os.path.expanduser("~"), ".config")
+        if (config.get("core.attributesfile") or os.path.exists(os.path.join(xdg_config, "git", "attributes"))
+                or os.path.exists(os.path.join(self.repo_path, ".git", "info", "attributes"))):
+            return "заданы глобальные атрибуты Git"
+        return None
+
+    def _untracked(self, *pathspecs):
+        output = self._git("ls-files", "-z", "--others", "--exclude-standard", "--", *pathspecs)
+        return [path for path in output.split(b"\0") if path]
+
+    def stage_files(self, deferred=()):
+        """Запускает git fast-import и передает ему все файлы проекта, кроме отложенных deferred.
+        Возвращает False, если коммит нужно создать через git add"""
+        paths = self._untracked()
+        config = self._config()
+        reason = self._unsupported_reason(config, paths)
+        if reason:
+            self.log(f"Первый коммит создается через git add: {reason}.")
+            return False
+
+        self._filemode = config.get("core.filemode", "true").lower() in _TRUE_VALUES
+        # Как git add при core.autocrlf: CRLF в текстовых файлах заменяется на LF
+        self._autocrlf = config.get("core.autocrlf", "false").lower() in _TRUE_VALUES + ("input",)
+        self._deferred = list(deferred)
+        deferred_paths = {os.fsencode(path) for path in deferred}
+
+        self.log(f"Передача {len(paths)} файлов в git fast-import...")
+        self.subprocesses += 1
+        self._process = subprocess.Popen(["git", "fast-import", "--quiet", "--done"], cwd=self.repo_path,
+                                         stdin=subprocess.PIPE, stdout=subprocess.DEVNULL, stderr=subprocess.PIPE)
+        try:
+            for path in paths:
+                if path not in deferred_paths:
+                    mark = len(self._entries) + 1
+                    mode = self._write_data(path, lambda mode: b"blob\nmark :%d\n" % mark)
+                    self._entries.append((mode, mark, path))
+        except BrokenPipeError:
+            self._finish_process()
+        except BaseException:
+            self.close()
+            raise
+        return True
+
+    def commit(self, message):
+        """Создает коммит и возвращает его хэш; None - нужен обычный git add и git commit"""
+        if self._process is None and not self.stage_files():
+            return None
+        # Отложенные файлы попадают в коммит, только если их не исключает .gitignore, как при git add
+        deferred = self._untracked(*(f":(literal){path}" for path in self._deferred)) if self._deferred else []
+        branch = self._git("symbolic-ref", "HEAD").strip()
+        author = self._git("var", "GIT_AUTHOR_IDENT").strip()
+        committer = self._git("var", "GIT_COMMITTER_IDENT").strip()
+        message = message.encode("utf-8") + b"\n"
+        try:
+            stream = self._process.stdin
+            stream.write(b"commit %s\nauthor %s\ncommitter %s\ndata %d\n%s" % (branch, author, committer,
+                                                                            len(message), message))
+            stream.write(b"".join(b"M %s :%d %s\n" % (mode, mark, _quote_path(path))
+                                  for mode, mark, path in self._entries))
+            for path in deferred:
+                self._write_data(path, lambda mode: b"M %s inline %s\n" % (mode, _quote_path(path)))
+            stream.write(b"\ndone\n")
+        except BrokenPipeError:
+            pass
+        except BaseException:
+            self.close()
+            raise
+        self._finish_process()
+
+        # Индекс нужен для следующих коммитов (например, README.md со скриншотом при создании релиза)
+        self._git("read-tree", "HEAD")
+        # После read-tree в индексе нет сведений о файлах на диске, и каждый git status сравнивал бы
+        # все файлы по содержимому; --refresh один раз заполняет их (-q: измененные файлы не ошибка)
+        self._git("update-index", "-q", "--refresh")
+        commit = self._git("rev-parse", "HEAD").decode("ascii").strip()
+        self.log(f"Коммит {commit[:10]} создан через git fast-import: {self.files} файлов, "
+                 f"{self.bytes / (1024 * 1024):.1f} МБ.")
+        return commit
+
+    def _finish_process(self):
+        process = self._process
+        try:
+            process.stdin.close()
+        except BrokenPipeError:
+            pass
+        errors = process.stderr.read()
+        if process.wait() != 0:
+            raise Exception(f"git fast-import завершился с ошибкой (код {process.returncode}): "
+                            f"{errors.decode('utf-8', 'replace').strip()}")
+
+    def close(self):
+        """Останавливает git fast-import, если коммит так и не был создан"""
+        if self._process is not None and self._process.poll() is None:
+            self._process.kill()
+            self._process.wait()
+
+    def _write_data(self, path, header):
+        """Пишет команду header(режим файла) и содержимое файла блоком data; возвращает режим файла"""
+        stream = self._process.stdin
+        full_path = os.path.join(self.repo_path, os.fsdecode(path))
+        st = os.lstat(full_path)
+        if stat.S_ISLNK(st.st_mode):
+            mode = b"120000"
+            data = os.fsencode(os.readlink(full_path))
+            stream.write(header(mode) + b"data %d\n%s\n" % (len(data), data))
+            self.files += 1
+            self.bytes += len(data)
+            return mode
+        mode = b"100755" if self._filemode and st.st_mode & stat.S_IXUSR else b"100644"
+        with open(full_path, "rb") as f:
+            if st.st_size > STREAM_BLOCK_SIZE and not self._autocrlf:
+                size = os.fstat(f.fileno()).st_size
+                stream.write(header(mode) + b"data %d\n" % size)
+                remaining = size
+                while remaining:
+                    chunk = f.read(min(STREAM_BLOCK_SIZE, remaining))
+                    if not chunk:
+                        raise Exception(f"Файл изменился во время создания коммита: {os.fsdecode(path)}")
+                    stream.write(chunk)
+                    remaining -= len(chunk)
+                stream.write(b"\n")
+            else:
+                data = f.read()
+                if self._autocrlf and b"\r\n" in data and not _is_binary(data):
+                    data = data.replace(b"\r\n", b"\n")
+                size = len(data)
+                stream.write(header(mode) + b"data %d\n%s\n" % (size, data))
+        self.files += 1
+        self.bytes += size
+        return mode
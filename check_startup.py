@@ -0,0 +1,124 @@
+"""Проверка времени запуска GitHub Publisher.
+
+Запускает github_publisher_gui.py в отдельных процессах и:
+- выводит самые тяжелые импорты по отчету python -X importtime;
+- проверяет, что модули, загружаемые по требованию, не импортируются при запуске;
+- сравнивает медианное время до показа окна с бюджетом.
+
+Код возврата 1 означает регрессию времени запуска.
+
+    python check_startup.py [--runs 5] [--budget-ms 250] [--top 15]
+"""
+import sys
+import os
+import json
+import argparse
+import statistics
+import subprocess
+
+APP_DIR = os.path.dirname(os.path.abspath(__file__))
+
+# Бюджет времени от начала импорта до показа окна (мс)
+STARTUP_BUDGET_MS = float(os.environ.get("GITHUB_PUBLISHER_STARTUP_BUDGET_MS", "250"))
+
+# Модули, которые не должны загружаться до первого использования
+LAZY_MODULES = [
+    "requests", "gemini_api_client", "ollama_client", "llm_cache", "prompt_builder",
+    "project_scanner", "publisher_core", "release_core", "release_worker",
+    "batch_worker", "job_queue", "github_client", "sqlite3", "subprocess", "PIL", "speculation", "model_routing",
+    "readme_sections", "project_detectors",
+]
+
+WINDOW_PROBE = """
+import sys, time, json
+started = time.perf_counter()
+import github_publisher_gui as gui
+from PyQt6.QtWidgets import QApplication
+imported = time.perf_counter()
+gui.app = QApplication(sys.argv[:1])
+window = gui.GitHubPublisherApp()
+window.show()
+gui.app.processEvents()
+shown = time.perf_counter()
+print(json.dumps({
+    "import_ms": (imported - started) * 1000,
+    "window_ms": (shown - started) * 1000,
+    "modules": sorted(sys.modules),
+}))
+"""
+
+
+def child_env(offscreen):
+    env = dict(os.environ)
+    if offscreen:
+        env["QT_QPA_PLATFORM"] = "offscreen"
+    return env
+
+
+def parse_importtime(stderr):
+    """Разбирает вывод -X importtime: [(собственное время, суммарное время, отступ, модуль)] в микросекундах"""
+    rows = []
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:"):].split("|", 2)
+        rows.append((int(self_us), int(cumulative_us), (len(name) - len(name.lstrip())) // 2, name.strip()))
+    return rows
+
+
+def run_importtime(env):
+    process = subprocess.run([sys.executable, "-X", "importtime", "-c", "import github_publisher_gui"],
+                             cwd=APP_DIR, env=env, capture_output=True, text=True)
+    if process.returncode != 0:
+        raise RuntimeError(f"Не удалось импортировать github_publisher_gui:\n{process.stderr}")
+    return parse_importtime(process.stderr)
+
+
+def run_window_probe(env):
+    process = subprocess.run([sys.executable, "-c", WINDOW_PROBE], cwd=APP_DIR, env=env,
+                             capture_output=True, text=True)
+    if process.returncode != 0:
+        raise RuntimeError(f"Не удалось создать окно приложения:\n{process.stderr}")
+    return json.loads(process.stdout.strip().splitlines()[-1])
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Проверка времени запуска GitHub Publisher")
+    parser.add_argument("--runs", type=int, default=5, help="количество запусков для медианы")
+    parser.add_argument("--budget-ms", type=float, default=STARTUP_BUDGET_MS,
+                        help="бюджет времени до показа окна, мс")
+    parser.add_argument("--top", type=int, default=15, help="сколько самых тяжелых импортов показать")
+    parser.add_argument("--offscreen", action="store_true",
+                        help="создавать окно без дисплея (QT_QPA_PLATFORM=offscreen)")
+    args = parser.parse_args(argv)
+
+    offscreen = args.offscreen or (sys.platform.startswith("linux")
+                                   and not os.environ.get("DISPLAY") and not os.environ.get("WAYLAND_DISPLAY"))
+    env = child_env(offscreen)
+
+    rows = run_importtime(env)
+    print(f"Самые тяжелые импорты (из {len(rows)}), суммарное время:")
+    for self_us, cumulative_us, depth, name in sorted(rows, key=lambda row: -row[1])[:args.top]:
+        print(f"  {cumulative_us / 1000:8.1f} мс  {self_us / 1000:7.1f} мс собств.  {'  ' * depth}{name}")
+
+    probes = [run_window_probe(env) for _ in range(max(1, args.runs))]
+    import_ms = statistics.median(probe["import_ms"] for probe in probes)
+    window_ms = statistics.median(probe["window_ms"] for probe in probes)
+    print(f"Импорт github_publisher_gui: {import_ms:.1f} мс, до показа окна: {window_ms:.1f} мс "
+          f"(медиана {len(probes)} запусков, бюджет {args.budget_ms:.0f} мс)")
+
+    failed = False
+    loaded = sorted(set(LAZY_MODULES) & set(probes[0]["modules"]))
+    if loaded:
+        print(f"ОШИБКА: при запуске загружены модули, которые должны импортироваться по требованию: {', '.join(loaded)}")
+        failed = True
+    if window_ms > args.budget_ms:
+        print(f"ОШИБКА: время до показа окна превышает бюджет на {window_ms - args.budget_ms:.1f} мс")
+        failed = True
+    if not failed:
+        print("Время запуска в пределах бюджета.")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
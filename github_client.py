@@ -0,0 +1,280 @@
+import os
+import time
+import threading
+import mimetypes
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+
+GITHUB_API_URL = os.environ.get("GITHUB_API_URL", "https://api.github.com")
+
+# Дольше ждать сброса лимита запросов нет смысла: пользователь увидит ошибку
+MAX_RATE_LIMIT_WAIT = 60
+# При таком остатке лимита запросов в лог выводится предупреждение
+RATE_LIMIT_WARNING = 20
+# Размер блока, которым файлы релиза читаются с диска при загрузке
+UPLOAD_BLOCK_SIZE = 256 * 1024
+
+
+def parse_retry_after(value):
+    """Секунды ожидания из заголовка Retry-After: число секунд или дата HTTP (RFC 9110); None - не разобран"""
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        moment = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    if moment.tzinfo is None:
+        moment = moment.replace(tzinfo=timezone.utc)
+    return max(0.0, (moment - datetime.now(timezone.utc)).total_seconds())
+
+
+class GitHubAPIError(Exception):
+    """Ошибка ответа GitHub API"""
+
+    def __init__(self, status_code, message):
+        super().__init__(f"GitHub API вернул ошибку {status_code}: {message}")
+        self.status_code = status_code
+
+
+_session = None
+_token = None
+_logins = {}
+_shared_lock = threading.Lock()
+
+
+def find_github_token():
+    """Токен GitHub из GITHUB_TOKEN/GH_TOKEN или из GitHub CLI (gh auth token)"""
+    token = os.environ.get("GITHUB_TOKEN") or os.environ.get("GH_TOKEN")
+    if token:
+        return token
+    import subprocess
+    try:
+        process = subprocess.run(["gh", "auth", "token"], capture_output=True, text=True, encoding="utf-8")
+    except OSError:
+        process = None
+    if process is None or process.returncode != 0 or not process.stdout.strip():
+        raise Exception("Не найден токен GitHub: выполните 'gh auth login' или задайте переменную GITHUB_TOKEN.")
+    return process.stdout.strip()
+
+
+def shared_token():
+    """Токен ищется один раз за время работы процесса"""
+    global _token
+    with _shared_lock:
+        if _token is None:
+            _token = find_github_token()
+        return _token
+
+
+def shared_session(max_retries=3):
+    """Общий для процесса requests.Session: все публикации используют один пул соединений"""
+    global _session
+    with _shared_lock:
+        if _session is None:
+            import requests
+            from requests.adapters import HTTPAdapter
+            from urllib3.util.retry import Retry
+
+            # POST не повторяется автоматически: повтор мог бы создать второй репозиторий или релиз.
+            # Ответы о превышении лимита запросов (Retry-After) обрабатывает GitHubClient.request
+            retry = Retry(total=max_retries, backoff_factor=0.5, status_forcelist=(500, 502, 503, 504),
+                          allowed_methods=frozenset(["GET", "HEAD", "PUT", "DELETE"]),
+                          respect_retry_after_header=False, raise_on_status=False)
+            adapter = HTTPAdapter(pool_connections=4, pool_maxsize=16, max_retries=retry)
+            session = requests.Session()
+            session.mount("https://", adapter)
+            session.mount("http://", adapter)
+            session.headers.update({
+                "Accept": "application/vnd.github+json",
+                "X-GitHub-Api-Version": "2022-11-28",
+                "User-Agent": "github-publisher",
+            })
+            _session = session
+        return _session
+
+
+class GitHubClient:
+    """Клиент GitHub REST API поверх общего requests.Session: соединения переиспользуются (keep-alive),
+    сетевые ошибки и ответы 5xx повторяются, лимит запросов учитывается по заголовкам X-RateLimit-*."""
+
+    def __init__(self, token=None, api_url=None, timeout=30, max_retries=3, log=None, session=None):
+        self.api_url = (api_url or GITHUB_API_URL).rstrip("/")
+        self.timeout = timeout
+        self.max_retries = max_retries
+        self.log = log or (lambda message: None)
+        self.rate_limit_remaining = None
+        self.rate_limit_reset = None
+        self._token = token
+        self._session = session
+
+    @property
+    def session(self):
+        if self._session is None:
+            self._session = shared_session(self.max_retries)
+        return self._session
+
+    @property
+    def token(self):
+        if self._token is None:
+            self._token = shared_token()
+        return self._token
+
+    def _update_rate_limit(self, response):
+        remaining = response.headers.get("X-RateLimit-Remaining")
+        reset = response.headers.get("X-RateLimit-Reset")
+        if remaining is not None:
+            self.rate_limit_remaining = int(remaining)
+            if self.rate_limit_remaining <= RATE_LIMIT_WARNING:
+                self.log(f"GitHub API: осталось запросов до сброса лимита: {self.rate_limit_remaining}")
+        if reset is not None:
+            self.rate_limit_reset = int(reset)
+
+    @staticmethod
+    def _rate_limit_delay(response):
+        """Сколько секунд ждать, если запрос отклонен из-за лимита; None - ответ не связан с лимитом"""
+        if response.status_code not in (403, 429):
+            return None
+        retry_after = response.headers.get("Retry-After")
+        if retry_after is not None:
+            delay = parse_retry_after(retry_after)
+            if delay is not None:
+                return delay
+            # Неразборчивый Retry-After: время ожидания определяется по X-RateLimit-Reset
+        if response.headers.get("X-RateLimit-Remaining") == "0":
+            reset = int(response.headers.get("X-RateLimit-Reset", "0"))
+            return max(0.0, reset - time.time()) + 1
+        return None
+
+    def request(self, method, path, expected=(200, 201), **kwargs):
+        """Выполняет запрос к API и возвращает разобранный JSON; path может быть полным URL"""
+        response = self._send(method, path, expected, **kwargs)
+        if response.status_code == 204 or not response.content:
+            return None
+        return response.json()
+
+    def request_pages(self, path, params=None):
+        """Все элементы списка из API; следующие страницы запрашиваются по заголовку Link (rel="next")"""
+        items = []
+        params = dict(params or {}, per_page=100)
+        while path:
+            response = self._send("GET", path, params=params)
+            items.extend(response.json() or [])
+            # Ссылка на следующую страницу уже содержит все параметры запроса
+            path = response.links.get("next", {}).get("url")
+            params = None
+        return items
+
+    def _send(self, method, path, expected=(200, 201), **kwargs):
+        url = path if path.startswith(("http://", "https://")) else f"{self.api_url}{path}"
+        data = kwargs.get("data")
+        headers = dict(kwargs.pop("headers", None) or {}, Authorization=f"Bearer {self.token}")
+        for attempt in range(self.max_retries + 1):
+            if hasattr(data, "seek"):
+                data.seek(0)
+            response = self.session.request(method, url, headers=headers, timeout=self.timeout, **kwargs)
+            self._update_rate_limit(response)
+            delay = self._rate_limit_delay(response)
+            if delay is None or attempt == self.max_retries or delay > MAX_RATE_LIMIT_WAIT:
+                break
+            self.log(f"GitHub API: превышен лимит запросов, повтор через {delay:.0f} с...")
+            time.sleep(delay)
+
+        if response.status_code not in expected:
+            try:
+                message = response.json().get("message", response.text)
+            except ValueError:
+                message = response.text
+            raise GitHubAPIError(response.status_code, message)
+        return response
+
+    @property
+    def login(self):
+        """Имя пользователя, которому принадлежит токен"""
+        login = _logins.get((self.api_url, self.token))
+        if login is None:
+            login = self.request("GET", "/user")["login"]
+            _logins[(self.api_url, self.token)] = login
+        return login
+
+    def full_name(self, repo_name):
+        """owner/repo; имя без владельца относится к текущему пользователю, как в gh"""
+        return repo_name if "/" in repo_name else f"{self.login}/{repo_name}"
+
+    def get_repo(self, repo_name):
+        """Данные репозитория (html_url, clone_url, default_branch, ...) или None, если его нет"""
+        try:
+            return self.request("GET", f"/repos/{self.full_name(repo_name)}")
+        except GitHubAPIError as e:
+            if e.status_code == 404:
+                return None
+            raise
+
+    def create_repo(self, repo_name, private=True, description=None):
+        owner, name = self.full_name(repo_name).split("/", 1)
+        payload = {"name": name, "private": private}
+        if description:
+            payload["description"] = description
+        path = "/user/repos" if owner == self.login else f"/orgs/{owner}/repos"
+        return self.request("POST", path, json=payload)
+
+    def create_release(self, repo_name, tag, title=None, notes=None):
+        payload = {"tag_name": tag, "name": title or tag}
+        if notes:
+            payload["body"] = notes
+        return self.request("POST", f"/repos/{self.full_name(repo_name)}/releases", json=payload)
+
+    def get_release_by_tag(self, repo_name, tag):
+        """Релиз с указанным тегом или None"""
+        try:
+            return self.request("GET", f"/repos/{self.full_name(repo_name)}/releases/tags/{tag}")
+        except GitHubAPIError as e:
+            if e.status_code == 404:
+                return None
+            raise
+
+    def list_release_assets(self, repo_name, release_id):
+        return self.request_pages(f"/repos/{self.full_name(repo_name)}/releases/{release_id}/assets")
+
+    def delete_release_asset(self, repo_name, asset_id):
+        self.request("DELETE", f"/repos/{self.full_name(repo_name)}/releases/assets/{asset_id}", expected=(204,))
+
+    def upload_release_asset(self, release, file_path, name=None, on_progress=None):
+        """Загружает файл в релиз. Тело запроса читается с диска блоками, а не целиком в память;
+        on_progress(отправлено байт) вызывается по мере отправки."""
+        name = name or os.path.basename(file_path)
+        upload_url = release["upload_url"].split("{", 1)[0]
+        content_type = mimetypes.guess_type(name)[0] or "application/octet-stream"
+        with open(file_path, "rb") as f:
+            body = ProgressReader(f, os.path.getsize(file_path), on_progress)
+            return self.request("POST", upload_url, params={"name": name}, data=body,
+                                headers={"Content-Type": content_type, "Content-Length": str(len(body))})
+
+
+class ProgressReader:
+    """Файловый объект для тела запроса, сообщающий о количестве прочитанных (отправленных) байт"""
+
+    def __init__(self, file, size, on_progress=None):
+        self.file = file
+        self.size = size
+        self.sent = 0
+        self.on_progress = on_progress
+
+    def __len__(self):
+        return self.size
+
+    def read(self, size=-1):
+        chunk = self.file.read(UPLOAD_BLOCK_SIZE if size is None or size < 0 else size)
+        if chunk:
+            self.sent += len(chunk)
+            if self.on_progress:
+                self.on_progress(self.sent)
+        return chunk
+
+    def seek(self, offset, whence=0):
+        # Повтор запроса начинает отправку файла с начала
+        self.sent = self.file.seek(offset, whence)
+        if self.on_progress:
+            self.on_progress(self.sent)
+        return self.sent
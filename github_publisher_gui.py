@@ -1,501 +1,67 @@
 import sys
 import os
-import shutil
-import stat
+import threading
 sys.path.insert(0, os.path.dirname(__file__))
-import json
-import subprocess
 from PyQt6.QtWidgets import (
     QApplication, QMainWindow, QVBoxLayout, QHBoxLayout,
-    QWidget, QTextEdit, QPushButton, QLineEdit, QFileDialog, QLabel, QMessageBox, QCheckBox, QTabWidget
+    QWidget, QPushButton, QLineEdit, QFileDialog, QLabel, QMessageBox, QCheckBox, QTabWidget,
+    QProgressBar, QPlainTextEdit, QTableWidget, QTableWidgetItem, QComboBox
 )
-from PyQt6.QtGui import QPalette, QColor
-from PyQt6.QtCore import Qt, QThread, pyqtSignal
-from gemini_api_client import GeminiAPIClient
-from release_worker import ReleaseWorker
+from PyQt6.QtGui import QPalette, QColor, QTextCursor
+from PyQt6.QtCore import Qt, QThread, QTimer, pyqtSignal
+from log_view import LogView
+# Конвейер публикации, клиенты ИИ (и requests), рабочие потоки релиза и очередь заданий
+# импортируются при первом использовании, чтобы окно появлялось без их загрузки.
+# Проверка времени запуска: python check_startup.py
 
 class Worker(QThread):
+    """Qt-адаптер над PublishPipeline: выполняет публикацию в отдельном потоке"""
     log_signal = pyqtSignal(str)
     finished_signal = pyqtSignal()
     error_signal = pyqtSignal(str)
+    token_signal = pyqtSignal(str)  # пачки токенов при потоковой генерации README
+    large_files_signal = pyqtSignal(object)  # оценка публикации с крупными файлами; ответ - в large_files_decision
 
-    def __init__(self, project_path, repo_name, use_llm):
+    def __init__(self, project_path, repo_name, use_llm, stream_llm=True, force_regenerate=False, incremental=False,
+                 resources=None, large_files=None):
         super().__init__()
-        self.project_path = project_path
-        self.repo_name = repo_name
-        self.use_llm = use_llm
-        self.gemini_client = GeminiAPIClient(model_name="qwen3-coder:30b")
-
-    def _remove_readonly(self, func, path, exc_info):
-        import stat
-        # exc_info contains (type, value, traceback)
-        if issubclass(exc_info[0], PermissionError):
-            try:
-                self.log_signal.emit(f"Попытка изменить разрешения файла: {path}")
-                os.chmod(path, stat.S_IWRITE)
-                func(path)
-            except Exception as e:
-                self.log_signal.emit(f"Не удалось изменить разрешения и удалить файл {path}: {e}")
-                raise e
-        else:
-            raise exc_info[1]
-
-    def _run_command(self, command, cwd=None):
-        if cwd is None:
-            cwd = self.project_path
-        self.log_signal.emit(f"Выполнение команды: {command} в {cwd}")
-        process = subprocess.run(command, cwd=cwd, shell=True, capture_output=True, text=True, encoding='utf-8')
-        if process.stdout:
-            self.log_signal.emit(f"Stdout: {process.stdout.strip()}")
-        if process.stderr:
-            self.log_signal.emit(f"Stderr: {process.stderr.strip()}")
-        if process.returncode != 0:
-            raise Exception(f"Команда завершилась с ошибкой (код {process.returncode}): {command}")
-        return process.stdout
+        from publisher_core import PublishPipeline
+        self.large_files_decision = None
+        self.pipeline = PublishPipeline(project_path, repo_name, use_llm, stream_llm, force_regenerate, incremental,
+                                        resources, log=self.log_signal.emit, on_tokens=self.token_signal.emit,
+                                        large_files=large_files, on_large_files=self.ask_large_files)
+
+    def ask_large_files(self, estimate):
+        """Вызывается из рабочего потока; сигнал подключается с BlockingQueuedConnection,
+        поэтому поток ждет, пока пользователь ответит в окне"""
+        self.large_files_signal.emit(estimate)
+        return self.large_files_decision
+
+    def cancel_generation(self):
+        """Прерывает потоковую генерацию README, не дожидаясь окончания запроса"""
+        self.pipeline.cancel_generation()
 
     def run(self):
         try:
-            self.log_signal.emit(f"Рабочий поток запущен для публикации проекта '{self.project_path}' в репозиторий '{self.repo_name}'.")
-
-            # Шаг 6: Анализ проекта и генерация README.md
-            self.log_signal.emit("Анализ проекта и генерация README.md...")
-            project_info = self.analyze_project()
-            readme_content = self.generate_readme_content(project_info)
-            readme_path = os.path.join(self.project_path, "README.md")
-            with open(readme_path, "w", encoding="utf-8") as f:
-                f.write(readme_content)
-            self.log_signal.emit(f"Файл README.md сгенерирован и сохранен: {readme_path}")
-
-            # Шаг 7: Git-операции будут выполнены командой gh repo create --source=. --push
-            self.log_signal.emit("Git-операции (init, add, commit) будут выполнены GitHub CLI.")
-
-            # Проверка и удаление существующего .git репозитория
-            git_folder_path = os.path.join(self.project_path, ".git")
-            if os.path.exists(git_folder_path):
-                self.log_signal.emit(f"Обнаружен существующий Git репозиторий в {git_folder_path}. Попытка удалить его для чистой инициализации.")
-                try:
-                    shutil.rmtree(git_folder_path, onerror=self._remove_readonly)
-                    self.log_signal.emit("Существующий Git репозиторий удален.")
-                except Exception as e:
-                    self.log_signal.emit(f"Ошибка при удалении существующего Git репозитория: {e}. Возможно, некоторые файлы заблокированы.")
-                    raise # Re-raise the exception to stop the process if deletion fails
-
-            # Инициализация нового Git репозитория
-            self.log_signal.emit("Инициализация нового Git репозитория...")
-            self._run_command("git init")
-            
-            # Добавление файлов и создание первого коммита
-            self.log_signal.emit("Добавление файлов и создание первого коммита...")
-            self._run_command("git add .")
-            self._run_command('git commit -m "Initial commit"')
-            
-            # Шаг 8: Проверка существования и создание/настройка репозитория
-            self.log_signal.emit(f"Проверка репозитория '{self.repo_name}' на GitHub...")
-            try:
-                # Попытка получить информацию о репозитории. Если команда падает, репозитория нет.
-                self._run_command(f"gh repo view {self.repo_name}")
-                self.log_signal.emit(f"Репозиторий '{self.repo_name}' уже существует. Настраиваю remote...")
-                
-                # Получаем URL существующего репозитория
-                repo_url = self._run_command(f"gh repo view {self.repo_name} --json url -q .url").strip()
-
-                # Удаляем старый origin, если он есть, и добавляем новый
-                try:
-                    self._run_command("git remote remove origin")
-                except Exception:
-                    # Игнорируем ошибку, если remote origin не существует
-                    pass
-                self._run_command(f"git remote add origin {repo_url}")
-                
-                # Пушим изменения в существующий репозиторий
-                # Используем -f (force), так как мы всегда начинаем с чистого листа локально.
-                # Это перезапишет историю на удаленном репозитории.
-                self.log_signal.emit("Отправка коммитов в существующий репозиторий (с перезаписью)...")
-                self._run_command("git push --force --set-upstream origin master")
-                self.log_signal.emit("Проект успешно синхронизирован с существующим репозиторием на GitHub.")
-
-            except Exception as e:
-                # Если `gh repo view` упал, значит репозитория нет. Создаем его.
-                self.log_signal.emit(f"Репозиторий '{self.repo_name}' не найден. Создаю новый...")
-                self._run_command(f"gh repo create {self.repo_name} --private --source=. --push")
-                self.log_signal.emit(f"Приватный репозиторий '{self.repo_name}' успешно создан на GitHub и проект загружен.")
-
-            self.log_signal.emit("Операция завершена.")
+            self.pipeline.publish()
             self.finished_signal.emit()
         except Exception as e:
             self.error_signal.emit(f"Произошла ошибка в рабочем потоке: {e}")
 
-    def analyze_project(self):
-        project_info = {
-            "name": self.repo_name,
-            "type": "Неизвестно",
-            "os_specific": [],  # Для определения целевой ОС
-            "description": "Автоматически сгенерированный проект.",
-            "main_files": [],
-            "dependencies": [],
-            "technologies": set(),  # Для сбора используемых технологий
-            "entry_point": None,
-            "has_tests": False,
-            "license": "Не указано",
-            "existing_readme": None
-        }
-
-        # Чтение существующего README.md
-        try:
-            readme_path = os.path.join(self.project_path, "README.md")
-            if os.path.exists(readme_path):
-                self.log_signal.emit("Обнаружен существующий README.md. Читаю его содержимое...")
-                with open(readme_path, "r", encoding="utf-8") as f:
-                    project_info["existing_readme"] = f.read()
-        except Exception as e:
-            self.log_signal.emit(f"Ошибка при чтении существующего README.md: {e}")
-
-        # Проверка лицензии
-        license_files = ["LICENSE", "LICENSE.md", "LICENSE.txt", "COPYING", "COPYING.md"]
-        for license_file in license_files:
-            if os.path.exists(os.path.join(self.project_path, license_file)):
-                project_info["license"] = license_file
-                break
-
-        # Проверка на наличие тестов
-        test_dirs = ["tests", "test", "__tests__"]
-        for test_dir in test_dirs:
-            if os.path.exists(os.path.join(self.project_path, test_dir)):
-                project_info["has_tests"] = True
-                break
-
-        # Проверка на наличие ключевых файлов для определения типа проекта и целевой ОС
-        
-        # Проверка на Windows-приложения (C# проекты)
-        csproj_files = [f for f in os.listdir(self.project_path) if f.endswith(".csproj")]
-        if csproj_files:
-            self.log_signal.emit(f"Обнаружен C# проект ({csproj_files[0]}). Устанавливаю целевую ОС как Windows.")
-            project_info["type"] = "C# (.NET)"
-            project_info["technologies"].add("C#")
-            project_info["technologies"].add(".NET")
-            project_info["os_specific"] = ["Windows"]  # C# проекты по умолчанию для Windows
-            # Попробуем извлечь немного информации из .csproj файла
-            try:
-                csproj_path = os.path.join(self.project_path, csproj_files[0])
-                with open(csproj_path, "r", encoding="utf-8") as f:
-                    content = f.read()
-                    # Простой поиск тегов (в реальном проекте лучше использовать XML-парсер)
-                    if "<Description>" in content:
-                        start = content.find("<Description>") + len("<Description>")
-                        end = content.find("</Description>")
-                        if start > -1 and end > -1:
-                            project_info["description"] = content[start:end].strip()
-            except Exception as e:
-                self.log_signal.emit(f"Ошибка при чтении .csproj файла: {e}")
-        elif os.path.exists(os.path.join(self.project_path, "package.json")):
-            self.log_signal.emit("Обнаружен package.json. Анализирую JavaScript/Node.js проект...")
-            project_info["type"] = "JavaScript/Node.js"
-            project_info["technologies"].add("JavaScript")
-            project_info["technologies"].add("Node.js")
-            
-            # Проверка на Electron или другие специфические фреймворки
-            try:
-                with open(os.path.join(self.project_path, "package.json"), "r", encoding="utf-8") as f:
-                    package_json = json.load(f)
-                    if "description" in package_json: 
-                        project_info["description"] = package_json["description"]
-                    if "dependencies" in package_json: 
-                        project_info["dependencies"] = list(package_json["dependencies"].keys())
-                        # Определение типа приложения по зависимостям
-                        if "electron" in package_json["dependencies"]:
-                            project_info["type"] = "Electron Desktop App"
-                            project_info["os_specific"] = ["Windows", "macOS", "Linux"]
-                            self.log_signal.emit("Определен как Electron приложение по зависимостям")
-                        elif "react" in package_json["dependencies"]:
-                            project_info["type"] = "React Web App"
-                            self.log_signal.emit("Определен как React приложение по зависимостям")
-                        elif "@angular/core" in package_json["dependencies"]:
-                            project_info["type"] = "Angular Web App"
-                            self.log_signal.emit("Определен как Angular приложение по зависимостям")
-                        elif "vue" in package_json["dependencies"]:
-                            project_info["type"] = "Vue.js Web App"
-                            self.log_signal.emit("Определен как Vue.js приложение по зависимостям")
-                    if "devDependencies" in package_json: 
-                        project_info["dependencies"].extend(list(package_json["devDependencies"].keys()))
-                        if "electron" in package_json["devDependencies"]:
-                            project_info["type"] = "Electron Desktop App"
-                            project_info["os_specific"] = ["Windows", "macOS", "Linux"]
-                            self.log_signal.emit("Определен как Electron приложение по devDependencies")
-                        elif "@angular/core" in package_json["devDependencies"]:
-                            project_info["type"] = "Angular Web App"
-                            self.log_signal.emit("Определен как Angular приложение по devDependencies")
-                        elif "vue" in package_json["devDependencies"]:
-                            project_info["type"] = "Vue.js Web App"
-                            self.log_signal.emit("Определен как Vue.js приложение по devDependencies")
-                            
-                    # Проверка скриптов для определения Electron
-                    if "scripts" in package_json:
-                        scripts = package_json["scripts"]
-                        for script_name, script in scripts.items():
-                            if "electron" in script:
-                                project_info["type"] = "Electron Desktop App"
-                                project_info["os_specific"] = ["Windows", "macOS", "Linux"]
-                                self.log_signal.emit(f"Определен как Electron приложение по скрипту '{script_name}': {script}")
-                                break
-                                
-            except Exception as e:
-                self.log_signal.emit(f"Ошибка при чтении package.json: {e}")
-                
-        elif os.path.exists(os.path.join(self.project_path, "requirements.txt")):
-            self.log_signal.emit("Обнаружен requirements.txt. Анализирую Python проект...")
-            project_info["type"] = "Python"
-            project_info["technologies"].add("Python")
-            project_info["os_specific"] = ["Windows", "macOS", "Linux"]  # Python кроссплатформенный
-            try:
-                with open(os.path.join(self.project_path, "requirements.txt"), "r", encoding="utf-8") as f:
-                    project_info["dependencies"] = [line.strip() for line in f if line.strip() and not line.startswith('#')]
-            except Exception as e:
-                self.log_signal.emit(f"Ошибка при чтении requirements.txt: {e}")
-                
-        elif os.path.exists(os.path.join(self.project_path, "pom.xml")):
-            self.log_signal.emit("Обнаружен pom.xml. Анализирую Java проект...")
-            project_info["type"] = "Java"
-            project_info["technologies"].add("Java")
-            project_info["os_specific"] = ["Windows", "macOS", "Linux"]  # Java кроссплатформенный
-            # Попробуем извлечь зависимости из pom.xml (упрощенный парсинг)
-            try:
-                with open(os.path.join(self.project_path, "pom.xml"), "r", encoding="utf-8") as f:
-                    content = f.read()
-                    # Простой поиск тегов dependencies (в реальном проекте лучше использовать XML-парсер)
-                    if "<dependencies>" in content:
-                        project_info["dependencies"] = ["Зависимости определены в pom.xml"]
-            except Exception as e:
-                self.log_signal.emit(f"Ошибка при чтении pom.xml: {e}")
-                
-        elif os.path.exists(os.path.join(self.project_path, "CMakeLists.txt")):
-            self.log_signal.emit("Обнаружен CMakeLists.txt. Анализирую C++ проект...")
-            project_info["type"] = "C++"
-            project_info["technologies"].add("C++")
-            project_info["technologies"].add("CMake")
-            project_info["os_specific"] = ["Windows", "macOS", "Linux"]  # CMake кроссплатформенный
-            # CMake не содержит информации о зависимостях в самом файле, 
-            # они могут быть в других файлах или устанавливаться отдельно
-            
-        elif os.path.exists(os.path.join(self.project_path, "index.html")) or \
-             os.path.exists(os.path.join(self.project_path, "main.html")):
-            self.log_signal.emit("Обнаружен HTML файл. Анализирую веб-проект...")
-            project_info["type"] = "HTML/CSS/JS"
-            project_info["technologies"].add("HTML")
-            project_info["technologies"].add("CSS")
-            project_info["technologies"].add("JavaScript")
-            project_info["os_specific"] = ["Windows", "macOS", "Linux"]  # Веб-приложения кроссплатформенные
-
-        # Если не определена целевая ОС, используем универсальные инструкции
-        if not project_info["os_specific"]:
-            project_info["os_specific"] = ["Windows", "macOS", "Linux"]  # По умолчанию для кроссплатформенных приложений
-            self.log_signal.emit("Целевая ОС не определена. Использую кроссплатформенные инструкции.")
-
-        # Сбор списка основных файлов и технологий
-        python_entry_points = ["main.py", "app.py", "run.py", "start.py", "manage.py"]
-        js_entry_points = ["index.js", "main.js", "server.js", "app.js"]
-        java_entry_points = ["Main.java", "App.java"]
-        cpp_entry_points = ["main.cpp", "main.cc"]
-        
-        self.log_signal.emit("Сканирую файлы проекта...")
-        for root, _, files in os.walk(self.project_path):
-            for file in files:
-                relative_path = os.path.relpath(os.path.join(root, file), self.project_path)
-                if any(ext in file for ext in [".py", ".js", ".html", ".css", ".json", ".md", ".java", ".cpp", ".cc", ".h"]):
-                    project_info["main_files"].append(relative_path)
-                if file.endswith(".py"): 
-                    project_info["technologies"].add("Python")
-                    # Поиск точки входа
-                    if file in python_entry_points and not project_info["entry_point"]:
-                        project_info["entry_point"] = relative_path
-                if file.endswith(".js"): 
-                    project_info["technologies"].add("JavaScript")
-                    # Поиск точки входа
-                    if file in js_entry_points and not project_info["entry_point"]:
-                        project_info["entry_point"] = relative_path
-                if file.endswith(".html"): 
-                    project_info["technologies"].add("HTML")
-                if file.endswith(".css"): 
-                    project_info["technologies"].add("CSS")
-                if file.endswith(".java"): 
-                    project_info["technologies"].add("Java")
-                    # Поиск точки входа
-                    if file in java_entry_points and not project_info["entry_point"]:
-                        project_info["entry_point"] = relative_path
-                if file.endswith((".cpp", ".cc")): 
-                    project_info["technologies"].add("C++")
-                    # Поиск точки входа
-                    if file in cpp_entry_points and not project_info["entry_point"]:
-                        project_info["entry_point"] = relative_path
-                if file.endswith(".h"): 
-                    project_info["technologies"].add("C++")
-                    
-                # Проверка на специфичные файлы для ОС
-                if file.endswith((".exe", ".msi")) and "Windows" not in project_info["os_specific"]:
-                    project_info["os_specific"].append("Windows")
-                if file.endswith(".app") and "macOS" not in project_info["os_specific"]:
-                    project_info["os_specific"].append("macOS")
-                if file.endswith((".deb", ".rpm", ".sh")) and "Linux" not in project_info["os_specific"]:
-                    project_info["os_specific"].append("Linux")
-                    
-        project_info["technologies"] = list(project_info["technologies"])
-        self.log_signal.emit(f"Анализ завершен. Тип проекта: {project_info['type']}, Целевые ОС: {project_info['os_specific']}")
-        return project_info
-
-    def generate_readme_content(self, project_info):
-        llm_description = None
-        if self.use_llm:
-            self.log_signal.emit("Генерация README.md с помощью LLM...")
-            prompt = self._construct_llm_prompt(project_info)
-            try:
-                llm_description = self.gemini_client.generate_readme_description(prompt)
-            except Exception as e:
-                self.log_signal.emit(f"Ошибка при генерации описания с помощью LLM: {e}")
-                self.log_signal.emit("Используется описание по умолчанию.")
-        else:
-            self.log_signal.emit("Генерация README.md без использования LLM.")
-
-        # Создаем структурированный README.md
-        if llm_description:
-            # Используем сгенерированное описание от LLM, предполагая, что оно содержит все необходимое.
-            content = f"{llm_description}\n\n"
-        else:
-            # Создаем базовую структуру вручную
-            content = f"# {project_info['name']}\n\n"
-            content += f"{project_info['description']}\n\n"             
-            # Краткое описание
-            content += "## 📌 Краткое описание\n\n"
-            content += f"{project_info['description']}\n\n"
-            
-            # Особенности
-            content += "## 🚀 Особенности\n\n"
-            # Добавляем информацию о поддерживаемых ОС
-            if project_info['os_specific']:
-                if project_info['os_specific'] == ["Windows"]:
-                    content += "- Работает на Windows\n"
-                else:
-                    os_list = ", ".join(project_info['os_specific'])
-                    content += f"- Работает на {os_list}\n"
-            content += "- Современный пользовательский интерфейс\n"
-            content += "- Интуитивно понятное управление\n\n"
-            
-            # Технологии
-            if project_info['technologies']:
-                content += "## 🛠️ Используемые технологии\n\n"
-                for tech in project_info['technologies']:
-                    content += f"- {tech}\n"
-                content += "\n"
-            
-            # Зависимости
-            if project_info['dependencies']:
-                content += "## 📦 Зависимости\n\n"
-                for dep in project_info['dependencies'][:10]:  # Ограничим до 10 зависимостей
-                    content += f"- {dep}\n"
-                if len(project_info['dependencies']) > 10:
-                    content += "- ...\n"
-                content += "\n"
-
-            # Предварительная настройка
-            content += "## ⚙️ Предварительная настройка\n\n"
-            content += "Перед первым использованием убедитесь, что у вас установлен [GitHub CLI](https://cli.github.com/) и вы авторизованы.\n\n"
-            content += "Для корректной работы функции создания релизов может потребоваться расширить права доступа. Выполните в терминале команду:\n"
-            content += "```bash\n"
-            content += "gh auth refresh -h github.com -s workflow\n"
-            content += "```\n\n"
-            
-            # Установка
-            content += "## 💾 Установка\n\n"
-            if "Python" in project_info['technologies']:
-                content += "```bash\n"
-                content += "pip install -r requirements.txt\n"
-                content += "```\n\n"
-            elif "Node.js" in project_info['technologies'] or "JavaScript" in project_info['technologies']:
-                content += "```bash\n"
-                content += "npm install\n"
-                content += "```\n\n"
-            elif "Java" in project_info['technologies']:
-                content += "```bash\n"
-                content += "mvn install\n"
-                content += "```\n\n"
-            else:
-                content += "Следуйте инструкциям в разделе 'Запуск'.\n\n"
-            
-            # Запуск
-            content += "## ▶️ Запуск\n\n"
-            if project_info["entry_point"]:
-                if "Python" in project_info['technologies']:
-                    content += f"```bash\npython {project_info['entry_point']}\n```\n\n"
-                elif "JavaScript" in project_info['technologies']:
-                    content += f"```bash\nnode {project_info['entry_point']}\n```\n\n"
-                elif "Java" in project_info['technologies']:
-                    # Для Java сложнее определить точную команду запуска
-                    content += "```bash\n"
-                    content += "javac *.java\njava Main\n"
-                    content += "```\n\n"
-                else:
-                    content += f"Запустите файл: {project_info['entry_point']}\n\n"
-            else:
-                if "Electron" in project_info['type']:
-                    content += "```bash\nnpm start\n```\n\n"
-                elif "Python" in project_info['technologies']:
-                    content += "```bash\npython main.py\n```\n\n"
-                elif "Node.js" in project_info['technologies']:
-                    content += "```bash\nnpm start\n```\n\n"
-                else:
-                    content += "Следуйте инструкциям в разделе 'Использование'.\n\n"
-            
-            # Лицензия
-            if project_info['license'] != "Не указано":
-                content += f"## 📄 Лицензия\n\n"
-                content += f"Этот проект лицензирован под {project_info['license']}.\n\n"
-        
-        # Убираем автоматическую надпись о генерации
-        content += "\n"
-        return content
-
-    def _construct_llm_prompt(self, project_info):
-        prompt = f"Сгенерируй креативное и привлекательное описание для проекта GitHub с названием '{project_info['name']}'. "
-
-        if project_info.get("existing_readme"):
-            prompt += ("Используй следующий текст из существующего файла README.md как ОСНОВУ для создания нового описания. " \
-                      "Твоя задача — взять эту информацию, структурировать ее, улучшить и оформить в красивый README.md для GitHub. " \
-                      "Особенно обрати внимание на любые упоминания требований, таких как серверы или специфические зависимости (например, Ollama). " \
-                      f"Вот содержимое существующего README.md:\n\n'''\n{project_info['existing_readme']}\n'''\n\n")
-        else:
-            prompt += f"Тип проекта: {project_info['type']}. "
-            if project_info['technologies']:
-                prompt += f"Используемые технологии: {', '.join(project_info['technologies'])}. "
-            if project_info['dependencies']:
-                prompt += f"Основные зависимости: {', '.join(project_info['dependencies'][:10])}. "
-            
-        # Информация о целевой ОС
-        if project_info['os_specific']:
-            # Если проект работает только на Windows, не упоминаем macOS и Linux
-            if project_info['os_specific'] == ["Windows"]:
-                prompt += f"Целевая операционная система: Windows. "
-            else:
-                os_info = ', '.join(project_info['os_specific'])
-                prompt += f"Целевые операционные системы: {os_info}. "
-            
-        prompt += ("Создай структурированное описание в формате README.md для GitHub репозитория. " \
-                  "Включи раздел '## ⚙️ Предварительная настройка' ПЕРЕД разделом 'Установка'. В этом разделе укажи, что пользователю нужно установить GitHub CLI и выполнить команду `gh auth refresh -h github.com -s workflow` для предоставления прав на создание релизов. " \
-                  "Включи следующие разделы (каждый раздел начинается с ##): " \
-                  "1. Краткое описание проекта (2-3 предложения с эмодзи) " \
-                  "2. Особенности (список 3-5 ключевых особенностей с эмодзи, НЕ указывай информацию о поддерживаемых операционных системах, НЕ используй слова 'кроссплатформенный', НЕ упоминай macOS и Linux) " \
-                  "3. Технологии (список используемых технологий) " \
-                  "4. Зависимости (список основных зависимостей, если есть) " \
-                  "5. Установка (общие инструкции по установке) " \
-                  "6. Запуск (общие инструкции по запуску) " \
-                  "7. Использование (примеры использования, если возможно определить) " \
-                  "8. Конфигурация (информация о настройке, если применимо) " \
-                  "9. Разработка (инструкции для разработчиков, если проект имеет тесты) " \
-                  "НЕ используй markdown для заголовков, просто начинай каждый раздел с ##. " \
-                  "НЕ дублируй название проекта в описании. " \
-                  "Используй эмодзи для украшения текста. " \
-                  "Сделай описание информативным и привлекательным. " \
-                  "Пиши от лица частного разработчика, избегай официального тона речи (например, фраз типа 'Представляем вам!'). " \
-                  "НЕ упоминай лицензию, если она не определена. " \
-                  "НЕ упоминай macOS и Linux, если проект работает только на Windows.")
-        return prompt
+def warm_up_ollama(log):
+    """Загружает модель ИИ в память Ollama, чтобы первая генерация не ждала загрузки.
+    ollama_client и requests импортируются здесь, в фоновом потоке, а не в потоке интерфейса."""
+    from ollama_client import ollama_service
+    from model_routing import route
+    ollama_service().warm_up(route("readme")["model"], log=log)
+
+def create_batch_publish_pipeline(project_path, repo_name, options, resources, log):
+    """Создает конвейер публикации для задания пакетной публикации"""
+    from publisher_core import PublishPipeline
+    return PublishPipeline(project_path, repo_name, options.get("use_llm", False),
+                           force_regenerate=options.get("force_regenerate", False),
+                           incremental=options.get("incremental", False),
+                           resources=resources, log=log, large_files=options.get("large_files"))
 
 class GitHubPublisherApp(QMainWindow):
     def __init__(self):
@@ -505,6 +71,8 @@ class GitHubPublisherApp(QMainWindow):
 
         self.init_ui()
         self.apply_dark_theme()
+        # Прогрев модели начинается, когда окно уже показано
+        QTimer.singleShot(1000, self.warm_up_llm)
 
     def init_ui(self):
         # Central widget and layout
@@ -513,9 +81,21 @@ class GitHubPublisherApp(QMainWindow):
         self.main_layout = QVBoxLayout(self.central_widget)
 
         # Log display (now at the top/middle)
-        self.log_output = QTextEdit()
-        self.log_output.setReadOnly(True)
-        self.main_layout.addWidget(self.log_output)
+        self.output_tabs = QTabWidget()
+        self.log_output = LogView()
+        self.output_tabs.addTab(self.log_output, "Лог")
+
+        # Live preview of the text being generated by the LLM
+        self.preview_output = QPlainTextEdit()
+        self.preview_output.setReadOnly(True)
+        self.output_tabs.addTab(self.preview_output, "Предпросмотр генерации")
+
+        # Batch publishing queue
+        self.batch_tab = self.create_batch_tab()
+        self.output_tabs.addTab(self.batch_tab, "Пакетная публикация")
+        self.output_tabs.currentChanged.connect(self.on_output_tab_changed)
+        self.main_layout.addWidget(self.output_tabs)
+        self.setAcceptDrops(True)
 
         # --- Control Panel (at the bottom) ---
         self.control_panel_widget = QWidget()
@@ -558,12 +138,39 @@ class GitHubPublisherApp(QMainWindow):
         self.use_llm_checkbox = QCheckBox("Использовать ИИ для генерации README.md")
         self.use_llm_checkbox.setChecked(True) # По умолчанию включено
         self.control_panel_layout.addWidget(self.use_llm_checkbox)
+
+        # LLM Streaming Toggle
+        self.stream_llm_checkbox = QCheckBox("Показывать генерацию ИИ в реальном времени")
+        self.stream_llm_checkbox.setChecked(True) # По умолчанию включено
+        self.control_panel_layout.addWidget(self.stream_llm_checkbox)
+
+        # LLM Cache Bypass Toggle
+        self.force_regenerate_checkbox = QCheckBox("Сгенерировать заново (не использовать кэш ИИ)")
+        self.force_regenerate_checkbox.setChecked(False)
+        self.control_panel_layout.addWidget(self.force_regenerate_checkbox)
         
         # Auto Release Toggle
         self.auto_release_checkbox = QCheckBox("Автоматически создавать релиз после публикации")
         self.auto_release_checkbox.setChecked(True) # По умолчанию включено
         self.control_panel_layout.addWidget(self.auto_release_checkbox)
 
+        # Incremental Publish Toggle
+        self.incremental_checkbox = QCheckBox("Инкрементальная публикация (сохранить историю Git и отправить только изменения)")
+        self.incremental_checkbox.setChecked(False)
+        self.control_panel_layout.addWidget(self.incremental_checkbox)
+
+        # Large Files Handling
+        from large_files import LARGE_FILE_POLICIES, LARGE_FILE_THRESHOLD_MB
+        self.large_files_layout = QHBoxLayout()
+        self.large_files_layout.addWidget(QLabel(f"Файлы от {LARGE_FILE_THRESHOLD_MB:g} МБ:"))
+        self.large_files_combo = QComboBox()
+        self.large_files_combo.addItem("Спросить перед публикацией", None)
+        for policy in ("lfs", "exclude", "keep"):
+            self.large_files_combo.addItem(LARGE_FILE_POLICIES[policy], policy)
+        self.large_files_layout.addWidget(self.large_files_combo)
+        self.large_files_layout.addStretch()
+        self.control_panel_layout.addLayout(self.large_files_layout)
+
         # Buttons layout
         self.buttons_layout = QHBoxLayout()
         
@@ -578,14 +185,149 @@ class GitHubPublisherApp(QMainWindow):
         self.release_button.setEnabled(False)  # Отключаем до публикации проекта
         self.buttons_layout.addWidget(self.release_button)
 
+        # Cancel Generation Button
+        self.cancel_generation_button = QPushButton("Остановить генерацию")
+        self.cancel_generation_button.clicked.connect(self.cancel_generation)
+        self.cancel_generation_button.setEnabled(False)
+        self.buttons_layout.addWidget(self.cancel_generation_button)
+
         self.control_panel_layout.addLayout(self.buttons_layout)
 
+        # Прогресс автоматического создания релиза
+        self.release_progress = QProgressBar()
+        self.release_progress.setRange(0, 100)
+        self.release_progress.setVisible(False)
+        self.control_panel_layout.addWidget(self.release_progress)
+
         # Add the control panel to the main layout (at the bottom)
         self.main_layout.addWidget(self.control_panel_widget)
 
         self.log_message("Приложение GitHub Publisher запущено.")
         self.selected_screenshot = None
 
+    def create_batch_tab(self):
+        batch_widget = QWidget()
+        batch_layout = QVBoxLayout(batch_widget)
+        batch_layout.addWidget(QLabel("Перетащите папки проектов в окно или добавьте их кнопками ниже. "
+                                      "Используются текущие настройки ИИ и режима публикации."))
+
+        self.batch_table = QTableWidget(0, 5)
+        self.batch_table.setHorizontalHeaderLabels(["Папка проекта", "Репозиторий", "Статус", "Попытки", "Ошибка"])
+        self.batch_table.setEditTriggers(QTableWidget.EditTrigger.NoEditTriggers)
+        self.batch_table.horizontalHeader().setStretchLastSection(True)
+        batch_layout.addWidget(self.batch_table)
+
+        batch_buttons_layout = QHBoxLayout()
+        for title, handler in [
+            ("Добавить папку", self.add_batch_folder),
+            ("Добавить все подпапки", self.add_batch_subfolders),
+            ("Запустить очередь", self.start_batch),
+            ("Остановить", self.stop_batch),
+            ("Повторить ошибочные", self.retry_failed_batch_jobs),
+            ("Удалить завершенные", self.remove_finished_batch_jobs),
+        ]:
+            button = QPushButton(title)
+            button.clicked.connect(handler)
+            batch_buttons_layout.addWidget(button)
+        batch_layout.addLayout(batch_buttons_layout)
+
+        # Очередь (SQLite) открывается при первом переходе на вкладку или добавлении задания
+        self._job_queue = None
+        self.batch_worker = None
+        return batch_widget
+
+    @property
+    def job_queue(self):
+        if self._job_queue is None:
+            from job_queue import JobQueue
+            self._job_queue = JobQueue()
+            self._job_queue.recover_interrupted()
+        return self._job_queue
+
+    def on_output_tab_changed(self, index):
+        if self.output_tabs.widget(index) is self.batch_tab and self._job_queue is None:
+            self.refresh_batch_table()
+
+    def refresh_batch_table(self):
+        from job_queue import JOB_STATUS_TITLES
+        jobs = self.job_queue.list_jobs()
+        self.batch_table.setRowCount(len(jobs))
+        for row, job in enumerate(jobs):
+            values = [job["project_path"], job["repo_name"], JOB_STATUS_TITLES.get(job["status"], job["status"]),
+                      f"{job['attempts']}/{job['max_attempts']}", job["error"] or ""]
+            for column, value in enumerate(values):
+                self.batch_table.setItem(row, column, QTableWidgetItem(value))
+
+    def add_batch_job(self, folder_path):
+        folder_path = os.path.normpath(folder_path)
+        repo_name = os.path.basename(folder_path)
+        options = {
+            "use_llm": self.use_llm_checkbox.isChecked(),
+            "force_regenerate": self.force_regenerate_checkbox.isChecked(),
+            "incremental": self.incremental_checkbox.isChecked(),
+            "large_files": self.large_files_combo.currentData(),
+        }
+        self.job_queue.add(folder_path, repo_name, options)
+        self.log_message(f"Добавлено в очередь пакетной публикации: {folder_path} -> {repo_name}")
+
+    def add_batch_folder(self):
+        folder_path = QFileDialog.getExistingDirectory(self, "Выберите папку проекта")
+        if folder_path:
+            self.add_batch_job(folder_path)
+            self.refresh_batch_table()
+
+    def add_batch_subfolders(self):
+        parent_path = QFileDialog.getExistingDirectory(self, "Выберите папку, содержащую проекты")
+        if parent_path:
+            with os.scandir(parent_path) as it:
+                for entry in sorted(it, key=lambda entry: entry.name):
+                    if entry.is_dir() and not entry.name.startswith("."):
+                        self.add_batch_job(entry.path)
+            self.refresh_batch_table()
+
+    def dragEnterEvent(self, event):
+        if event.mimeData().hasUrls():
+            event.acceptProposedAction()
+
+    def dropEvent(self, event):
+        folders = [url.toLocalFile() for url in event.mimeData().urls() if os.path.isdir(url.toLocalFile())]
+        for folder_path in folders:
+            self.add_batch_job(folder_path)
+        if folders:
+            self.refresh_batch_table()
+            self.output_tabs.setCurrentIndex(self.output_tabs.count() - 1)
+
+    def start_batch(self):
+        if self.batch_worker is not None and self.batch_worker.isRunning():
+            self.log_message("Пакетная публикация уже выполняется.")
+            return
+        if not self.job_queue.has_pending():
+            self.log_message("В очереди пакетной публикации нет ожидающих заданий.")
+            return
+        from batch_worker import BatchWorker
+        self.batch_worker = BatchWorker(self.job_queue, create_batch_publish_pipeline)
+        self.connect_log(self.batch_worker.log_signal)
+        self.batch_worker.job_updated_signal.connect(self.refresh_batch_table)
+        self.batch_worker.finished_signal.connect(self.on_batch_finished)
+        self.batch_worker.start()
+
+    def stop_batch(self):
+        if self.batch_worker is not None and self.batch_worker.isRunning():
+            self.batch_worker.stop()
+            self.log_message("Пакетная публикация будет остановлена после завершения текущих заданий.")
+
+    def retry_failed_batch_jobs(self):
+        self.job_queue.retry_failed()
+        self.refresh_batch_table()
+
+    def remove_finished_batch_jobs(self):
+        self.job_queue.remove_finished()
+        self.refresh_batch_table()
+
+    def on_batch_finished(self):
+        self.refresh_batch_table()
+        QMessageBox.information(self, "Пакетная публикация", "Обработка очереди пакетной публикации завершена.")
+
     def apply_dark_theme(self):
         app.setStyle("Fusion")
         palette = QPalette()
@@ -605,7 +347,16 @@ class GitHubPublisherApp(QMainWindow):
         app.setPalette(palette)
 
     def log_message(self, message):
-        self.log_output.append(message)
+        self.log_output.append_message(message)
+
+    def connect_log(self, signal):
+        """Подключает сигнал лога рабочего потока напрямую к буферу окна лога: сообщения не проходят
+        через очередь событий по одному, а выводятся пачками по таймеру"""
+        signal.connect(self.log_output.append_message, Qt.ConnectionType.DirectConnection)
+
+    def closeEvent(self, event):
+        self.log_output.close_log()
+        super().closeEvent(event)
 
     def select_project_folder(self):
         folder_path = QFileDialog.getExistingDirectory(self, "Выберите папку проекта")
@@ -615,6 +366,30 @@ class GitHubPublisherApp(QMainWindow):
             repo_name = os.path.basename(folder_path)
             self.repo_name_input.setText(repo_name)
             self.log_message(f"Предложено имя репозитория: {repo_name}")
+            self.start_speculation(folder_path, repo_name)
+
+    def start_speculation(self, project_path, repo_name):
+        """Запускает генерацию README.md в фоне, чтобы публикация не ждала ответа ИИ"""
+        from speculation import SpeculativeGeneration, SPECULATIVE_GENERATION
+        self.cancel_speculation()
+        if not SPECULATIVE_GENERATION or self.force_regenerate_checkbox.isChecked():
+            self.warm_up_llm()
+            return
+        if self.use_llm_checkbox.isChecked():
+            self.speculation = SpeculativeGeneration(project_path, repo_name,
+                                                     stream_llm=self.stream_llm_checkbox.isChecked(),
+                                                     release=self.auto_release_checkbox.isChecked(),
+                                                     log=self.log_output.append_message).start()
+
+    def cancel_speculation(self):
+        speculation = getattr(self, "speculation", None)
+        if speculation is not None and speculation.is_running():
+            speculation.cancel()
+        self.speculation = None
+
+    def warm_up_llm(self):
+        if self.use_llm_checkbox.isChecked():
+            threading.Thread(target=warm_up_ollama, args=(self.log_output.append_message,), daemon=True).start()
 
     def select_screenshot(self):
         file_path, _ = QFileDialog.getOpenFileName(self, "Выберите скриншот программы", "", "Изображения (*.png *.jpg *.jpeg *.gif *.bmp)")
@@ -638,14 +413,60 @@ class GitHubPublisherApp(QMainWindow):
         self.publish_button.setEnabled(False) # Отключаем кнопку на время выполнения
 
         use_llm = self.use_llm_checkbox.isChecked()
-        self.worker = Worker(project_path, repo_name, use_llm)
-        self.worker.log_signal.connect(self.log_message)
+        stream_llm = self.stream_llm_checkbox.isChecked()
+        if not use_llm:
+            # Предварительная генерация не понадобится; с ИИ публикация сама дождется ее или отменит
+            self.cancel_speculation()
+        self.preview_output.clear()
+        self.cancel_generation_button.setEnabled(use_llm and stream_llm)
+        force_regenerate = self.force_regenerate_checkbox.isChecked()
+        incremental = self.incremental_checkbox.isChecked()
+        self.worker = Worker(project_path, repo_name, use_llm, stream_llm, force_regenerate, incremental,
+                             large_files=self.large_files_combo.currentData())
+        self.connect_log(self.worker.log_signal)
+        self.worker.large_files_signal.connect(self.on_large_files, Qt.ConnectionType.BlockingQueuedConnection)
+        self.worker.token_signal.connect(self.append_preview)
         self.worker.finished_signal.connect(self.on_publish_finished)
         self.worker.error_signal.connect(self.on_publish_error)
         self.worker.start()
 
+    def on_large_files(self, estimate):
+        """Спрашивает, что делать с крупными файлами; рабочий поток ждет ответа"""
+        from large_files import LARGE_FILE_POLICIES, GITHUB_FILE_LIMIT, format_push_estimate
+        from release_assets import format_size
+        self.log_output.flush()
+        lines = [f"{path} ({format_size(size)})" for path, size in estimate["large_files"][:10]]
+        if len(estimate["large_files"]) > 10:
+            lines.append(f"... и еще {len(estimate['large_files']) - 10}")
+        too_large = any(size > GITHUB_FILE_LIMIT for _, size in estimate["large_files"])
+        box = QMessageBox(self)
+        box.setIcon(QMessageBox.Icon.Warning)
+        box.setWindowTitle("Крупные файлы")
+        box.setText(f"В проекте есть крупные файлы:\n\n" + "\n".join(lines) + f"\n\n{format_push_estimate(estimate)}"
+                    + (f"\n\nGitHub не примет файлы больше {format_size(GITHUB_FILE_LIMIT)} без Git LFS."
+                       if too_large else ""))
+        buttons = {}
+        for policy in ("lfs", "exclude", "keep", "abort"):
+            if policy == "keep" and too_large:
+                continue
+            role = QMessageBox.ButtonRole.RejectRole if policy == "abort" else QMessageBox.ButtonRole.AcceptRole
+            buttons[box.addButton(LARGE_FILE_POLICIES[policy], role)] = policy
+        box.exec()
+        self.worker.large_files_decision = buttons.get(box.clickedButton(), "abort")
+
+    def append_preview(self, text):
+        self.preview_output.moveCursor(QTextCursor.MoveOperation.End)
+        self.preview_output.insertPlainText(text)
+
+    def cancel_generation(self):
+        self.log_message("Остановка генерации ИИ...")
+        for worker in (getattr(self, "worker", None), getattr(self, "release_worker", None)):
+            if worker is not None and worker.isRunning() and hasattr(worker, "cancel_generation"):
+                worker.cancel_generation()
+
     def on_publish_finished(self):
         self.publish_button.setEnabled(True) # Включаем кнопку обратно
+        self.cancel_generation_button.setEnabled(False)
         self.release_button.setEnabled(True)  # Включаем кнопку релиза
         self.log_message("Процесс публикации завершен. Кнопка 'Создать релиз' должна быть активна.")
         self.log_message(f"Состояние кнопки 'Создать релиз': {self.release_button.isEnabled()}")
@@ -659,6 +480,7 @@ class GitHubPublisherApp(QMainWindow):
 
     def on_publish_error(self, message):
         self.publish_button.setEnabled(True) # Включаем кнопку обратно
+        self.cancel_generation_button.setEnabled(False)
         self.log_message(f"ОШИБКА: {message}")
         QMessageBox.critical(self, "Ошибка публикации", f"Произошла ошибка во время публикации: {message}")
 
@@ -676,72 +498,40 @@ class GitHubPublisherApp(QMainWindow):
             self.log_message("Ошибка: Имя репозитория не указано.")
             return
             
-        # Анализируем проект для генерации информации о релизе
-        self.log_message("Анализ проекта для генерации информации о релизе...")
-        worker = Worker(project_path, repo_name, True)  # Используем ИИ
-        project_info = worker.analyze_project()
-        
-        # Генерируем информацию о релизе с помощью ИИ
-        try:
-            self.log_message("Генерация информации о релизе с помощью ИИ...")
-            gemini_client = GeminiAPIClient(model_name="qwen3-coder:30b")
-            release_info_json = gemini_client.generate_release_info(project_info)
-            
-            # Парсим JSON с информацией о релизе
-            import json
-            import re
-            
-            # Извлекаем JSON из ответа ИИ
-            # Ищем первую открывающуюся скобку и последнюю закрывающуюся
-            json_match = re.search(r'\{.*\}', release_info_json, re.DOTALL)
-            if json_match:
-                json_str = json_match.group(0)
-                try:
-                    release_info = json.loads(json_str)
-                except json.JSONDecodeError as e:
-                    self.log_message(f"Ошибка парсинга JSON от ИИ: {e}")
-                    # Если ИИ не вернул корректный JSON, создаем значения по умолчанию
-                    release_info = {
-                        "tag": "v1.0.0",
-                        "title": "Релиз v1.0.0",
-                        "notes": "## Что нового\n- Реализована основная функциональность\n- Исправлены критические ошибки"
-                    }
-            else:
-                self.log_message("Ошибка: Не удалось найти JSON в ответе ИИ. Используются значения по умолчанию.")
-                release_info = {
-                    "tag": "v1.0.0",
-                    "title": "Релиз v1.0.0",
-                    "notes": "## Что нового\\n- Реализована основная функциональность\\n- Исправлены критические ошибки"
-                }
-            
-            # Создаем данные для релиза
-            release_data = {
-                "tag": release_info.get("tag", "v1.0.0"),
-                "title": release_info.get("title", "Релиз v1.0.0"),
-                "notes": release_info.get("notes", "## Что нового\\n- Реализована основная функциональность")
-            }
-            
-            self.log_message(f"Начинаю автоматическое создание релиза '{release_data['tag']}' для репозитория '{repo_name}'...")
-            
-            # Создаем рабочий поток для создания релиза
-            self.release_worker = ReleaseWorker(project_path, repo_name, release_data, screenshot_path)
-            self.release_worker.log_signal.connect(self.log_message)
-            self.release_worker.finished_signal.connect(self.on_auto_release_finished)
-            self.release_worker.error_signal.connect(self.on_auto_release_error)
-            self.release_worker.start()
-            
-        except Exception as e:
-            self.log_message(f"Ошибка при генерации информации о релизе: {e}")
-            QMessageBox.critical(self, "Ошибка", f"Ошибка при генерации информации о релизе: {e}")
+        # Анализ проекта, генерация информации о релизе и сам релиз выполняются в фоновом потоке,
+        # чтобы не блокировать интерфейс на время сканирования и работы модели
+        self.release_button.setEnabled(False)
+        stream_llm = self.stream_llm_checkbox.isChecked()
+        self.preview_output.clear()
+        self.cancel_generation_button.setEnabled(stream_llm)
+        force_regenerate = self.force_regenerate_checkbox.isChecked()
+        from release_worker import AutoReleaseWorker
+        self.release_worker = AutoReleaseWorker(project_path, repo_name, screenshot_path, stream_llm=stream_llm,
+                                                force_regenerate=force_regenerate)
+        self.connect_log(self.release_worker.log_signal)
+        self.release_worker.token_signal.connect(self.append_preview)
+        self.release_worker.progress_signal.connect(self.on_release_progress)
+        self.release_worker.finished_signal.connect(self.on_auto_release_finished)
+        self.release_worker.error_signal.connect(self.on_auto_release_error)
+        self.release_worker.start()
+
+    def on_release_progress(self, percent, message):
+        self.release_progress.setVisible(True)
+        self.release_progress.setValue(percent)
+        self.release_progress.setFormat(f"{message} %p%")
 
     def on_auto_release_finished(self):
         self.release_button.setEnabled(True)  # Включаем кнопку обратно
+        self.release_progress.setVisible(False)
+        self.cancel_generation_button.setEnabled(False)
         self.log_message("Процесс автоматического создания релиза завершен.")
         self.log_message("Кнопка 'Создать релиз' должна быть активна после завершения.")
         QMessageBox.information(self, "Релиз создан", "Релиз успешно создан на GitHub!")
 
     def on_auto_release_error(self, message):
         self.release_button.setEnabled(True)  # Включаем кнопку обратно
+        self.release_progress.setVisible(False)
+        self.cancel_generation_button.setEnabled(False)
         self.log_message(f"ОШИБКА при автоматическом создании релиза: {message}")
         self.log_message("Кнопка 'Создать релиз' должна быть активна после ошибки.")
         QMessageBox.critical(self, "Ошибка создания релиза", f"Произошла ошибка во время создания релиза: {message}")
@@ -814,8 +604,9 @@ class GitHubPublisherApp(QMainWindow):
             self.log_message("Кнопка 'Создать релиз' отключена во время выполнения.")
 
             # Создаем рабочий поток для создания релиза
+            from release_worker import ReleaseWorker
             self.release_worker = ReleaseWorker(project_path, repo_name, release_data, screenshot_path)
-            self.release_worker.log_signal.connect(self.log_message)
+            self.connect_log(self.release_worker.log_signal)
             self.release_worker.finished_signal.connect(self.on_release_finished)
             self.release_worker.error_signal.connect(self.on_release_error)
             self.release_worker.start()
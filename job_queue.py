@@ -0,0 +1,145 @@
+import os
+import json
+import time
+import sqlite3
+import threading
+from contextlib import contextmanager
+
+from app_paths import user_cache_dir
+
+# Состояния заданий очереди
+JOB_PENDING = "pending"
+JOB_RUNNING = "running"
+JOB_DONE = "done"
+JOB_FAILED = "failed"
+
+JOB_STATUS_TITLES = {
+    JOB_PENDING: "В очереди",
+    JOB_RUNNING: "Выполняется",
+    JOB_DONE: "Готово",
+    JOB_FAILED: "Ошибка",
+}
+
+# Ограничения параллельности по классам ресурсов
+RESOURCE_LIMITS = {
+    "scan": 4,    # анализ проекта и локальные git-операции (диск)
+    "llm": 1,     # генерация через Ollama
+    "push": 2,    # git push/fetch (сеть)
+    "github": 4,  # вызовы GitHub API и gh
+}
+
+
+class ResourceLimiter:
+    """Семафоры для ограничения числа одновременных операций каждого класса ресурсов"""
+
+    def __init__(self, limits=None):
+        self.limits = dict(RESOURCE_LIMITS, **(limits or {}))
+        self._semaphores = {name: threading.BoundedSemaphore(limit) for name, limit in self.limits.items()}
+
+    @contextmanager
+    def slot(self, resource):
+        semaphore = self._semaphores.get(resource)
+        if semaphore is None:
+            yield
+            return
+        with semaphore:
+            yield
+
+
+class JobQueue:
+    """Очередь заданий пакетной публикации, сохраняемая в SQLite"""
+
+    def __init__(self, db_path=None, max_attempts=3, retry_delay=30):
+        self.db_path = db_path or os.path.join(user_cache_dir(), "jobs.sqlite3")
+        self.max_attempts = max_attempts
+        self.retry_delay = retry_delay  # секунды; задержка растет с каждой попыткой
+        self._lock = threading.Lock()
+        with self._connect() as conn:
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS jobs (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    project_path TEXT NOT NULL,
+                    repo_name TEXT NOT NULL,
+                    options TEXT NOT NULL DEFAULT '{}',
+                    status TEXT NOT NULL,
+                    attempts INTEGER NOT NULL DEFAULT 0,
+                    max_attempts INTEGER NOT NULL,
+                    error TEXT,
+                    next_attempt_at REAL NOT NULL DEFAULT 0,
+                    created_at REAL NOT NULL,
+                    updated_at REAL NOT NULL
+                )
+            """)
+
+    @contextmanager
+    def _connect(self):
+        conn = sqlite3.connect(self.db_path, timeout=30)
+        conn.row_factory = sqlite3.Row
+        try:
+            with conn:
+                yield conn
+        finally:
+            conn.close()
+
+    def add(self, project_path, repo_name, options=None):
+        now = time.time()
+        with self._lock, self._connect() as conn:
+            cursor = conn.execute(
+                "INSERT INTO jobs (project_path, repo_name, options, status, max_attempts, created_at, updated_at) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (project_path, repo_name, json.dumps(options or {}), JOB_PENDING, self.max_attempts, now, now))
+            return cursor.lastrowid
+
+    def claim_next(self):
+        """Атомарно берет следующее готовое к запуску задание и помечает его выполняющимся"""
+        with self._lock, self._connect() as conn:
+            row = conn.execute("SELECT * FROM jobs WHERE status = ? AND next_attempt_at <= ? ORDER BY id LIMIT 1",
+                               (JOB_PENDING, time.time())).fetchone()
+            if row is None:
+                return None
+            conn.execute("UPDATE jobs SET status = ?, attempts = attempts + 1, updated_at = ? WHERE id = ?",
+                         (JOB_RUNNING, time.time(), row["id"]))
+            job = dict(row)
+            job["attempts"] += 1
+            job["options"] = json.loads(job["options"])
+            return job
+
+    def mark_done(self, job_id):
+        with self._lock, self._connect() as conn:
+            conn.execute("UPDATE jobs SET status = ?, error = NULL, updated_at = ? WHERE id = ?",
+                         (JOB_DONE, time.time(), job_id))
+
+    def mark_failed(self, job_id, error):
+        """Возвращает задание в очередь для повтора или помечает его ошибочным, если попытки исчерпаны.
+        Возвращает True, если задание будет повторено."""
+        with self._lock, self._connect() as conn:
+            row = conn.execute("SELECT attempts, max_attempts FROM jobs WHERE id = ?", (job_id,)).fetchone()
+            retry = row is not None and row["attempts"] < row["max_attempts"]
+            now = time.time()
+            next_attempt_at = now + self.retry_delay * row["attempts"] if retry else 0
+            conn.execute("UPDATE jobs SET status = ?, error = ?, next_attempt_at = ?, updated_at = ? WHERE id = ?",
+                         (JOB_PENDING if retry else JOB_FAILED, str(error), next_attempt_at, now, job_id))
+            return retry
+
+    def recover_interrupted(self):
+        """Возвращает в очередь задания, прерванные закрытием приложения"""
+        with self._lock, self._connect() as conn:
+            conn.execute("UPDATE jobs SET status = ?, updated_at = ? WHERE status = ?",
+                         (JOB_PENDING, time.time(), JOB_RUNNING))
+
+    def retry_failed(self):
+        with self._lock, self._connect() as conn:
+            conn.execute("UPDATE jobs SET status = ?, attempts = 0, next_attempt_at = 0, updated_at = ? WHERE status = ?",
+                         (JOB_PENDING, time.time(), JOB_FAILED))
+
+    def remove_finished(self):
+        with self._lock, self._connect() as conn:
+            conn.execute("DELETE FROM jobs WHERE status = ?", (JOB_DONE,))
+
+    def list_jobs(self):
+        with self._connect() as conn:
+            return [dict(row) for row in conn.execute("SELECT * FROM jobs ORDER BY id")]
+
+    def has_pending(self):
+        with self._connect() as conn:
+            return conn.execute("SELECT 1 FROM jobs WHERE status = ? LIMIT 1", (JOB_PENDING,)).fetchone() is not None
@@ -0,0 +1,122 @@
+import os
+import re
+
+# Сканер и прочие модули импортируются при вызове: константы нужны окну уже при запуске
+
+# Файлы не меньше этого размера (в мегабайтах) считаются крупными: перед публикацией нужно решить,
+# отправить их через Git LFS, исключить или оставить в Git
+LARGE_FILE_THRESHOLD_MB = float(os.environ.get("GITHUB_PUBLISHER_LARGE_FILE_MB", "50"))
+# GitHub отклоняет push, если в нем есть файл больше 100 МБ
+GITHUB_FILE_LIMIT = 100 * 1024 * 1024
+# Адрес сервера Git LFS; пусто - хранилище LFS репозитория на GitHub
+LFS_URL = os.environ.get("GITHUB_PUBLISHER_LFS_URL", "")
+
+# Что делать с крупными файлами
+LARGE_FILE_POLICIES = {
+    "lfs": "Отправить через Git LFS",
+    "exclude": "Исключить из публикации",
+    "keep": "Оставить в Git",
+    "abort": "Отменить публикацию",
+}
+
+
+def large_file_threshold():
+    return int(LARGE_FILE_THRESHOLD_MB * 1024 * 1024)
+
+
+def _walk_unscanned(project_path, rel_dir, threshold, estimate):
+    """Обходит каталог, который сканер проекта пропускает (node_modules, build, ...), но git добавит в коммит"""
+    stack = [rel_dir]
+    while stack:
+        current = stack.pop()
+        try:
+            with os.scandir(os.path.join(project_path, current)) as it:
+                entries = list(it)
+        except OSError:
+            continue
+        for entry in entries:
+            rel_path = f"{current}/{entry.name}"
+            try:
+                if entry.is_dir(follow_symlinks=False):
+                    if entry.name != ".git":
+                        stack.append(rel_path)
+                    continue
+                size = entry.stat(follow_symlinks=False).st_size
+            except OSError:
+                continue
+            estimate["files"] += 1
+            estimate["bytes"] += size
+            if size >= threshold:
+                estimate["large_files"].append((rel_path, size))
+
+
+def estimate_push(project_path, threshold=None):
+    """Оценивает объем публикации по индексу сканирования проекта (повторный обход перечитывает
+    только изменившиеся каталоги; размеры файлов сверяются с диском, поэтому файл, дописанный
+    на месте, не пропускается). Возвращает число и общий размер файлов, которые попадут в коммит,
+    и крупные файлы [(путь, размер)] по убыванию размера."""
+    from project_scanner import scan_tree, record_files
+    threshold = large_file_threshold() if threshold is None else threshold
+    estimate = {"files": 0, "bytes": 0, "large_files": [], "unscanned_dirs": [], "threshold": threshold}
+    for rel_dir, record in scan_tree(project_path, verify_files=True).items():
+        estimate["files"] += record["files_count"]
+        estimate["bytes"] += record["bytes"]
+        # Список файлов разбирается только в каталогах, где есть крупный файл
+        if record["largest"] >= threshold:
+            for name, (size, _, _) in record_files(record).items():
+                if size >= threshold:
+                    estimate["large_files"].append((f"{rel_dir}/{name}" if rel_dir else name, size))
+        for name in record["unscanned"]:
+            unscanned_dir = f"{rel_dir}/{name}" if rel_dir else name
+            estimate["unscanned_dirs"].append(unscanned_dir)
+            _walk_unscanned(project_path, unscanned_dir, threshold, estimate)
+    estimate["large_files"].sort(key=lambda item: -item[1])
+    return estimate
+
+
+def format_push_estimate(estimate, lfs_paths=(), excluded_paths=()):
+    """Строка для лога: сколько данных уйдет в Git и в Git LFS"""
+    from release_assets import format_size
+    sizes = dict(estimate["large_files"])
+    lfs_bytes = sum(sizes[path] for path in lfs_paths)
+    excluded_bytes = sum(sizes[path] for path in excluded_paths)
+    git_files = estimate["files"] - len(lfs_paths) - len(excluded_paths)
+    text = (f"Оценка объема публикации: {git_files} файлов, {format_size(estimate['bytes'] - lfs_bytes - excluded_bytes)} "
+            f"в Git (до сжатия)")
+    if lfs_paths:
+        text += f", {len(lfs_paths)} файлов, {format_size(lfs_bytes)} в Git LFS"
+    if excluded_paths:
+        text += f", исключено {len(excluded_paths)} файлов, {format_size(excluded_bytes)}"
+    return text
+
+
+def _escape_pattern(path):
+    # Путь превращается в шаблон .gitignore/.gitattributes, совпадающий только с этим файлом
+    return "/" + re.sub(r"([\\*?\[\]!#])", r"\\\1", path)
+
+
+def gitattributes_lfs_line(path):
+    """Строка .gitattributes, отправляющая файл в Git LFS (как 'git lfs track')"""
+    return f"{_escape_pattern(path).replace(' ', '[[:space:]]')} filter=lfs diff=lfs merge=lfs -text"
+
+
+def gitignore_line(path):
+    pattern = _escape_pattern(path)
+    return pattern[:-1] + "\\ " if pattern.endswith(" ") else pattern
+
+
+def append_missing_lines(file_path, lines):
+    """Дописывает в файл строки, которых в нем еще нет; возвращает число добавленных строк"""
+    try:
+        with open(file_path, "r", encoding="utf-8") as f:
+            content = f.read()
+    except FileNotFoundError:
+        content = ""
+    existing = set(content.splitlines())
+    new_lines = [line for line in dict.fromkeys(lines) if line not in existing]
+    if new_lines:
+        with open(file_path, "a", encoding="utf-8", newline="\n") as f:
+            if content and not content.endswith("\n"):
+                f.write("\n")
+            f.write("\n".join(new_lines) + "\n")
+    return len(new_lines)
@@ -0,0 +1,229 @@
+import os
+import json
+import time
+import hashlib
+import threading
+
+from app_paths import user_cache_dir
+
+# Максимальный размер кэша ответов ИИ на диске (в мегабайтах)
+LLM_CACHE_MAX_MB = float(os.environ.get("GITHUB_PUBLISHER_LLM_CACHE_MB", "64"))
+
+
+class LLMCache:
+    """Кэш ответов ИИ на диске с адресацией по содержимому запроса.
+    Ключ - хэш (модель, текст запроса, параметры генерации); при превышении
+    размера удаляются записи, которые дольше всего не использовались (LRU)."""
+
+    def __init__(self, cache_dir=None, max_bytes=None):
+        self.cache_dir = cache_dir or user_cache_dir("llm_cache")
+        self.max_bytes = max_bytes if max_bytes is not None else int(LLM_CACHE_MAX_MB * 1024 * 1024)
+
+    @staticmethod
+    def make_key(model_name, prompt, options=None):
+        payload = json.dumps({"model": model_name, "prompt": prompt, "options": options or {}},
+                             sort_keys=True, ensure_ascii=False)
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    def _entry_path(self, key):
+        return os.path.join(self.cache_dir, f"{key}.json")
+
+    @staticmethod
+    def _response_hash(response):
+        return hashlib.sha256(response.strip().encode("utf-8")).hexdigest()
+
+    def _response_link_path(self, response):
+        return os.path.join(self.cache_dir, "by_response", self._response_hash(response))
+
+    def find_by_response(self, text, context):
+        """Ищет запись, чей ответ совпадает с text (например, README.md, который не менялся
+        после прошлой генерации) и которая создана по тем же остальным данным запроса context.
+        Возвращает запись или None."""
+        try:
+            with open(self._response_link_path(text), "r", encoding="utf-8") as f:
+                key, _, link_context = f.read().strip().partition("\n")
+        except OSError:
+            return None
+        if not context or link_context != context:
+            return None
+        entry = self.get(key)
+        if entry is None:
+            # Запись уже удалена: ссылка на нее больше не нужна
+            self._remove_link(text, key)
+        return entry
+
+    def get(self, key):
+        """Возвращает запись кэша (словарь с полем response) или None"""
+        path = self._entry_path(key)
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                entry = json.load(f)
+        except (OSError, ValueError):
+            return None
+        # Время изменения файла служит отметкой последнего использования для LRU
+        try:
+            os.utime(path)
+        except OSError:
+            pass
+        return entry
+
+    def put(self, key, model_name, response, generation_time, context=None):
+        entry = {
+            "model": model_name,
+            "created": time.time(),
+            "generation_time": generation_time,
+            "response": response,
+        }
+        path = self._entry_path(key)
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(entry, f, ensure_ascii=False)
+        os.replace(tmp_path, path)
+
+        # Обратная ссылка от ответа к ключу: позволяет узнать собственный результат в README.md.
+        # context - хэш остальных данных запроса (кроме README.md), без него ответ не узнается
+        if context:
+            link_path = self._response_link_path(response)
+            os.makedirs(os.path.dirname(link_path), exist_ok=True)
+            with open(link_path, "w", encoding="utf-8") as f:
+                f.write(f"{key}\n{context}")
+        self._evict()
+
+    def _remove_link(self, response, key):
+        """Удаляет обратную ссылку от ответа, если она ведет на запись key; возвращает размер удаленного файла"""
+        link_path = self._response_link_path(response)
+        try:
+            with open(link_path, "r", encoding="utf-8") as f:
+                if f.read().partition("\n")[0].strip() != key:
+                    return 0
+            size = os.path.getsize(link_path)
+            os.remove(link_path)
+            return size
+        except OSError:
+            return 0
+
+    def _evict(self):
+        entries = []
+        total = 0
+        with os.scandir(self.cache_dir) as it:
+            for entry in it:
+                if entry.is_file() and entry.name.endswith(".json"):
+                    st = entry.stat()
+                    entries.append((st.st_mtime, st.st_size, entry.path))
+                    total += st.st_size
+        # Обратные ссылки тоже занимают место и входят в предел размера кэша
+        try:
+            with os.scandir(os.path.join(self.cache_dir, "by_response")) as it:
+                total += sum(link.stat().st_size for link in it if link.is_file())
+        except OSError:
+            pass
+        entries.sort()
+        for _, size, path in entries:
+            if total <= self.max_bytes:
+                break
+            try:
+                with open(path, "r", encoding="utf-8") as f:
+                    response = json.load(f).get("response")
+            except (OSError, ValueError):
+                response = None
+            try:
+                os.remove(path)
+                total -= size
+            except OSError:
+                continue
+            # Вместе с записью удаляется ссылка на нее
+            if response:
+                total -= self._remove_link(response, os.path.basename(path)[:-len(".json")])
+
+
+class _Flight:
+    """Генерация, которая выполняется прямо сейчас; ее результат могут дождаться другие запросы"""
+
+    def __init__(self, speculative, cancel):
+        self.speculative = speculative
+        self.cancel = cancel
+        self.response = None
+        self.done = threading.Event()
+
+
+_flights = {}  # ключ кэша -> _Flight
+_flights_lock = threading.Lock()
+
+
+def _join_or_start_flight(key, speculative, cancel):
+    """Возвращает (генерация, запущена ли она этим вызовом) и список устаревших предварительных генераций"""
+    with _flights_lock:
+        flight = _flights.get(key)
+        if flight is not None:
+            # Предварительную генерацию, которую ждет публикация, уже нельзя отменять как устаревшую
+            flight.speculative = flight.speculative and speculative
+            return flight, False, []
+        flight = _flights[key] = _Flight(speculative, cancel)
+        stale = [] if speculative else [other for other in _flights.values() if other.speculative]
+        for other in stale:
+            other.speculative = False
+        return flight, True, stale
+
+
+def cached_generation(cache, model_name, prompt, generate, options=None, force=False, log=None,
+                      speculative=False, cancel=None, check_cancelled=None, accept=None, context=None):
+    """Возвращает ответ ИИ из кэша или вызывает generate() и сохраняет результат.
+    force=True игнорирует сохраненный ответ и генерирует заново.
+    Если такой же запрос уже выполняется в другом потоке (например, предварительная генерация
+    после выбора папки проекта), его результат дожидается, а не запускается вторая генерация;
+    check_cancelled() во время ожидания выбрасывает исключение, если ожидание нужно прервать.
+    speculative=True помечает предварительную генерацию: ее отменяет через cancel() любой другой
+    запрос, которому ее ответ не нужен, потому что Ollama выполняет запросы по очереди.
+    accept(ответ) -> bool: ответ, не прошедший проверку, не сохраняется и не берется из кэша.
+    context сохраняется вместе с ответом для поиска через LLMCache.find_by_response.
+    Возвращает (ответ, взят ли он из кэша)."""
+    log = log or (lambda message: None)
+    key = cache.make_key(model_name, prompt, options)
+    if force:
+        log("Кэш ИИ: принудительная генерация, сохраненный ответ игнорируется.")
+    else:
+        entry = cache.get(key)
+        if entry is not None and accept and not accept(entry["response"]):
+            log("Кэш ИИ: сохраненный ответ не прошел проверку, запускаю генерацию.")
+            entry = None
+        if entry is not None:
+            log(f"Кэш ИИ: попадание ({model_name}), сэкономлено ~{entry.get('generation_time', 0):.1f} с генерации.")
+            return entry["response"], True
+
+    while True:
+        flight, started_here, stale = _join_or_start_flight(key, speculative, cancel)
+        if started_here:
+            break
+        log(f"Кэш ИИ: такой же запрос к {model_name} уже выполняется, ожидаю его результат.")
+        waited = time.perf_counter()
+        while not flight.done.wait(0.1):
+            if check_cancelled:
+                check_cancelled()
+        if flight.response:
+            log(f"Кэш ИИ: использован результат уже выполнявшейся генерации (ожидание {time.perf_counter() - waited:.1f} с).")
+            return flight.response, True
+        # Та генерация завершилась ошибкой или была отменена: запрос выполняется заново
+
+    for other in stale:
+        log("Кэш ИИ: предварительная генерация с устаревшими данными проекта отменена.")
+        if other.cancel:
+            other.cancel()
+    if not force:
+        log(f"Кэш ИИ: промах ({model_name}), запускаю генерацию.")
+
+    try:
+        started = time.perf_counter()
+        response = generate()
+        generation_time = time.perf_counter() - started
+        if response and (accept is None or accept(response)):
+            try:
+                cache.put(key, model_name, response, generation_time, context=context)
+            except OSError as e:
+                log(f"Не удалось сохранить ответ в кэш ИИ: {e}")
+            # Ожидающим запросам передается только ответ, прошедший проверку; иначе они генерируют заново
+            flight.response = response
+    finally:
+        with _flights_lock:
+            _flights.pop(key, None)
+        flight.done.set()
+    return response, False
@@ -0,0 +1,111 @@
+import os
+import time
+from collections import deque
+
+from PyQt6.QtWidgets import QPlainTextEdit
+from PyQt6.QtCore import QTimer
+
+from app_paths import user_cache_dir
+
+# Сколько последних строк лога хранится в окне
+LOG_VIEW_MAX_LINES = int(os.environ.get("GITHUB_PUBLISHER_LOG_LINES", "5000"))
+# Максимальный размер файла лога до ротации (в мегабайтах) и число старых файлов
+LOG_FILE_MAX_MB = float(os.environ.get("GITHUB_PUBLISHER_LOG_FILE_MB", "5"))
+LOG_FILE_BACKUPS = 3
+# Как часто накопленные сообщения выводятся в окно (мс)
+LOG_FLUSH_INTERVAL_MS = 50
+
+
+class RotatingLogFile:
+    """Полный лог на диске с ротацией по размеру: github_publisher.log, github_publisher.log.1, ..."""
+
+    def __init__(self, path=None, max_bytes=None, backups=LOG_FILE_BACKUPS):
+        self.path = path or os.path.join(user_cache_dir("logs"), "github_publisher.log")
+        self.max_bytes = max_bytes if max_bytes is not None else int(LOG_FILE_MAX_MB * 1024 * 1024)
+        self.backups = backups
+        self._file = None
+        self._stamp_second = None
+        self._stamp = ""
+
+    def _open(self):
+        self._file = open(self.path, "a", encoding="utf-8")
+
+    def _rotate(self):
+        self._file.close()
+        for index in range(self.backups - 1, 0, -1):
+            source = f"{self.path}.{index}"
+            if os.path.exists(source):
+                os.replace(source, f"{self.path}.{index + 1}")
+        if self.backups > 0:
+            os.replace(self.path, f"{self.path}.1")
+        else:
+            os.remove(self.path)
+        self._open()
+
+    def _timestamp(self, moment):
+        # Форматирование времени - заметная доля затрат, поэтому строка пересчитывается раз в секунду
+        second = int(moment)
+        if second != self._stamp_second:
+            self._stamp_second = second
+            self._stamp = time.strftime("%Y-%m-%d %H:%M:%S", time.localtime(second))
+        return self._stamp
+
+    def write(self, records):
+        """Записывает пачку сообщений [(время, сообщение)] одним вызовом write"""
+        if self._file is None:
+            self._open()
+        self._file.write("".join(f"{self._timestamp(moment)} {message}\n" for moment, message in records))
+        self._file.flush()
+        if self._file.tell() >= self.max_bytes:
+            self._rotate()
+
+    def close(self):
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+
+class LogView(QPlainTextEdit):
+    """Окно лога: сообщения накапливаются в буфере и выводятся пачками по таймеру,
+    число строк в окне ограничено, полный лог пишется в файл с ротацией.
+    append_message можно вызывать из любого потока: он только добавляет сообщение в очередь."""
+
+    def __init__(self, parent=None, max_lines=LOG_VIEW_MAX_LINES, log_file=None):
+        super().__init__(parent)
+        self.setReadOnly(True)
+        self.setUndoRedoEnabled(False)
+        self.setMaximumBlockCount(max_lines)
+        self.max_lines = max_lines
+        self.log_file = log_file if log_file is not None else RotatingLogFile()
+        self._pending = deque()
+        self._timer = QTimer(self)
+        self._timer.setInterval(LOG_FLUSH_INTERVAL_MS)
+        self._timer.timeout.connect(self.flush)
+        self._timer.start()
+
+    def append_message(self, message):
+        self._pending.append((time.time(), message))
+
+    def flush(self):
+        """Выводит накопленные сообщения; вызывается таймером в потоке интерфейса"""
+        pending = self._pending
+        if not pending:
+            return
+        # popleft безопасен при одновременном добавлении сообщений из рабочих потоков
+        records = [pending.popleft() for _ in range(len(pending))]
+
+        if self.log_file is not None:
+            try:
+                self.log_file.write(records)
+            except OSError as e:
+                self.log_file = None
+                records.append((time.time(), f"Запись лога в файл отключена: {e}"))
+
+        # Строки, которые все равно вытеснит ограничение окна, не отображаются
+        self.appendPlainText("\n".join(message for _, message in records[-self.max_lines:]))
+
+    def close_log(self):
+        self._timer.stop()
+        self.flush()
+        if self.log_file is not None:
+            self.log_file.close()
@@ -0,0 +1,80 @@
+import os
+import threading
+
+from ollama_client import DEFAULT_MODEL, ollama_service
+
+
+def _models(name, default):
+    return [model.strip() for model in os.environ.get(name, default).split(",") if model.strip()]
+
+
+# Модели по задачам: первая установленная в Ollama из списка через запятую.
+# Описание README.md пишет крупная модель, для тега, заголовка и примечаний релиза хватает маленькой.
+README_MODELS = _models("GITHUB_PUBLISHER_README_MODEL", DEFAULT_MODEL)
+RELEASE_MODELS = _models("GITHUB_PUBLISHER_RELEASE_MODEL", f"qwen2.5-coder:3b,{DEFAULT_MODEL}")
+# Срок ответа модели по задачам в секундах, включая загрузку модели; 0 - без ограничения.
+# Если ИИ не уложился, README.md создается по шаблону, а релиз - со значениями по умолчанию.
+README_DEADLINE = float(os.environ.get("GITHUB_PUBLISHER_README_DEADLINE", "300"))
+RELEASE_DEADLINE = float(os.environ.get("GITHUB_PUBLISHER_RELEASE_DEADLINE", "60"))
+
+TASKS = {
+    "readme": {"models": README_MODELS, "deadline": README_DEADLINE},
+    "release": {"models": RELEASE_MODELS, "deadline": RELEASE_DEADLINE},
+}
+
+
+class DeadlineExceeded(Exception):
+    """ИИ не ответил за отведенное задаче время"""
+
+    def __init__(self, seconds):
+        super().__init__(f"ИИ не ответил за {seconds:g} с")
+        self.seconds = seconds
+
+
+def _is_installed(model, installed):
+    return model in installed or (":" not in model and f"{model}:latest" in installed)
+
+
+def route(task, service=None, log=None):
+    """Выбирает модель и срок для задачи ("readme", "release"): {"task", "model", "deadline"}.
+    Берется первая установленная в Ollama модель из списка; если список моделей получить
+    не удалось (сервер недоступен), - первая из списка."""
+    log = log or (lambda message: None)
+    config = TASKS[task]
+    models = config["models"] or [DEFAULT_MODEL]
+    model = models[0]
+    installed = (service or ollama_service()).available_models()
+    if installed is not None:
+        available = [candidate for candidate in models if _is_installed(candidate, installed)]
+        if available:
+            if available[0] != model:
+                log(f"Модель {model} не установлена в Ollama, используется {available[0]}.")
+            model = available[0]
+    return {"task": task, "model": model, "deadline": config["deadline"]}
+
+
+def call_with_deadline(func, deadline, cancel=None):
+    """Вызывает func() и ждет результат не дольше deadline секунд (0 или None - без ограничения).
+    По истечении срока вызывает cancel(), чтобы освободить Ollama, и выбрасывает DeadlineExceeded;
+    func при этом выполняется в отдельном потоке и может завершиться позже."""
+    if not deadline:
+        return func()
+    outcome = {}
+    done = threading.Event()
+
+    def target():
+        try:
+            outcome["result"] = func()
+        except BaseException as e:
+            outcome["error"] = e
+        finally:
+            done.set()
+
+    threading.Thread(target=target, name="llm-deadline", daemon=True).start()
+    if not done.wait(deadline):
+        if cancel:
+            cancel()
+        raise DeadlineExceeded(deadline)
+    if "error" in outcome:
+        raise outcome["error"]
+    return outcome["result"]
@@ -0,0 +1,312 @@
+import os
+import json
+import time
+import threading
+
+OLLAMA_API_URL = os.environ.get("OLLAMA_API_URL", "http://localhost:11434/api/generate")
+# Модель по умолчанию; модели для отдельных задач выбираются в model_routing
+DEFAULT_MODEL = "qwen3-coder:30b"
+# Сколько Ollama держит модель в памяти после запроса: "30m", "1h", число секунд; "-1" - не выгружать
+OLLAMA_KEEP_ALIVE = os.environ.get("GITHUB_PUBLISHER_OLLAMA_KEEP_ALIVE", "30m")
+# Прогрев (загрузка модели в память) при запуске приложения и выборе папки; 0 - отключить
+OLLAMA_WARM_UP = os.environ.get("GITHUB_PUBLISHER_OLLAMA_WARM_UP", "1") != "0"
+
+_DURATION_UNITS = {"s": 1, "m": 60, "h": 3600}
+
+
+class GenerationCancelled(Exception):
+    """Генерация была отменена пользователем"""
+
+
+def _keep_alive_value(value):
+    # Ollama принимает число секунд или строку длительности ("30m")
+    return int(value) if value.lstrip("-").isdigit() else value
+
+
+def _keep_alive_seconds(value):
+    """Длительность keep_alive в секундах; None - модель не выгружается"""
+    value = str(value).strip()
+    if value.startswith("-"):
+        return None
+    if value[-1:] in _DURATION_UNITS:
+        return float(value[:-1] or 0) * _DURATION_UNITS[value[-1]]
+    return float(value or 0)
+
+
+class OllamaService:
+    """Общие для всего процесса ресурсы Ollama: пул HTTP-соединений (requests.Session),
+    прогрев моделей в фоне и накопленная статистика: сколько времени ушло на загрузку
+    моделей в память и сколько - на саму генерацию. Используется через ollama_service()."""
+
+    def __init__(self, api_url=None, keep_alive=OLLAMA_KEEP_ALIVE):
+        self.api_url = api_url or OLLAMA_API_URL
+        self.keep_alive = keep_alive
+        self._session = None
+        self._lock = threading.Lock()
+        self._warming = {}  # модель -> поток прогрева
+        self._last_used = {}  # модель -> time.monotonic() последнего успешного запроса
+        self._stats = {}
+        self._models = None  # (time.monotonic(), установленные модели)
+
+    @property
+    def session(self):
+        with self._lock:
+            if self._session is None:
+                # requests загружается при первом обращении: импорт занимает заметную часть запуска приложения
+                import requests
+                from requests.adapters import HTTPAdapter
+                session = requests.Session()
+                # Соединения переиспользуются: прогрев, генерация README и релиза идут по одному пулу
+                adapter = HTTPAdapter(pool_connections=2, pool_maxsize=8)
+                session.mount("http://", adapter)
+                session.mount("https://", adapter)
+                self._session = session
+            return self._session
+
+    def available_models(self, max_age=60):
+        """Модели, установленные в Ollama (/api/tags); None, если сервер недоступен"""
+        with self._lock:
+            models = self._models
+        if models is not None and time.monotonic() - models[0] < max_age:
+            return models[1]
+        try:
+            response = self.session.get(self.api_url.rsplit("/api/", 1)[0] + "/api/tags", timeout=(3, 10))
+            response.raise_for_status()
+            names = {model["name"] for model in response.json().get("models", [])}
+        except Exception:
+            return None
+        with self._lock:
+            self._models = (time.monotonic(), names)
+        return names
+
+    def is_warm(self, model_name):
+        """Модель недавно использовалась и, скорее всего, еще загружена в память Ollama"""
+        with self._lock:
+            last_used = self._last_used.get(model_name)
+        if last_used is None:
+            return False
+        keep_alive = _keep_alive_seconds(self.keep_alive)
+        return keep_alive is None or time.monotonic() - last_used < keep_alive * 0.9
+
+    def warm_up(self, model_name=DEFAULT_MODEL, log=None):
+        """Загружает модель в память Ollama в фоновом потоке, не дожидаясь результата.
+        Повторный вызов ничего не делает, пока модель прогревается или недавно использовалась."""
+        if not OLLAMA_WARM_UP or self.is_warm(model_name):
+            return None
+        with self._lock:
+            thread = self._warming.get(model_name)
+            if thread is not None and thread.is_alive():
+                return thread
+            thread = threading.Thread(target=self._warm_up, args=(model_name, log or (lambda message: None)),
+                                      name=f"ollama-warm-up-{model_name}", daemon=True)
+            self._warming[model_name] = thread
+        thread.start()
+        return thread
+
+    def _warm_up(self, model_name, log):
+        started = time.perf_counter()
+        try:
+            # Запрос без текста только загружает модель и продлевает keep_alive
+            response = self.session.post(self.api_url, json={
+                "model": model_name, "prompt": "", "stream": False,
+                "keep_alive": _keep_alive_value(self.keep_alive),
+            }, timeout=(3, 600))
+            response.raise_for_status()
+            data = response.json()
+        except Exception as e:
+            log(f"Прогрев модели {model_name} не выполнен: {e}")
+            return
+        load_seconds = _seconds(data.get("load_duration"))
+        self.record(model_name, {"load_duration": load_seconds}, warm_up=True)
+        log(f"Модель {model_name} загружена в память Ollama за {time.perf_counter() - started:.1f} с"
+            + (f" (загрузка модели: {load_seconds:.1f} с)" if load_seconds is not None else "") + ".")
+
+    def record(self, model_name, stats, warm_up=False):
+        """Учитывает статистику запроса к модели (см. OllamaClient._build_stats)"""
+        with self._lock:
+            self._last_used[model_name] = time.monotonic()
+            entry = self._stats.setdefault(model_name, {
+                "warm_ups": 0, "generations": 0, "cold_starts": 0,
+                "load_seconds": 0.0, "prompt_eval_seconds": 0.0, "eval_seconds": 0.0,
+            })
+            entry["warm_ups" if warm_up else "generations"] += 1
+            load_seconds = stats.get("load_duration") or 0.0
+            # Ollama тратит на загрузку уже загруженной модели миллисекунды
+            if load_seconds >= 1.0:
+                entry["cold_starts"] += 1
+            entry["load_seconds"] += load_seconds
+            entry["prompt_eval_seconds"] += stats.get("prompt_eval_duration") or 0.0
+            entry["eval_seconds"] += stats.get("eval_duration") or 0.0
+
+    def stats(self):
+        """Накопленная статистика по моделям: {модель: {warm_ups, generations, cold_starts, load_seconds, ...}}"""
+        with self._lock:
+            return {model: dict(entry) for model, entry in self._stats.items()}
+
+
+_service = None
+_service_lock = threading.Lock()
+
+
+def ollama_service():
+    """Общий для процесса экземпляр OllamaService"""
+    global _service
+    with _service_lock:
+        if _service is None:
+            _service = OllamaService()
+        return _service
+
+
+def format_service_stats(stats):
+    """Строка для лога: время загрузки моделей и время генерации за все запросы процесса"""
+    parts = []
+    for model, entry in stats.items():
+        parts.append(f"{model}: запросов {entry['generations']}, прогревов {entry['warm_ups']}, "
+                     f"холодных загрузок {entry['cold_starts']}, загрузка {entry['load_seconds']:.1f} с, "
+                     f"генерация {entry['prompt_eval_seconds'] + entry['eval_seconds']:.1f} с")
+    return "Статистика Ollama: " + ("; ".join(parts) if parts else "запросов не было")
+
+
+class OllamaClient:
+    """Клиент Ollama с потоковой генерацией (stream: true). Отмена у каждого клиента своя,
+    а соединения, keep_alive и статистика общие (ollama_service()).
+    Клиент создается на одну публикацию или задачу: отмена действует до конца его работы."""
+
+    def __init__(self, model_name, api_url=None, timeout=600, service=None):
+        self.model_name = model_name
+        self.service = service or ollama_service()
+        self.api_url = api_url or self.service.api_url
+        self.timeout = timeout
+        self._cancel_event = threading.Event()
+        self._response = None
+        self._lock = threading.Lock()
+
+    def is_cancelled(self):
+        return self._cancel_event.is_set()
+
+    def cancel(self):
+        """Прерывает текущую генерацию и не дает начать следующие, в том числе если отмена
+        пришла до начала запроса. Можно вызывать из любого потока."""
+        self._cancel_event.set()
+        with self._lock:
+            response = self._response
+        if response is not None:
+            # Закрытие соединения прерывает ожидание следующего фрагмента ответа
+            try:
+                response.close()
+            except Exception:
+                pass
+
+    def generate_stream(self, prompt, on_tokens=None, options=None, batch_interval=0.1, model_name=None,
+                        output_format=None):
+        """Генерирует ответ в потоковом режиме; model_name заменяет модель клиента для этого запроса.
+        output_format - поле format Ollama: "json" или JSON-схема, которой должен соответствовать ответ.
+        on_tokens вызывается с накопленными фрагментами текста не чаще, чем раз в batch_interval секунд.
+        Возвращает (текст ответа, статистика генерации)."""
+        model_name = model_name or self.model_name
+        payload = {"model": model_name, "prompt": prompt, "stream": True,
+                   "keep_alive": _keep_alive_value(self.service.keep_alive)}
+        if options:
+            payload["options"] = options
+        if output_format:
+            payload["format"] = output_format
+
+        started = time.perf_counter()
+        first_token_at = None
+        chunks = []
+        pending = []
+        last_flush = started
+        final = {}
+        tokens_count = 0
+
+        # Отмена, пришедшая до начала запроса, не дает отправить его в Ollama
+        if self._cancel_event.is_set():
+            raise GenerationCancelled()
+        try:
+            response = self.service.session.post(self.api_url, json=payload, stream=True, timeout=(10, self.timeout))
+            with self._lock:
+                self._response = response
+            if self._cancel_event.is_set():
+                raise GenerationCancelled()
+            response.raise_for_status()
+
+            for line in response.iter_lines():
+                if self._cancel_event.is_set():
+                    raise GenerationCancelled()
+                if not line:
+                    continue
+                data = json.loads(line)
+                if data.get("error"):
+                    raise Exception(f"Ollama вернула ошибку: {data['error']}")
+                token = data.get("response", "")
+                if token:
+                    if first_token_at is None:
+                        first_token_at = time.perf_counter()
+                    tokens_count += 1
+                    chunks.append(token)
+                    pending.append(token)
+                now = time.perf_counter()
+                if on_tokens and pending and (now - last_flush >= batch_interval or data.get("done")):
+                    on_tokens("".join(pending))
+                    pending = []
+                    last_flush = now
+                if data.get("done"):
+                    final = data
+                    break
+        except GenerationCancelled:
+            raise
+        except Exception:
+            if self._cancel_event.is_set():
+                raise GenerationCancelled()
+            raise
+        finally:
+            with self._lock:
+                response, self._response = self._response, None
+            if response is not None:
+                response.close()
+
+        if on_tokens and pending:
+            on_tokens("".join(pending))
+
+        finished = time.perf_counter()
+        stats = self._build_stats(final, started, first_token_at, finished, tokens_count)
+        self.service.record(model_name, stats)
+        return "".join(chunks), stats
+
+    @staticmethod
+    def _build_stats(final, started, first_token_at, finished, tokens_count):
+        """Статистика генерации: время до первого токена и скорость в токенах в секунду"""
+        eval_count = final.get("eval_count") or tokens_count
+        eval_duration = final.get("eval_duration")  # наносекунды
+        if eval_duration:
+            tokens_per_second = eval_count / (eval_duration / 1e9)
+        elif first_token_at is not None and finished > first_token_at:
+            tokens_per_second = tokens_count / (finished - first_token_at)
+        else:
+            tokens_per_second = 0.0
+        return {
+            "time_to_first_token": (first_token_at - started) if first_token_at is not None else None,
+            "total_time": finished - started,
+            "eval_count": eval_count,
+            "prompt_eval_count": final.get("prompt_eval_count"),
+            "tokens_per_second": tokens_per_second,
+            # Длительности из ответа Ollama в секундах: загрузка модели, обработка запроса, генерация
+            "load_duration": _seconds(final.get("load_duration")),
+            "prompt_eval_duration": _seconds(final.get("prompt_eval_duration")),
+            "eval_duration": _seconds(eval_duration),
+        }
+
+
+def _seconds(nanoseconds):
+    return nanoseconds / 1e9 if nanoseconds is not None else None
+
+
+def format_generation_stats(stats):
+    """Строка со статистикой генерации для лога"""
+    ttft = stats["time_to_first_token"]
+    ttft_text = f"{ttft:.2f} с" if ttft is not None else "нет токенов"
+    text = (f"Время до первого токена: {ttft_text}, скорость: {stats['tokens_per_second']:.1f} ток/с, "
+            f"токенов: {stats['eval_count']}, всего: {stats['total_time']:.1f} с")
+    if stats.get("load_duration") is not None:
+        text += f", из них загрузка модели: {stats['load_duration']:.1f} с"
+    return text
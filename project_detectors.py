@@ -0,0 +1,366 @@
+import os
+import re
+import json
+import configparser
+import xml.etree.ElementTree as ET
+
+# Определение типа проекта по манифестам в корне проекта. Каждый детектор объявляет имена файлов
+# или расширения, которые он разбирает; список файлов берется из сканирования проекта (scan_tree),
+# поэтому детекторы не проверяют наличие файлов и открывают только свои манифесты.
+# Найденные стеки объединяются в project_info (см. merge_stacks).
+
+CROSS_PLATFORM = ["Windows", "macOS", "Linux"]
+# Сколько байт манифеста читать с диска
+MAX_MANIFEST_BYTES = 1024 * 1024
+
+
+class Detector:
+    """Детектор стека: filenames и suffixes - файлы корня проекта, которые он разбирает;
+    detect(files, read, log) возвращает стек (см. new_stack) или None.
+    priority задает порядок стеков в project_info: основной стек - с наименьшим значением.
+    fallback=True - детектор используется, только если другие стеки не найдены"""
+
+    def __init__(self, name, detect, filenames=(), suffixes=(), priority=50, fallback=False):
+        self.name = name
+        self.detect = detect
+        self.filenames = frozenset(filenames)
+        self.suffixes = tuple(suffixes)
+        self.priority = priority
+        self.fallback = fallback
+
+    def matches(self, name):
+        return name in self.filenames or name.lower().endswith(self.suffixes)
+
+
+DETECTORS = []
+
+
+def detector(name, filenames=(), suffixes=(), priority=50, fallback=False):
+    """Регистрирует функцию detect(files, read, log) как детектор стека"""
+    def register(detect):
+        DETECTORS.append(Detector(name, detect, filenames, suffixes, priority, fallback))
+        DETECTORS.sort(key=lambda item: item.priority)
+        return detect
+    return register
+
+
+def new_stack(project_type, technologies=(), os_specific=None):
+    return {
+        "type": project_type,
+        "technologies": list(technologies),
+        "dependencies": [],
+        "description": None,
+        "os_specific": list(CROSS_PLATFORM if os_specific is None else os_specific),
+    }
+
+
+# Ошибки чтения и разбора манифеста: детектор ловит их сам, чтобы из-за поврежденного манифеста
+# терялись только описание и зависимости, а тип проекта и целевые ОС оставались
+MANIFEST_ERRORS = (OSError, ValueError, ET.ParseError, configparser.Error)
+
+
+def _manifest_error(log, name, error):
+    log(f"Ошибка при разборе {name}: {error}")
+
+
+def _load_json(text):
+    data = json.loads(text)
+    if not isinstance(data, dict):
+        raise ValueError("ожидался объект JSON")
+    return data
+
+
+def _load_toml(text):
+    try:
+        import tomllib
+    except ImportError:
+        # До Python 3.11 TOML разбирается пакетом tomli, если он установлен
+        import tomli as tomllib
+    return tomllib.loads(text)
+
+
+def _requirement_name(requirement):
+    return re.split(r"[\s<>=!~;\[(@]", requirement.strip(), maxsplit=1)[0]
+
+
+def _xml_children(element, name):
+    """Дочерние элементы без учета пространства имен XML (pom.xml, .csproj)"""
+    return [child for child in element if child.tag.rsplit("}", 1)[-1] == name]
+
+
+def _xml_text(element, *path):
+    for name in path:
+        children = _xml_children(element, name) if element is not None else []
+        element = children[0] if children else None
+    return element.text.strip() if element is not None and element.text and element.text.strip() else None
+
+
+@detector(".NET", suffixes=(".csproj",), priority=10)
+def detect_dotnet(files, read, log):
+    project_file = files[0]
+    log(f"Обнаружен C# проект ({project_file}). Устанавливаю целевую ОС как Windows.")
+    stack = new_stack("C# (.NET)", ["C#", ".NET"], ["Windows"])  # C# проекты по умолчанию для Windows
+    try:
+        root = ET.fromstring(read(project_file))
+    except MANIFEST_ERRORS as e:
+        _manifest_error(log, project_file, e)
+        return stack
+    for group in _xml_children(root, "PropertyGroup"):
+        stack["description"] = stack["description"] or _xml_text(group, "Description")
+    for group in _xml_children(root, "ItemGroup"):
+        for reference in _xml_children(group, "PackageReference"):
+            if reference.get("Include"):
+                stack["dependencies"].append(reference.get("Include"))
+    return stack
+
+
+# Тип Node.js-проекта по зависимостям: (пакет, название фреймворка, тип проекта), Electron важнее остальных
+NODE_FRAMEWORKS = [
+    ("electron", "Electron", "Electron Desktop App"),
+    ("react", "React", "React Web App"),
+    ("@angular/core", "Angular", "Angular Web App"),
+    ("vue", "Vue.js", "Vue.js Web App"),
+]
+
+
+@detector("Node.js", filenames=("package.json",), priority=20)
+def detect_node(files, read, log):
+    log("Обнаружен package.json. Анализирую JavaScript/Node.js проект...")
+    stack = new_stack("JavaScript/Node.js", ["JavaScript", "Node.js"], [])
+    try:
+        package_json = _load_json(read("package.json"))
+    except MANIFEST_ERRORS as e:
+        # Проект остается Node.js-проектом, хотя подробности из package.json недоступны
+        _manifest_error(log, "package.json", e)
+        return stack
+    stack["description"] = package_json.get("description") or None
+    found = {}
+    for field, label in (("dependencies", "зависимостям"), ("devDependencies", "devDependencies")):
+        dependencies = package_json.get(field) or {}
+        stack["dependencies"].extend(dependencies)
+        for package, _, _ in NODE_FRAMEWORKS:
+            if package in dependencies:
+                found.setdefault(package, label)
+    for package, framework, project_type in NODE_FRAMEWORKS:
+        if package in found:
+            stack["type"] = project_type
+            log(f"Определен как {framework} приложение по {found[package]}")
+            break
+    # Проверка скриптов для определения Electron
+    for script_name, script in (package_json.get("scripts") or {}).items():
+        if "electron" in str(script):
+            stack["type"] = "Electron Desktop App"
+            log(f"Определен как Electron приложение по скрипту '{script_name}': {script}")
+            break
+    if stack["type"] == "Electron Desktop App":
+        stack["os_specific"] = list(CROSS_PLATFORM)
+    return stack
+
+
+@detector("Python", filenames=("pyproject.toml", "requirements.txt", "setup.cfg", "setup.py"), priority=30)
+def detect_python(files, read, log):
+    log(f"Обнаружен {', '.join(files)}. Анализирую Python проект...")
+    stack = new_stack("Python", ["Python"])  # Python кроссплатформенный
+    # Манифесты разбираются независимо: ошибка в одном не мешает взять данные из остальных
+    if "requirements.txt" in files:
+        try:
+            stack["dependencies"] = [line.strip() for line in read("requirements.txt").splitlines()
+                                     if line.strip() and not line.strip().startswith(("#", "-"))]
+        except MANIFEST_ERRORS as e:
+            _manifest_error(log, "requirements.txt", e)
+    if "pyproject.toml" in files:
+        try:
+            pyproject = _load_toml(read("pyproject.toml"))
+        except ImportError:
+            log("pyproject.toml не разобран: для Python до 3.11 нужен пакет tomli (pip install tomli).")
+            pyproject = {}
+        except MANIFEST_ERRORS as e:
+            _manifest_error(log, "pyproject.toml", e)
+            pyproject = {}
+        project = pyproject.get("project") or {}
+        poetry = (pyproject.get("tool") or {}).get("poetry") or {}
+        stack["description"] = project.get("description") or poetry.get("description") or None
+        requirements = list(project.get("dependencies") or [])
+        requirements += [name for name in poetry.get("dependencies") or {} if name.lower() != "python"]
+        known = {_requirement_name(requirement) for requirement in stack["dependencies"]}
+        stack["dependencies"] += [requirement for requirement in requirements
+                                  if _requirement_name(requirement) not in known]
+    if "setup.cfg" in files:
+        config = configparser.ConfigParser(interpolation=None)
+        try:
+            config.read_string(read("setup.cfg"))
+        except MANIFEST_ERRORS as e:
+            _manifest_error(log, "setup.cfg", e)
+            return stack
+        stack["description"] = stack["description"] or config.get("metadata", "description", fallback=None)
+        if not stack["dependencies"]:
+            stack["dependencies"] = [line.strip() for line in
+                                     config.get("options", "install_requires", fallback="").splitlines() if line.strip()]
+    return stack
+
+
+@detector("Java (Maven)", filenames=("pom.xml",), priority=40)
+def detect_maven(files, read, log):
+    log("Обнаружен pom.xml. Анализирую Java проект...")
+    stack = new_stack("Java", ["Java", "Maven"])  # Java кроссплатформенный
+    try:
+        root = ET.fromstring(read("pom.xml"))
+    except MANIFEST_ERRORS as e:
+        _manifest_error(log, "pom.xml", e)
+        return stack
+    stack["description"] = _xml_text(root, "description")
+    for dependencies in _xml_children(root, "dependencies"):
+        for dependency in _xml_children(dependencies, "dependency"):
+            artifact = _xml_text(dependency, "artifactId")
+            if artifact:
+                group = _xml_text(dependency, "groupId")
+                stack["dependencies"].append(f"{group}:{artifact}" if group else artifact)
+    return stack
+
+
+@detector("Java (Gradle)", filenames=("build.gradle", "build.gradle.kts", "settings.gradle", "settings.gradle.kts"),
+          priority=41)
+def detect_gradle(files, read, log):
+    log(f"Обнаружен {files[0]}. Анализирую Java проект (Gradle)...")
+    kotlin = any(name.endswith(".kts") for name in files)
+    return new_stack("Java", ["Java", "Gradle"] + (["Kotlin"] if kotlin else []))
+
+
+@detector("Go", filenames=("go.mod",), priority=42)
+def detect_go(files, read, log):
+    log("Обнаружен go.mod. Анализирую Go проект...")
+    stack = new_stack("Go", ["Go"])
+    try:
+        text = read("go.mod")
+    except MANIFEST_ERRORS as e:
+        _manifest_error(log, "go.mod", e)
+        return stack
+    # go.mod: директивы require - по одной или блоком в скобках
+    in_block = False
+    for line in text.splitlines():
+        line = line.split("//", 1)[0].strip()
+        if in_block:
+            if line == ")":
+                in_block = False
+            elif line:
+                stack["dependencies"].append(line.split()[0])
+        elif line == "require (":
+            in_block = True
+        elif line.startswith("require "):
+            stack["dependencies"].append(line.split()[1])
+    return stack
+
+
+@detector("Rust", filenames=("Cargo.toml",), priority=43)
+def detect_rust(files, read, log):
+    log("Обнаружен Cargo.toml. Анализирую Rust проект...")
+    stack = new_stack("Rust", ["Rust", "Cargo"])
+    try:
+        cargo = _load_toml(read("Cargo.toml"))
+    except ImportError:
+        log("Cargo.toml не разобран: для Python до 3.11 нужен пакет tomli (pip install tomli).")
+        return stack
+    except MANIFEST_ERRORS as e:
+        _manifest_error(log, "Cargo.toml", e)
+        return stack
+    stack["description"] = (cargo.get("package") or {}).get("description")
+    stack["dependencies"] = list(cargo.get("dependencies") or {})
+    return stack
+
+
+@detector("PHP", filenames=("composer.json",), priority=44)
+def detect_php(files, read, log):
+    log("Обнаружен composer.json. Анализирую PHP проект...")
+    stack = new_stack("PHP", ["PHP", "Composer"])
+    try:
+        composer = _load_json(read("composer.json"))
+    except MANIFEST_ERRORS as e:
+        _manifest_error(log, "composer.json", e)
+        return stack
+    stack["description"] = composer.get("description") or None
+    stack["dependencies"] = [name for name in composer.get("require") or {} if name != "php"]
+    return stack
+
+
+@detector("Ruby", filenames=("Gemfile",), priority=45)
+def detect_ruby(files, read, log):
+    log("Обнаружен Gemfile. Анализирую Ruby проект...")
+    stack = new_stack("Ruby", ["Ruby", "Bundler"])
+    try:
+        stack["dependencies"] = re.findall(r"""^\s*gem\s+['"]([^'"]+)['"]""", read("Gemfile"), re.M)
+    except MANIFEST_ERRORS as e:
+        _manifest_error(log, "Gemfile", e)
+    return stack
+
+
+@detector("C++ (CMake)", filenames=("CMakeLists.txt",), priority=50)
+def detect_cmake(files, read, log):
+    log("Обнаружен CMakeLists.txt. Анализирую C++ проект...")
+    # CMake кроссплатформенный; зависимости обычно устанавливаются отдельно
+    stack = new_stack("C++", ["C++", "CMake"])
+    try:
+        text = read("CMakeLists.txt")
+    except MANIFEST_ERRORS as e:
+        _manifest_error(log, "CMakeLists.txt", e)
+        return stack
+    match = re.search(r'project\s*\([^)]*DESCRIPTION\s+"([^"]+)"', text, re.I | re.S)
+    if match:
+        stack["description"] = match.group(1).strip()
+    return stack
+
+
+@detector("HTML", filenames=("index.html", "main.html"), priority=90, fallback=True)
+def detect_html(files, read, log):
+    log("Обнаружен HTML файл. Анализирую веб-проект...")
+    # Веб-приложения кроссплатформенные
+    return new_stack("HTML/CSS/JS", ["HTML", "CSS", "JavaScript"])
+
+
+def detect_stacks(project_path, file_names, log=None):
+    """Запускает детекторы для файлов корня проекта file_names. Возвращает найденные стеки
+    в порядке приоритета. Ошибки разбора манифестов детекторы обрабатывают сами; непредвиденная
+    ошибка детектора не мешает остальным детекторам"""
+    log = log or (lambda message: None)
+
+    def read(name):
+        with open(os.path.join(project_path, name), "r", encoding="utf-8-sig", errors="replace") as f:
+            return f.read(MAX_MANIFEST_BYTES)
+
+    names = sorted(file_names)
+    stacks = []
+    for item in DETECTORS:
+        if item.fallback and stacks:
+            continue
+        files = [name for name in names if item.matches(name)]
+        if not files:
+            continue
+        try:
+            stack = item.detect(files, read, log)
+        except Exception as e:
+            log(f"Ошибка детектора {item.name} ({', '.join(files)}): {e}")
+            continue
+        if stack is not None:
+            stacks.append(stack)
+    return stacks
+
+
+def merge_stacks(project_info, stacks):
+    """Объединяет стеки в project_info: тип - типы стеков через " + " (первым основной), технологии и
+    зависимости - объединение, описание - первое найденное, целевые ОС - основного стека"""
+    if not stacks:
+        return project_info
+    types = []
+    for stack in stacks:
+        if stack["type"] not in types:
+            types.append(stack["type"])
+        project_info["technologies"].update(stack["technologies"])
+        for dependency in stack["dependencies"]:
+            if dependency not in project_info["dependencies"]:
+                project_info["dependencies"].append(dependency)
+    descriptions = [stack["description"] for stack in stacks if stack["description"]]
+    if descriptions:
+        project_info["description"] = descriptions[0]
+    project_info["type"] = " + ".join(types)
+    project_info["stacks"] = types
+    project_info["os_specific"] = list(stacks[0]["os_specific"])
+    return project_info
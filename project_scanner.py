@@ -0,0 +1,441 @@
+import os
+import re
+import hashlib
+import pickle
+from collections import deque
+
+from app_paths import user_cache_dir
+from project_detectors import detect_stacks, merge_stacks
+
+# Каталоги, в которые сканер никогда не заходит (служебные, зависимости, артефакты сборки)
+IGNORED_DIRS = frozenset({
+    ".git", ".hg", ".svn",
+    "node_modules", "bower_components",
+    "venv", ".venv", "__pycache__", ".tox", ".nox",
+    ".mypy_cache", ".pytest_cache", ".ruff_cache",
+    "build", "dist", "target", "obj",
+    ".idea", ".vs",
+})
+
+# Расширения файлов, которые попадают в список основных файлов проекта
+MAIN_FILE_SUFFIXES = frozenset({
+    ".py", ".js", ".html", ".css", ".json", ".md", ".java", ".cpp", ".cc", ".h",
+})
+
+# Технология, определяемая по расширению файла
+TECHNOLOGY_BY_SUFFIX = {
+    ".py": "Python",
+    ".js": "JavaScript",
+    ".html": "HTML",
+    ".css": "CSS",
+    ".java": "Java",
+    ".cpp": "C++",
+    ".cc": "C++",
+    ".h": "C++",
+}
+
+# Имена файлов, которые считаются точкой входа
+ENTRY_POINT_NAMES = frozenset({
+    "main.py", "app.py", "run.py", "start.py", "manage.py",
+    "index.js", "main.js", "server.js", "app.js",
+    "Main.java", "App.java",
+    "main.cpp", "main.cc",
+})
+
+# Целевая ОС, определяемая по расширению файла
+OS_BY_SUFFIX = {
+    ".exe": "Windows",
+    ".msi": "Windows",
+    ".app": "macOS",
+    ".deb": "Linux",
+    ".rpm": "Linux",
+    ".sh": "Linux",
+}
+
+
+def classify_file(name):
+    """Классифицирует файл по имени: (основной файл, технология, точка входа, ОС)"""
+    suffix = os.path.splitext(name)[1].lower()
+    return (
+        suffix in MAIN_FILE_SUFFIXES,
+        TECHNOLOGY_BY_SUFFIX.get(suffix),
+        name in ENTRY_POINT_NAMES,
+        OS_BY_SUFFIX.get(suffix),
+    )
+
+
+# Подпись таблиц классификации: при их изменении сохраненные индексы становятся недействительными
+_RULES_SIGNATURE = hashlib.sha1(repr((
+    3,  # версия формата индекса
+    sorted(IGNORED_DIRS), sorted(MAIN_FILE_SUFFIXES), sorted(TECHNOLOGY_BY_SUFFIX.items()),
+    sorted(ENTRY_POINT_NAMES), sorted(OS_BY_SUFFIX.items()),
+)).encode("utf-8")).hexdigest()
+
+
+def _translate_gitignore_pattern(pattern):
+    """Переводит шаблон .gitignore в регулярное выражение"""
+    result = []
+    i, n = 0, len(pattern)
+    while i < n:
+        c = pattern[i]
+        if c == "*":
+            if pattern.startswith("**/", i):
+                # '**/' соответствует любому количеству каталогов, в том числе нулю
+                result.append("(?:.*/)?")
+                i += 3
+                continue
+            if pattern.startswith("**", i):
+                result.append(".*")
+                i += 2
+                continue
+            result.append("[^/]*")
+        elif c == "?":
+            result.append("[^/]")
+        elif c == "[":
+            end = pattern.find("]", i + 1)
+            if end == -1:
+                result.append(re.escape(c))
+            else:
+                body = pattern[i + 1:end]
+                if body.startswith("!"):
+                    body = "^" + body[1:]
+                result.append("[" + body.replace("\\", "\\\\") + "]")
+                i = end + 1
+                continue
+        elif c == "\\" and i + 1 < n:
+            result.append(re.escape(pattern[i + 1]))
+            i += 2
+            continue
+        else:
+            result.append(re.escape(c))
+        i += 1
+    return re.compile("".join(result) + r"\Z")
+
+
+class GitignoreRules:
+    """Правила одного файла .gitignore, привязанные к каталогу base (относительно корня проекта)"""
+
+    def __init__(self, base, lines):
+        self.base = base
+        self.rules = []  # (regex, negate, dir_only, anchored)
+        for line in lines:
+            line = line.rstrip("\n").rstrip()
+            if not line or line.startswith("#"):
+                continue
+            negate = line.startswith("!")
+            if negate:
+                line = line[1:]
+            dir_only = line.endswith("/")
+            line = line.rstrip("/")
+            if not line:
+                continue
+            # Шаблон со слэшем привязан к каталогу .gitignore, без слэша - к имени на любой глубине
+            anchored = "/" in line
+            line = line.lstrip("/")
+            self.rules.append((_translate_gitignore_pattern(line), negate, dir_only, anchored))
+
+    @classmethod
+    def from_file(cls, base, path):
+        try:
+            with open(path, "r", encoding="utf-8", errors="replace") as f:
+                return cls(base, f.readlines())
+        except OSError:
+            return None
+
+    def match(self, rel_path, name, is_dir):
+        """Возвращает True/False, если путь попадает под правила, или None, если ни одно правило не подошло"""
+        if self.base:
+            if not rel_path.startswith(self.base + "/"):
+                return None
+            rel_path = rel_path[len(self.base) + 1:]
+        result = None
+        for regex, negate, dir_only, anchored in self.rules:
+            if dir_only and not is_dir:
+                continue
+            if regex.match(rel_path if anchored else name):
+                result = not negate
+        return result
+
+
+def is_ignored(rules_stack, rel_path, name, is_dir):
+    """Проверяет путь по всем действующим .gitignore; более глубокие файлы имеют приоритет"""
+    ignored = False
+    for rules in rules_stack:
+        result = rules.match(rel_path, name, is_dir)
+        if result is not None:
+            ignored = result
+    return ignored
+
+
+def _index_path(project_path):
+    key = hashlib.sha1(os.path.abspath(project_path).encode("utf-8")).hexdigest()
+    return os.path.join(user_cache_dir("scan_index"), f"{key}.pickle")
+
+
+def _load_index(project_path):
+    try:
+        with open(_index_path(project_path), "rb") as f:
+            index = pickle.load(f)
+    except Exception:
+        return None
+    if index.get("signature") != _RULES_SIGNATURE:
+        return None
+    return index
+
+
+def _save_index(project_path, index):
+    path = _index_path(project_path)
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    with open(tmp_path, "wb") as f:
+        pickle.dump(index, f, protocol=pickle.HIGHEST_PROTOCOL)
+    os.replace(tmp_path, path)
+
+
+def _stat_key(path):
+    try:
+        st = os.stat(path)
+    except OSError:
+        return None
+    return (st.st_mtime_ns, st.st_size)
+
+
+def _scan_directory(abs_dir, rel_dir, rules_stack, mtime_ns):
+    """Читает один каталог и возвращает его запись для индекса"""
+    record = {
+        "mtime": mtime_ns,
+        "files": None,  # сериализованный словарь имя -> (размер, mtime_ns, классификация), см. record_files
+        "subdirs": [],
+        "pruned": 0,
+        "unscanned": [],  # каталоги из IGNORED_DIRS, которые не исключены .gitignore и попадут в коммит
+        "bytes": 0,
+        "largest": 0,
+        "main_files": [],
+        "technologies": set(),
+        "entry_point": None,
+        "os_specific": [],
+    }
+    files = {}
+    with os.scandir(abs_dir) as it:
+        entries = list(it)
+
+    for entry in entries:
+        name = entry.name
+        rel_path = f"{rel_dir}/{name}" if rel_dir else name
+        try:
+            is_dir = entry.is_dir(follow_symlinks=False)
+        except OSError:
+            continue
+
+        if is_dir:
+            if name in IGNORED_DIRS or is_ignored(rules_stack, rel_path, name, True):
+                record["pruned"] += 1
+                if name in IGNORED_DIRS and name != ".git" and not is_ignored(rules_stack, rel_path, name, True):
+                    record["unscanned"].append(name)
+            else:
+                record["subdirs"].append(name)
+            continue
+
+        if rules_stack and is_ignored(rules_stack, rel_path, name, False):
+            continue
+        try:
+            st = entry.stat()
+        except OSError:
+            continue
+        classification = classify_file(name)
+        files[name] = (st.st_size, st.st_mtime_ns, classification)
+        record["bytes"] += st.st_size
+        if st.st_size > record["largest"]:
+            record["largest"] = st.st_size
+
+        # Сводка каталога, которая затем сливается в project_info без повторного разбора файлов
+        is_main, technology, is_entry_point, os_name = classification
+        if is_main:
+            record["main_files"].append(os.path.normpath(rel_path))
+        if technology:
+            record["technologies"].add(technology)
+            if is_entry_point and not record["entry_point"]:
+                record["entry_point"] = os.path.normpath(rel_path)
+        if os_name and os_name not in record["os_specific"]:
+            record["os_specific"].append(os_name)
+
+    # Подробности по файлам нужны редко, поэтому хранятся отдельным блоком и
+    # не разбираются при загрузке индекса, если каталог не менялся
+    record["files_count"] = len(files)
+    record["files"] = pickle.dumps(files, protocol=pickle.HIGHEST_PROTOCOL)
+    return record
+
+
+def record_files(record):
+    """Возвращает словарь файлов каталога: имя -> (размер, mtime_ns, классификация)"""
+    return pickle.loads(record["files"])
+
+
+def _files_unchanged(abs_dir, record):
+    """Проверяет размер и mtime файлов записи: mtime каталога не меняется, когда файл
+    дописывается на месте, поэтому размеры из индекса без этой проверки могут устареть"""
+    for name, (size, mtime_ns, _) in record_files(record).items():
+        try:
+            st = os.stat(os.path.join(abs_dir, name))
+        except OSError:
+            return False
+        if st.st_size != size or st.st_mtime_ns != mtime_ns:
+            return False
+    return True
+
+
+def scan_tree(project_path, log=None, use_index=True, verify_files=True):
+    """Обходит проект через os.scandir, отсекая игнорируемые каталоги.
+    При наличии индекса перечитываются только каталоги с изменившимся mtime,
+    остальные записи берутся из индекса. Возвращает словарь {относительный каталог: запись}
+    в порядке обхода в ширину.
+    verify_files=True сверяет размер и mtime каждого файла взятой из индекса записи и перечитывает
+    каталог, если файл изменился; без проверки актуальны только данные по именам файлов
+    (список файлов, классификация), но не размеры (bytes, largest, размеры в record_files)."""
+    index = _load_index(project_path) if use_index else None
+    old_dirs = index["dirs"] if index else {}
+    old_gitignores = index["gitignores"] if index else {}
+
+    # Каталоги, чей .gitignore изменился: их поддеревья нужно перечитать целиком
+    changed_rules = {
+        rel_dir for rel_dir, key in old_gitignores.items()
+        if _stat_key(os.path.join(project_path, rel_dir, ".gitignore")) != key
+    }
+
+    dirs = {}
+    gitignores = {}
+    reused_count = 0
+    rescanned_count = 0
+    # Очередь обхода в ширину: (абсолютный путь, относительный путь, действующие .gitignore, перечитать принудительно)
+    queue = deque([(project_path, "", [], False)])
+
+    while queue:
+        abs_dir, rel_dir, rules_stack, force = queue.popleft()
+        try:
+            mtime_ns = os.stat(abs_dir).st_mtime_ns
+        except OSError as e:
+            if log:
+                log(f"Не удалось прочитать каталог {abs_dir}: {e}")
+            continue
+
+        gitignore_path = os.path.join(abs_dir, ".gitignore")
+        gitignore_key = _stat_key(gitignore_path)
+        if gitignore_key is not None:
+            # .gitignore действует на свой каталог и все подкаталоги
+            rules = GitignoreRules.from_file(rel_dir, gitignore_path)
+            if rules:
+                rules_stack = rules_stack + [rules]
+            gitignores[rel_dir] = gitignore_key
+        if rel_dir in changed_rules or (rel_dir in old_dirs and (rel_dir in old_gitignores) != (gitignore_key is not None)):
+            force = True
+
+        record = old_dirs.get(rel_dir)
+        if (force or record is None or record["mtime"] != mtime_ns
+                or verify_files and not _files_unchanged(abs_dir, record)):
+            try:
+                record = _scan_directory(abs_dir, rel_dir, rules_stack, mtime_ns)
+            except OSError as e:
+                if log:
+                    log(f"Не удалось прочитать каталог {abs_dir}: {e}")
+                continue
+            rescanned_count += 1
+        else:
+            reused_count += 1
+        dirs[rel_dir] = record
+
+        for name in record["subdirs"]:
+            queue.append((os.path.join(abs_dir, name), f"{rel_dir}/{name}" if rel_dir else name, rules_stack, force))
+
+    if use_index and (rescanned_count or len(dirs) != len(old_dirs) or gitignores != old_gitignores):
+        try:
+            _save_index(project_path, {"signature": _RULES_SIGNATURE, "dirs": dirs, "gitignores": gitignores})
+        except OSError as e:
+            if log:
+                log(f"Не удалось сохранить индекс сканирования: {e}")
+
+    if log:
+        files_count = sum(record["files_count"] for record in dirs.values())
+        pruned_count = sum(record["pruned"] for record in dirs.values())
+        log(f"Просканировано файлов: {files_count}, пропущено каталогов: {pruned_count}, "
+            f"каталогов перечитано: {rescanned_count}, взято из индекса: {reused_count}")
+    return dirs
+
+
+def merge_scan(dirs, project_info):
+    """Заполняет main_files, technologies, entry_point и os_specific в project_info по записям scan_tree"""
+    # Порядок обхода в ширину гарантирует, что первой найдется самая неглубокая точка входа
+    for record in dirs.values():
+        project_info["main_files"].extend(record["main_files"])
+        project_info["technologies"].update(record["technologies"])
+        if record["entry_point"] and not project_info["entry_point"]:
+            project_info["entry_point"] = record["entry_point"]
+        for os_name in record["os_specific"]:
+            if os_name not in project_info["os_specific"]:
+                project_info["os_specific"].append(os_name)
+    return project_info
+
+
+def scan_project(project_path, project_info, log=None, use_index=True):
+    """Заполняет main_files, technologies, entry_point и os_specific в project_info
+    по результатам scan_tree"""
+    return merge_scan(scan_tree(project_path, log=log, use_index=use_index, verify_files=False), project_info)
+
+
+def analyze_project(project_path, repo_name, log=None):
+    """Анализирует структуру проекта и возвращает project_info"""
+    log = log or (lambda message: None)
+    project_info = {
+        "name": repo_name,
+        "type": "Неизвестно",
+        "stacks": [],  # Все найденные стеки, первым - основной (см. project_detectors)
+        "os_specific": [],  # Для определения целевой ОС
+        "description": "Автоматически сгенерированный проект.",
+        "main_files": [],
+        "dependencies": [],
+        "technologies": set(),  # Для сбора используемых технологий
+        "entry_point": None,
+        "has_tests": False,
+        "license": "Не указано",
+        "existing_readme": None
+    }
+
+    # Один обход проекта: по его результатам проверяются README.md, лицензия, тесты и манифесты.
+    # Анализу нужны только имена файлов, поэтому размеры файлов из индекса не сверяются
+    log("Сканирую файлы проекта...")
+    dirs = scan_tree(project_path, log=log, verify_files=False)
+    root = dirs.get("")
+    root_files = set(record_files(root)) if root else set()
+    root_dirs = set(root["subdirs"]) if root else set()
+
+    # Чтение существующего README.md
+    if "README.md" in root_files:
+        try:
+            log("Обнаружен существующий README.md. Читаю его содержимое...")
+            with open(os.path.join(project_path, "README.md"), "r", encoding="utf-8") as f:
+                project_info["existing_readme"] = f.read()
+        except Exception as e:
+            log(f"Ошибка при чтении существующего README.md: {e}")
+
+    # Проверка лицензии
+    license_files = ["LICENSE", "LICENSE.md", "LICENSE.txt", "COPYING", "COPYING.md"]
+    for license_file in license_files:
+        if license_file in root_files:
+            project_info["license"] = license_file
+            break
+
+    # Проверка на наличие тестов
+    project_info["has_tests"] = bool(root_dirs & {"tests", "test", "__tests__"})
+
+    # Тип проекта и целевая ОС по манифестам: найденные стеки объединяются, первым идет основной
+    merge_stacks(project_info, detect_stacks(project_path, root_files, log=log))
+
+    # Если не определена целевая ОС, используем универсальные инструкции
+    if not project_info["os_specific"]:
+        project_info["os_specific"] = ["Windows", "macOS", "Linux"]  # По умолчанию для кроссплатформенных приложений
+        log("Целевая ОС не определена. Использую кроссплатформенные инструкции.")
+
+    # Сбор списка основных файлов и технологий
+    merge_scan(dirs, project_info)
+
+    project_info["technologies"] = list(project_info["technologies"])
+    log(f"Анализ завершен. Тип проекта: {project_info['type']}, Целевые ОС: {project_info['os_specific']}")
+    return project_info
@@ -0,0 +1,166 @@
+import os
+import re
+
+# Бюджет токенов на весь запрос к ИИ (инструкции + контекст проекта)
+PROMPT_TOKEN_BUDGET = int(os.environ.get("GITHUB_PUBLISHER_PROMPT_TOKENS", "6000"))
+
+# Запас на служебный текст, которым обрамляется контекст в запросе
+PROMPT_WRAPPER_TOKENS = 150
+
+# Грубая оценка: средняя длина токена в символах для смеси русского текста, английского и кода
+CHARS_PER_TOKEN = 3.0
+
+# Файлы-манифесты, из которых берется контекст проекта
+MANIFEST_FILES = [
+    "package.json", "requirements.txt", "pyproject.toml", "setup.py", "setup.cfg",
+    "Cargo.toml", "go.mod", "pom.xml", "build.gradle", "CMakeLists.txt", "composer.json", "Gemfile",
+]
+# Сколько байт манифеста или точки входа читать с диска
+MAX_FILE_BYTES = 16 * 1024
+# Сколько строк точки входа попадает в контекст
+ENTRY_POINT_LINES = 60
+# Максимальная доля бюджета, которую может занять один фрагмент
+MAX_PIECE_SHARE = 0.4
+
+# Важность разделов README по ключевым словам в заголовке
+SECTION_PRIORITIES = [
+    (re.compile(r"описани|о проекте|обзор|about|overview|introduction", re.I), 90),
+    (re.compile(r"требовани|предварительн|requirement|prerequisite", re.I), 85),
+    (re.compile(r"установк|install|setup", re.I), 80),
+    (re.compile(r"запуск|использовани|usage|getting started|quick ?start|run", re.I), 75),
+    (re.compile(r"особенност|возможност|feature", re.I), 70),
+    (re.compile(r"конфигурац|настройк|config", re.I), 65),
+    (re.compile(r"зависимост|технолог|depend|stack", re.I), 60),
+    (re.compile(r"разработк|develop|test", re.I), 40),
+    (re.compile(r"скриншот|screenshot", re.I), 20),
+    (re.compile(r"лиценз|license|contribut|changelog|история изменений|благодарност|credits|authors", re.I), 10),
+]
+DEFAULT_SECTION_PRIORITY = 50
+HEADING_RE = re.compile(r"^(#{1,6})\s+(.*)$")
+
+
+def estimate_tokens(text):
+    """Оценивает количество токенов в тексте"""
+    if not text:
+        return 0
+    return int(len(text) / CHARS_PER_TOKEN) + 1
+
+
+def split_markdown_sections(text):
+    """Делит markdown на разделы по заголовкам: [(заголовок, текст раздела)].
+    Текст до первого заголовка считается вступлением с пустым заголовком."""
+    sections = []
+    title = ""
+    lines = []
+    in_code = False
+    for line in text.splitlines():
+        if line.lstrip().startswith("```"):
+            in_code = not in_code
+        match = None if in_code else HEADING_RE.match(line)
+        if match:
+            if title or "".join(lines).strip():
+                sections.append((title, "\n".join(lines).strip()))
+            title = match.group(2).strip()
+            lines = [line]
+        else:
+            lines.append(line)
+    if title or "".join(lines).strip():
+        sections.append((title, "\n".join(lines).strip()))
+    return sections
+
+
+def section_priority(title, index):
+    """Важность раздела README: по ключевым словам заголовка, вступление важнее всего"""
+    if index == 0 and not title:
+        return 95
+    for pattern, priority in SECTION_PRIORITIES:
+        if pattern.search(title):
+            return priority
+    return DEFAULT_SECTION_PRIORITY
+
+
+def truncate_to_tokens(text, max_tokens):
+    """Обрезает текст до max_tokens по границе абзаца или строки"""
+    max_chars = int(max_tokens * CHARS_PER_TOKEN)
+    if len(text) <= max_chars:
+        return text
+    cut = text[:max_chars]
+    boundary = max(cut.rfind("\n\n"), cut.rfind("\n"))
+    if boundary > max_chars // 2:
+        cut = cut[:boundary]
+    return cut.rstrip() + "\n[...]"
+
+
+def _read_head(path, max_bytes=MAX_FILE_BYTES):
+    try:
+        with open(path, "r", encoding="utf-8", errors="replace") as f:
+            return f.read(max_bytes)
+    except OSError:
+        return None
+
+
+class PromptContextBuilder:
+    """Собирает контекст проекта для запроса к ИИ в пределах бюджета токенов.
+    Фрагменты добавляются в группы с приоритетом; при сборке бюджет заполняется жадно
+    от самых важных к менее важным, а внутри группы сохраняется исходный порядок."""
+
+    def __init__(self, token_budget):
+        self.token_budget = max(0, token_budget)
+        self.pieces = []  # (приоритет, порядок, группа, текст, минимальный размер при обрезке)
+        self.truncated = 0
+        self.dropped = 0
+        self.used_tokens = 0
+
+    def add(self, group, text, priority, min_tokens=80):
+        if not text or not text.strip():
+            return
+        text = text.strip()
+        # Один большой раздел не должен вытеснить все остальные
+        max_tokens = int(self.token_budget * MAX_PIECE_SHARE)
+        if estimate_tokens(text) > max_tokens:
+            text = truncate_to_tokens(text, max_tokens)
+            self.truncated += 1
+        self.pieces.append((priority, len(self.pieces), group, text, min_tokens))
+
+    def build(self):
+        """Возвращает словарь {группа: текст} с отобранными фрагментами"""
+        remaining = self.token_budget
+        chosen = []
+        for priority, order, group, text, min_tokens in sorted(self.pieces, key=lambda piece: (-piece[0], piece[1])):
+            tokens = estimate_tokens(text) + 1
+            if tokens <= remaining:
+                chosen.append((order, group, text))
+                remaining -= tokens
+            elif remaining >= min_tokens:
+                # Фрагмент не помещается целиком: берем его начало
+                chosen.append((order, group, truncate_to_tokens(text, remaining - 1)))
+                remaining = 0
+                self.truncated += 1
+            else:
+                self.dropped += 1
+        chosen.sort()
+        self.used_tokens = self.token_budget - remaining
+        groups = {}
+        for _, group, text in chosen:
+            groups.setdefault(group, []).append(text)
+        return {group: "\n\n".join(texts) for group, texts in groups.items()}
+
+
+def add_readme_sections(builder, readme_text):
+    """Добавляет разделы существующего README с приоритетом по важности"""
+    for index, (title, text) in enumerate(split_markdown_sections(readme_text)):
+        builder.add("readme", text, section_priority(title, index))
+
+
+def add_project_files(builder, project_path, project_info):
+    """Добавляет манифесты и начало точки входа"""
+    for name in MANIFEST_FILES:
+        content = _read_head(os.path.join(project_path, name))
+        if content:
+            builder.add("files", f"Файл {name}:\n'''\n{content.strip()}\n'''", 55)
+    entry_point = project_info.get("entry_point")
+    if entry_point:
+        content = _read_head(os.path.join(project_path, entry_point))
+        if content:
+            head = "\n".join(content.splitlines()[:ENTRY_POINT_LINES])
+            builder.add("files", f"Начало точки входа {entry_point}:\n'''\n{head.strip()}\n'''", 45)
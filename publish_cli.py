@@ -0,0 +1,99 @@
+"""Публикация проекта на GitHub из командной строки, без графического интерфейса и Qt.
+
+Пример:
+    python publish_cli.py path/to/project --repo my-project --release auto --no-llm
+"""
+import sys
+import os
+import argparse
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from publisher_core import PublishPipeline
+from release_core import ReleasePublisher, ReleaseInfoGenerator
+from ollama_client import GenerationCancelled
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(prog="publish", description="Публикация проекта на GitHub без графического интерфейса")
+    parser.add_argument("project_path", help="папка проекта")
+    parser.add_argument("--repo", help="имя репозитория на GitHub (по умолчанию - имя папки)")
+    parser.add_argument("--no-llm", action="store_true", help="не использовать ИИ для генерации README.md")
+    parser.add_argument("--no-stream", action="store_true", help="не использовать потоковую генерацию Ollama")
+    parser.add_argument("--show-generation", action="store_true", help="выводить текст, генерируемый ИИ, в stdout")
+    parser.add_argument("--force-regenerate", action="store_true", help="не использовать кэш ответов ИИ")
+    parser.add_argument("--incremental", action="store_true", help="сохранить историю .git и отправить только изменения")
+    parser.add_argument("--release", choices=["none", "auto", "manual"], default="none",
+                        help="создать релиз после публикации: auto - с помощью ИИ, manual - по --tag/--title/--notes-file")
+    parser.add_argument("--tag", help="тег релиза для --release manual")
+    parser.add_argument("--title", default="", help="заголовок релиза для --release manual")
+    parser.add_argument("--notes-file", help="файл с примечаниями к релизу для --release manual")
+    parser.add_argument("--screenshot", help="скриншот программы для README.md и релиза")
+    parser.add_argument("--asset", action="append", default=[], metavar="FILE",
+                        help="дополнительный файл релиза (можно указать несколько раз)")
+    parser.add_argument("--large-files", choices=["lfs", "exclude", "keep", "abort"],
+                        help="что делать с крупными файлами: отправить через Git LFS, исключить, оставить в Git "
+                             "или отменить публикацию (по умолчанию публикация останавливается, только если GitHub "
+                             "не примет файл)")
+    parser.add_argument("--large-file-mb", type=float,
+                        help="порог крупного файла в мегабайтах (по умолчанию GITHUB_PUBLISHER_LARGE_FILE_MB или 50)")
+    parser.add_argument("--quiet", action="store_true", help="выводить только ошибки")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    project_path = os.path.abspath(args.project_path)
+    repo_name = args.repo or os.path.basename(project_path)
+    if not os.path.isdir(project_path):
+        print(f"Ошибка: папка проекта не найдена: {project_path}", file=sys.stderr)
+        return 2
+    if args.release == "manual" and not args.tag:
+        print("Ошибка: для --release manual нужно указать --tag", file=sys.stderr)
+        return 2
+
+    def log(message):
+        if not args.quiet:
+            print(message, file=sys.stderr, flush=True)
+
+    def on_tokens(text):
+        if args.show_generation:
+            sys.stdout.write(text)
+            sys.stdout.flush()
+
+    stream_llm = not args.no_stream
+    try:
+        threshold = int(args.large_file_mb * 1024 * 1024) if args.large_file_mb else None
+        PublishPipeline(project_path, repo_name, not args.no_llm, stream_llm, args.force_regenerate, args.incremental,
+                        log=log, on_tokens=on_tokens, large_files=args.large_files,
+                        large_file_threshold=threshold).publish()
+
+        metrics = None
+        if args.release == "auto":
+            generator = ReleaseInfoGenerator(project_path, repo_name, stream_llm=stream_llm,
+                                             force_regenerate=args.force_regenerate,
+                                             log=log, on_tokens=on_tokens, use_llm=not args.no_llm)
+            metrics = generator.metrics
+            release_data = generator.generate()
+        elif args.release == "manual":
+            notes = ""
+            if args.notes_file:
+                with open(args.notes_file, "r", encoding="utf-8") as f:
+                    notes = f.read()
+            release_data = {"tag": args.tag, "title": args.title, "notes": notes}
+        else:
+            release_data = None
+
+        if release_data:
+            ReleasePublisher(project_path, repo_name, release_data, args.screenshot, log=log,
+                             asset_paths=args.asset, metrics=metrics).publish()
+    except GenerationCancelled:
+        print("Генерация прервана.", file=sys.stderr)
+        return 130
+    except Exception as e:
+        print(f"Ошибка: {e}", file=sys.stderr)
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,821 @@
+import os
+import shutil
+import stat
+import subprocess
+from contextlib import nullcontext
+
+from project_scanner import analyze_project
+from github_client import GitHubClient
+from run_metrics import RunMetrics, command_stage, format_stage_summary
+from release_assets import format_size
+from bulk_commit import BULK_COMMIT, BulkCommit
+from stage_scheduler import StageScheduler
+from large_files import (
+    GITHUB_FILE_LIMIT, LFS_URL, estimate_push, format_push_estimate, gitattributes_lfs_line, gitignore_line,
+    append_missing_lines
+)
+from ollama_client import (
+    OllamaClient, GenerationCancelled, DEFAULT_MODEL, format_generation_stats, format_service_stats
+)
+from model_routing import DeadlineExceeded, route, call_with_deadline
+from llm_cache import LLMCache, cached_generation
+from readme_sections import (
+    INCREMENTAL_README, PREAMBLE, SCREENSHOTS, find_section, inputs_hash, join_sections, load_state, plan_update,
+    save_state, section_hashes, set_section, split_sections
+)
+from prompt_builder import (
+    PromptContextBuilder, PROMPT_TOKEN_BUDGET, PROMPT_WRAPPER_TOKENS, estimate_tokens,
+    add_readme_sections, add_project_files
+)
+
+
+class PublishPipeline:
+    """Конвейер публикации проекта на GitHub без зависимости от Qt: анализ проекта,
+    генерация README.md, Git-операции и создание/обновление репозитория.
+    Сообщения передаются через log(message), токены потоковой генерации - через on_tokens(text).
+    Крупные файлы обрабатываются по large_files ("lfs", "exclude", "keep", "abort"); если он не задан,
+    решение запрашивается через on_large_files(оценка публикации), а без него публикация
+    останавливается только при файлах, которые GitHub не примет."""
+
+    def __init__(self, project_path, repo_name, use_llm, stream_llm=True, force_regenerate=False, incremental=False,
+                 resources=None, log=None, on_tokens=None, metrics=None, large_files=None, on_large_files=None,
+                 large_file_threshold=None, speculative=False):
+        self.log = log or (lambda message: None)
+        self.on_tokens = on_tokens or (lambda text: None)
+        self.large_files = large_files
+        self.on_large_files = on_large_files
+        self.large_file_threshold = large_file_threshold
+        self.resources = resources  # ResourceLimiter при пакетной публикации
+        self.project_path = project_path
+        self.repo_name = repo_name
+        self.use_llm = use_llm
+        self.incremental = incremental
+        self.stream_llm = stream_llm
+        self.force_regenerate = force_regenerate
+        self.speculative = speculative  # предварительная генерация (см. precompute_readme)
+        self._gemini_client = None  # создается при первом обращении к ИИ без потоковой генерации
+        self._llm_route = None  # модель и срок ответа для README.md, выбираются при первой генерации
+        self._readme_sections = None  # (способ генерации, {раздел: хэш данных}) для записи после README.md
+        self._bulk_commit = None
+        self._stages_failed = False
+        self.ollama_client = OllamaClient(model_name=DEFAULT_MODEL)
+        self.llm_cache = LLMCache()
+        self.github = GitHubClient(log=self.log)
+        self.metrics = metrics or RunMetrics("publish", project_path, repo_name)
+
+    @property
+    def gemini_client(self):
+        if self._gemini_client is None:
+            from gemini_api_client import GeminiAPIClient
+            self._gemini_client = GeminiAPIClient(model_name=self.llm_route["model"])
+        return self._gemini_client
+
+    @property
+    def llm_route(self):
+        if self._llm_route is None:
+            self._llm_route = route("readme", service=self.ollama_client.service, log=self.log)
+            deadline = self._llm_route["deadline"]
+            self.log(f"Модель для README.md: {self._llm_route['model']}"
+                     + (f", срок ответа {deadline:g} с." if deadline else "."))
+        return self._llm_route
+
+    def cancel_generation(self):
+        """Прерывает потоковую генерацию README, не дожидаясь окончания запроса"""
+        self.ollama_client.cancel()
+
+    def _check_cancelled(self):
+        if self._stages_failed or self.ollama_client.is_cancelled():
+            raise GenerationCancelled()
+
+    def _remove_readonly(self, func, path, exc_info):
+        import stat
+        # exc_info contains (type, value, traceback)
+        if issubclass(exc_info[0], PermissionError):
+            try:
+                self.log(f"Попытка изменить разрешения файла: {path}")
+                os.chmod(path, stat.S_IWRITE)
+                func(path)
+            except Exception as e:
+                self.log(f"Не удалось изменить разрешения и удалить файл {path}: {e}")
+                raise e
+        else:
+            raise exc_info[1]
+
+    def _resource(self, name):
+        """Слот ограничителя параллельности для класса ресурсов (только при пакетной публикации)"""
+        return self.resources.slot(name) if self.resources else nullcontext()
+
+    @staticmethod
+    def _command_resource(command):
+        if command.startswith(("git push", "git fetch")):
+            return "push"
+        return "scan"
+
+    def _run_command(self, command, cwd=None):
+        if cwd is None:
+            cwd = self.project_path
+        self.log(f"Выполнение команды: {command} в {cwd}")
+        stage = command_stage(command)
+        with self._resource(self._command_resource(command)), self.metrics.stage(stage):
+            process = subprocess.run(command, cwd=cwd, shell=True, capture_output=True, text=True, encoding='utf-8')
+        self.metrics.add(stage, subprocesses=1)
+        if process.stdout:
+            self.log(f"Stdout: {process.stdout.strip()}")
+        if process.stderr:
+            self.log(f"Stderr: {process.stderr.strip()}")
+        if process.returncode != 0:
+            raise Exception(f"Команда завершилась с ошибкой (код {process.returncode}): {command}")
+        return process.stdout
+
+    def publish(self):
+        """Выполняет публикацию в текущем потоке; при ошибке выбрасывает исключение.
+        Метрики запуска сохраняются в обоих случаях."""
+        try:
+            self._publish()
+        except Exception as e:
+            self.metrics.finish("error", e)
+            raise
+        self.log(format_stage_summary(self.metrics.finish()))
+
+    def _publish(self):
+        self.log(f"Рабочий поток запущен для публикации проекта '{self.project_path}' в репозиторий '{self.repo_name}'.")
+
+        # Этапы публикации образуют граф зависимостей: проверка репозитория на GitHub, подготовка
+        # Git и передача файлов в Git выполняются одновременно с генерацией README.md через ИИ;
+        # коммит ждет README.md, а отправка - коммит и ответ GitHub
+        self._bulk_commit = None
+        self._stages_failed = False
+        scheduler = StageScheduler(log=self.log)
+        scheduler.on_failure(self._stop_stages)
+        scheduler.add("scan", lambda results: self.analyze_project())
+        scheduler.add("github_lookup", lambda results: self._find_remote_repo())
+        scheduler.add("readme", lambda results: self._write_readme(results["scan"]), after=["scan"])
+        # Крупные файлы проверяются до любых изменений .git и до отправки данных
+        scheduler.add("large_files", lambda results: self._check_large_files(), after=["scan"])
+        if self.incremental:
+            scheduler.add("git_prepare", lambda results: self._prepare_incremental(results["github_lookup"],
+                                                                                   results["large_files"]),
+                          after=["github_lookup", "large_files"])
+            scheduler.add("git_commit", lambda results: self._commit_incremental(), after=["git_prepare", "readme"])
+            scheduler.add("push", lambda results: self._push_incremental(results["github_lookup"],
+                                                                         results["git_commit"]),
+                          after=["git_commit"])
+        else:
+            scheduler.add("git_prepare", lambda results: self._prepare_new_repo(results["large_files"]),
+                          after=["large_files"])
+            scheduler.add("git_commit", lambda results: self._commit_new_repo(), after=["git_prepare", "readme"])
+            scheduler.add("push", lambda results: self._push_new_repo(results["github_lookup"]),
+                          after=["git_commit", "github_lookup"])
+        try:
+            scheduler.run()
+        finally:
+            if self._bulk_commit is not None:
+                self._bulk_commit.close()
+        self.log("Операция завершена.")
+
+    def _stop_stages(self):
+        # Генерация README.md не нужна, если другой этап публикации завершился ошибкой
+        self._stages_failed = True
+        self.cancel_generation()
+
+    def _write_readme(self, project_info):
+        self.log("Генерация README.md...")
+        readme_content = self.generate_readme_content(project_info)
+        readme_path = os.path.join(self.project_path, "README.md")
+        if readme_content == project_info.get("existing_readme"):
+            self.log("README.md не изменился.")
+        else:
+            with open(readme_path, "w", encoding="utf-8") as f:
+                f.write(readme_content)
+            self.log(f"Файл README.md сгенерирован и сохранен: {readme_path}")
+        if self._readme_sections is not None:
+            try:
+                save_state(self.project_path, *self._readme_sections)
+            except OSError as e:
+                self.log(f"Не удалось сохранить состояние разделов README.md: {e}")
+
+    def _prepare_new_repo(self, large_file_plan):
+        """Создает .git заново и передает в Git все файлы, кроме README.md, который еще может генерироваться"""
+        # Проверка и удаление существующего .git репозитория
+        git_folder_path = os.path.join(self.project_path, ".git")
+        if os.path.exists(git_folder_path):
+            self.log(f"Обнаружен существующий Git репозиторий в {git_folder_path}. Попытка удалить его для чистой инициализации.")
+            try:
+                shutil.rmtree(git_folder_path, onerror=self._remove_readonly)
+                self.log("Существующий Git репозиторий удален.")
+            except Exception as e:
+                self.log(f"Ошибка при удалении существующего Git репозитория: {e}. Возможно, некоторые файлы заблокированы.")
+                raise # Re-raise the exception to stop the process if deletion fails
+
+        # Инициализация нового Git репозитория
+        self.log("Инициализация нового Git репозитория...")
+        self._run_command("git init")
+        self._apply_large_file_plan(large_file_plan)
+
+        self.log("Добавление файлов...")
+        if BULK_COMMIT:
+            # Первый коммит создается через git fast-import без построения индекса
+            bulk = BulkCommit(self.project_path, log=self.log)
+            try:
+                with self._resource("scan"), self.metrics.stage("git_fast_import"):
+                    staged = bulk.stage_files(deferred=["README.md"])
+            finally:
+                self.metrics.add("git_fast_import", subprocesses=bulk.subprocesses)
+            if staged:
+                self._bulk_commit = bulk
+                return
+        # README.md добавляется повторно при коммите: git add перечитает только изменившиеся файлы
+        self._run_command("git add .")
+
+    def _commit_new_repo(self):
+        self.log("Создание первого коммита...")
+        bulk = self._bulk_commit
+        if bulk is not None:
+            subprocesses = bulk.subprocesses
+            try:
+                with self._resource("scan"), self.metrics.stage("git_fast_import"):
+                    bulk.commit("Initial commit")
+            finally:
+                self.metrics.add("git_fast_import", subprocesses=bulk.subprocesses - subprocesses, files=bulk.files,
+                                 bytes_written=bulk.bytes)
+            return
+        self._run_command("git add .")
+        self._run_command('git commit -m "Initial commit"')
+
+    def _push_new_repo(self, repo):
+        # Один запрос к API ответил и на вопрос о существовании, и вернул URL
+        if repo:
+            self.log(f"Репозиторий '{self.repo_name}' уже существует. Настраиваю remote...")
+            repo_url = repo["clone_url"]
+
+            # Удаляем старый origin, если он есть, и добавляем новый
+            try:
+                self._run_command("git remote remove origin")
+            except Exception:
+                # Игнорируем ошибку, если remote origin не существует
+                pass
+            self._run_command(f"git remote add origin {repo_url}")
+            
+            # Пушим изменения в существующий репозиторий
+            # Используем -f (force), так как мы всегда начинаем с чистого листа локально.
+            # Это перезапишет историю на удаленном репозитории.
+            self.log("Отправка коммитов в существующий репозиторий (с перезаписью)...")
+            self._run_command("git push --force --set-upstream origin master")
+            self.log("Проект успешно синхронизирован с существующим репозиторием на GitHub.")
+        else:
+            self._create_remote_repo()
+
+    def _find_remote_repo(self):
+        """Возвращает данные репозитория на GitHub (clone_url, default_branch, ...) или None, если репозитория нет"""
+        self.log(f"Проверка репозитория '{self.repo_name}' на GitHub...")
+        with self._resource("github"), self.metrics.stage("github_lookup"):
+            return self.github.get_repo(self.repo_name)
+
+    def _create_remote_repo(self):
+        """Создает приватный репозиторий на GitHub и отправляет в него текущую ветку"""
+        self.log(f"Репозиторий '{self.repo_name}' не найден. Создаю новый...")
+        with self._resource("github"), self.metrics.stage("github_create"):
+            repo = self.github.create_repo(self.repo_name, private=True)
+        self.log(f"Репозиторий создан: {repo['html_url']}")
+        try:
+            self._run_command("git remote remove origin")
+        except Exception:
+            pass
+        self._run_command(f"git remote add origin {repo['clone_url']}")
+        self._run_command("git push --set-upstream origin HEAD")
+        self.log(f"Приватный репозиторий '{self.repo_name}' успешно создан на GitHub и проект загружен.")
+
+    # Инкрементальная публикация: сохраняет историю .git, коммитит только изменения
+    # и отправляет их обычным push без перезаписи истории
+
+    def _prepare_incremental(self, repo, large_file_plan):
+        repo_url = repo["clone_url"] if repo else None
+        git_folder_path = os.path.join(self.project_path, ".git")
+
+        if not os.path.exists(git_folder_path):
+            self.log("Локальный Git репозиторий не найден. Инициализация нового Git репозитория...")
+            self._run_command("git init")
+            if repo_url:
+                # Новый коммит должен лечь поверх истории существующего репозитория,
+                # иначе обычный push будет отклонен
+                self.log(f"Загрузка истории существующего репозитория '{self.repo_name}'...")
+                self._run_command(f"git remote add origin {repo_url}")
+                self._run_command("git fetch origin")
+                # API сообщает ветку по умолчанию и для пустого репозитория, поэтому наличие ветки проверяется
+                default_branch = repo.get("default_branch")
+                if default_branch and self._run_command(f"git branch -r --list origin/{default_branch}").strip():
+                    self._run_command(f"git reset --mixed origin/{default_branch}")
+                    self._run_command(f"git branch -M {default_branch}")
+
+        self._apply_large_file_plan(large_file_plan, tracked=True)
+        # Изменения индексируются, пока генерируется README.md; при коммите git add перечитает только его
+        self.log("Добавление измененных файлов...")
+        self._run_command("git add -A")
+
+    def _commit_incremental(self):
+        """Коммитит изменения и возвращает имя текущей ветки"""
+        self._run_command("git add -A")
+        if self._run_command("git status --porcelain").strip():
+            try:
+                self._run_command("git rev-parse --verify HEAD")
+                commit_message = "Обновление проекта"
+            except Exception:
+                # В репозитории еще нет коммитов
+                commit_message = "Initial commit"
+            self._run_command(f'git commit -m "{commit_message}"')
+        else:
+            self.log("Изменений для коммита нет.")
+        return self._run_command("git rev-parse --abbrev-ref HEAD").strip()
+
+    def _push_incremental(self, repo, branch):
+        if repo:
+            repo_url = repo["clone_url"]
+            self.log(f"Репозиторий '{self.repo_name}' уже существует. Настраиваю remote...")
+            try:
+                current_url = self._run_command("git remote get-url origin").strip()
+            except Exception:
+                current_url = None
+            if current_url is None:
+                self._run_command(f"git remote add origin {repo_url}")
+            elif current_url != repo_url:
+                self._run_command(f"git remote set-url origin {repo_url}")
+
+            # Обычный push передает только новые объекты; если история на GitHub
+            # разошлась с локальной, push будет отклонен, а не перезапишет ее
+            self.log("Отправка новых коммитов в существующий репозиторий...")
+            self._run_command(f"git push --set-upstream origin {branch}")
+            self.log("Изменения проекта отправлены в существующий репозиторий на GitHub.")
+        else:
+            self._create_remote_repo()
+
+    def _check_large_files(self):
+        """Оценивает объем публикации и решает, что делать с крупными файлами.
+        Возвращает план {"lfs": [пути], "exclude": [пути]}; при отказе от публикации выбрасывает исключение"""
+        plan = {"lfs": [], "exclude": []}
+        with self._resource("scan"), self.metrics.stage("large_files"):
+            estimate = estimate_push(self.project_path, self.large_file_threshold)
+        large_files = estimate["large_files"]
+        self.metrics.add("large_files", estimated_bytes=estimate["bytes"], large_files=len(large_files))
+        self.log(format_push_estimate(estimate))
+        if estimate["unscanned_dirs"]:
+            self.log(f"В коммит попадут каталоги, не исключенные .gitignore: {', '.join(estimate['unscanned_dirs'][:5])}"
+                     f"{' и другие' if len(estimate['unscanned_dirs']) > 5 else ''}")
+        if not large_files:
+            return plan
+
+        self.log(f"Найдены крупные файлы (от {format_size(estimate['threshold'])}):")
+        for path, size in large_files:
+            self.log(f"  {path} ({format_size(size)})")
+        too_large = [path for path, size in large_files if size > GITHUB_FILE_LIMIT]
+
+        policy = self.large_files
+        if policy is None and self.on_large_files is not None:
+            policy = self.on_large_files(estimate)
+        if policy is None:
+            policy = "abort" if too_large else "keep"
+
+        if policy == "abort":
+            raise Exception("Публикация остановлена из-за крупных файлов. Отправьте их через Git LFS "
+                            "или исключите из публикации.")
+        if policy == "keep":
+            if too_large:
+                raise Exception(f"GitHub не примет файлы больше {format_size(GITHUB_FILE_LIMIT)}: {', '.join(too_large)}. "
+                                "Отправьте их через Git LFS или исключите из публикации.")
+            self.log("Крупные файлы остаются в Git.")
+            return plan
+
+        paths = [path for path, _ in large_files]
+        if policy == "lfs":
+            try:
+                self._run_command("git lfs version")
+            except Exception:
+                raise Exception("Git LFS не установлен (https://git-lfs.com). Установите его или исключите "
+                                "крупные файлы из публикации.")
+            plan["lfs"] = paths
+        elif policy == "exclude":
+            plan["exclude"] = paths
+        else:
+            raise ValueError(f"Неизвестный режим обработки крупных файлов: {policy}")
+        self.metrics.add("large_files", lfs_files=len(plan["lfs"]), excluded_files=len(plan["exclude"]))
+        self.log(format_push_estimate(estimate, plan["lfs"], plan["exclude"]))
+        return plan
+
+    def _apply_large_file_plan(self, plan, tracked=False):
+        """Настраивает Git LFS и исключения в только что созданном или существующем .git до 'git add'"""
+        git_folder_path = os.path.join(self.project_path, ".git")
+        if plan["exclude"]:
+            # .git/info/exclude не попадает в коммит, в отличие от .gitignore проекта
+            exclude_path = os.path.join(git_folder_path, "info", "exclude")
+            os.makedirs(os.path.dirname(exclude_path), exist_ok=True)
+            append_missing_lines(exclude_path, [gitignore_line(path) for path in plan["exclude"]])
+            self.log(f"Исключено из публикации файлов: {len(plan['exclude'])} (.git/info/exclude)")
+        if plan["lfs"]:
+            self._run_command("git lfs install --local")
+            if LFS_URL:
+                self._run_command(f"git config lfs.url {LFS_URL}")
+            added = append_missing_lines(os.path.join(self.project_path, ".gitattributes"),
+                                         [gitattributes_lfs_line(path) for path in plan["lfs"]])
+            self.log(f"Файлы отправляются через Git LFS: {len(plan['lfs'])} (добавлено правил в .gitattributes: {added})")
+        if tracked and (plan["exclude"] or plan["lfs"]):
+            # Уже закоммиченные файлы убираются из индекса: исключенные перестают отслеживаться,
+            # а файлы для LFS при 'git add' добавляются заново уже как указатели LFS
+            self._untrack(plan["exclude"] + plan["lfs"])
+
+    def _untrack(self, paths):
+        # Пути передаются файлом, а не через командную строку оболочки
+        pathspec_path = os.path.join(self.project_path, ".git", "large_files_pathspec")
+        with open(pathspec_path, "w", encoding="utf-8", newline="") as f:
+            f.write("".join(f":(literal){path}\0" for path in paths))
+        try:
+            self._run_command("git rm --cached -q --ignore-unmatch --pathspec-file-nul "
+                              "--pathspec-from-file=.git/large_files_pathspec")
+        finally:
+            os.remove(pathspec_path)
+
+    def analyze_project(self):
+        with self._resource("scan"), self.metrics.stage("scan"):
+            return analyze_project(self.project_path, self.repo_name, log=self.log)
+
+    def precompute_readme(self):
+        """Сканирует проект и заранее генерирует описание README.md в кэш ИИ, ничего не меняя в папке проекта.
+        Публикация с теми же данными проекта возьмет готовый ответ или дождется этой генерации."""
+        project_info = self.analyze_project()
+        if self.use_llm:
+            plan = self._plan_readme_update(project_info)
+            if plan is not None:
+                self._update_readme_sections(project_info, *plan)
+                return project_info
+            prompt = self._construct_llm_prompt(project_info)
+            with self.metrics.stage("llm"):
+                self._generate_llm_description(prompt, project_info)
+        return project_info
+
+    def generate_readme_content(self, project_info):
+        llm_description = None
+        if self.use_llm:
+            self.log("Генерация README.md с помощью LLM...")
+            plan = self._plan_readme_update(project_info)
+            if plan is not None:
+                return self._update_readme_sections(project_info, *plan)
+            prompt = self._construct_llm_prompt(project_info)
+            try:
+                with self.metrics.stage("llm"):
+                    llm_description = self._generate_llm_description(prompt, project_info)
+            except DeadlineExceeded as e:
+                self.log(f"Генерация README.md прервана: {e}.")
+                self.metrics.add("llm", deadline_missed=1)
+                self.log("Используется описание по умолчанию.")
+            except GenerationCancelled:
+                if self._stages_failed:
+                    self.log("Генерация README.md остановлена из-за ошибки на другом этапе публикации.")
+                else:
+                    self.log("Генерация README.md отменена пользователем.")
+                self.log("Используется описание по умолчанию.")
+            except Exception as e:
+                self.log(f"Ошибка при генерации описания с помощью LLM: {e}")
+                self.log("Используется описание по умолчанию.")
+        else:
+            self.log("Генерация README.md без использования LLM.")
+
+        # Создаем структурированный README.md
+        if llm_description:
+            # Используем сгенерированное описание от LLM, предполагая, что оно содержит все необходимое.
+            content = f"{llm_description}\n\n"
+        else:
+            # Создаем базовую структуру вручную
+            content = f"# {project_info['name']}\n\n"
+            content += f"{project_info['description']}\n\n"             
+            # Краткое описание
+            content += "## 📌 Краткое описание\n\n"
+            content += f"{project_info['description']}\n\n"
+            
+            # Особенности
+            content += "## 🚀 Особенности\n\n"
+            # Добавляем информацию о поддерживаемых ОС
+            if project_info['os_specific']:
+                if project_info['os_specific'] == ["Windows"]:
+                    content += "- Работает на Windows\n"
+                else:
+                    os_list = ", ".join(project_info['os_specific'])
+                    content += f"- Работает на {os_list}\n"
+            content += "- Современный пользовательский интерфейс\n"
+            content += "- Интуитивно понятное управление\n\n"
+            
+            # Технологии
+            if project_info['technologies']:
+                content += "## 🛠️ Используемые технологии\n\n"
+                for tech in project_info['technologies']:
+                    content += f"- {tech}\n"
+                content += "\n"
+            
+            # Зависимости
+            if project_info['dependencies']:
+                content += "## 📦 Зависимости\n\n"
+                for dep in project_info['dependencies'][:10]:  # Ограничим до 10 зависимостей
+                    content += f"- {dep}\n"
+                if len(project_info['dependencies']) > 10:
+                    content += "- ...\n"
+                content += "\n"
+
+            # Предварительная настройка
+            content += "## ⚙️ Предварительная настройка\n\n"
+            content += "Перед первым использованием убедитесь, что у вас установлен [GitHub CLI](https://cli.github.com/) и вы авторизованы.\n\n"
+            content += "Для корректной работы функции создания релизов может потребоваться расширить права доступа. Выполните в терминале команду:\n"
+            content += "```bash\n"
+            content += "gh auth refresh -h github.com -s workflow\n"
+            content += "```\n\n"
+            
+            # Установка
+            content += "## 💾 Установка\n\n"
+            if "Python" in project_info['technologies']:
+                content += "```bash\n"
+                content += "pip install -r requirements.txt\n"
+                content += "```\n\n"
+            elif "Node.js" in project_info['technologies'] or "JavaScript" in project_info['technologies']:
+                content += "```bash\n"
+                content += "npm install\n"
+                content += "```\n\n"
+            elif "Java" in project_info['technologies']:
+                content += "```bash\n"
+                content += "mvn install\n"
+                content += "```\n\n"
+            else:
+                content += "Следуйте инструкциям в разделе 'Запуск'.\n\n"
+            
+            # Запуск
+            content += "## ▶️ Запуск\n\n"
+            if project_info["entry_point"]:
+                if "Python" in project_info['technologies']:
+                    content += f"```bash\npython {project_info['entry_point']}\n```\n\n"
+                elif "JavaScript" in project_info['technologies']:
+                    content += f"```bash\nnode {project_info['entry_point']}\n```\n\n"
+                elif "Java" in project_info['technologies']:
+                    # Для Java сложнее определить точную команду запуска
+                    content += "```bash\n"
+                    content += "javac *.java\njava Main\n"
+                    content += "```\n\n"
+                else:
+                    content += f"Запустите файл: {project_info['entry_point']}\n\n"
+            else:
+                if "Electron" in project_info['type']:
+                    content += "```bash\nnpm start\n```\n\n"
+                elif "Python" in project_info['technologies']:
+                    content += "```bash\npython main.py\n```\n\n"
+                elif "Node.js" in project_info['technologies']:
+                    content += "```bash\nnpm start\n```\n\n"
+                else:
+                    content += "Следуйте инструкциям в разделе 'Использование'.\n\n"
+            
+            # Лицензия
+            if project_info['license'] != "Не указано":
+                content += f"## 📄 Лицензия\n\n"
+                content += f"Этот проект лицензирован под {project_info['license']}.\n\n"
+        
+        # Убираем автоматическую надпись о генерации
+        content += "\n"
+
+        # Раздел со скриншотами добавляет релиз; новый README.md его сохраняет
+        screenshots = find_section(project_info.get("existing_readme"), SCREENSHOTS)
+        if screenshots is not None and find_section(content, SCREENSHOTS) is None:
+            content = set_section(content, SCREENSHOTS, screenshots.text)
+        self._readme_sections = ("llm" if llm_description else "template", section_hashes(content, project_info))
+        return content
+
+    def _plan_readme_update(self, project_info):
+        """(разделы README.md, устаревшие разделы, хэши прошлой генерации) или None - README.md создается целиком"""
+        if not INCREMENTAL_README or self.force_regenerate:
+            return None
+        state = load_state(self.project_path)
+        plan = plan_update(project_info.get("existing_readme"), state, project_info, "llm")
+        if plan is None:
+            return None
+        return plan + (state["sections"],)
+
+    def _update_readme_sections(self, project_info, sections, stale, recorded):
+        """Создает через ИИ заново только устаревшие разделы README.md, остальные берутся без изменений.
+        Раздел, который не удалось создать, остается прежним и обновится при следующей публикации."""
+        reused = len(recorded) - len(stale)
+        if not stale:
+            self.log(f"README.md: данные проекта не изменились, все разделы ({len(sections)}) используются "
+                     f"без изменений.")
+        else:
+            self.log(f"README.md: данные изменились для разделов: "
+                     f"{', '.join(section.heading or 'вступление' for section in stale)}. "
+                     f"Остальные разделы ({reused}) используются без изменений.")
+        updated = {}
+
+        def regenerate():
+            for section in stale:
+                try:
+                    updated[section.id] = self._generate_section(project_info, section)
+                except GenerationCancelled:
+                    raise
+                except Exception as e:
+                    self.log(f"Ошибка при генерации раздела '{section.heading or 'вступление'}' README.md "
+                             f"с помощью LLM: {e}")
+
+        if stale:
+            try:
+                with self.metrics.stage("llm"):
+                    # Предварительная генерация никого не задерживает, поэтому срок ответа к ней не применяется
+                    call_with_deadline(regenerate, None if self.speculative else self.llm_route["deadline"],
+                                       cancel=self.cancel_generation)
+            except DeadlineExceeded as e:
+                self.log(f"Генерация разделов README.md прервана: {e}.")
+                self.metrics.add("llm", deadline_missed=1)
+            except GenerationCancelled:
+                self.log("Генерация разделов README.md остановлена.")
+        # После истечения срока поток генерации может еще дописать раздел: берется то, что готово сейчас
+        updated = dict(updated)
+        failed = [section for section in stale if section.id not in updated]
+        if failed:
+            self.log(f"Разделы оставлены без изменений и обновятся при следующей публикации: "
+                     f"{', '.join(section.heading or 'вступление' for section in failed)}.")
+        for section in sections:
+            if section.id in updated:
+                section.text = updated[section.id]
+        self.metrics.add("llm", sections_reused=reused, sections_regenerated=len(updated))
+        failed_ids = {section.id for section in failed}
+        self._readme_sections = ("llm", {section_id: recorded[section_id] if section_id in failed_ids
+                                         else inputs_hash(section_id, project_info) for section_id in recorded})
+        return join_sections(sections)
+
+    def _generate_section(self, project_info, section):
+        """Текст раздела README.md, созданный ИИ заново; завершающие пустые строки остаются прежними"""
+        prompt = self._construct_section_prompt(project_info, section)
+        model = self.llm_route["model"]
+        generate, options = self._llm_generator(prompt, model)
+        response, from_cache = cached_generation(
+            self.llm_cache, model, prompt, generate,
+            options=dict(options or {}, section=section.id), log=self.log,
+            speculative=self.speculative, cancel=self.cancel_generation, check_cancelled=self._check_cancelled)
+        if from_cache:
+            self.metrics.add("llm", cache_hits=1)
+        if from_cache and self.stream_llm:
+            self.on_tokens(response)
+
+        # Модель может вернуть лишние разделы, изменить или опустить заголовок; заголовок остается прежним,
+        # чтобы раздел узнавался при следующей публикации
+        parts = split_sections(response.strip() + "\n")
+        if not parts:
+            text = ""
+        elif section.id == PREAMBLE:
+            text = parts[0].text if parts[0].id == PREAMBLE else parts[0].text.split("\n", 1)[1].lstrip("\n")
+        else:
+            headed = [part for part in parts if part.id != PREAMBLE]
+            body = headed[0].text.split("\n", 1)[1] if headed else "\n" + response.strip()
+            text = section.text.splitlines(keepends=True)[0] + body if body.strip() else ""
+        if not text.strip():
+            raise Exception(f"ИИ вернул пустой раздел '{section.heading or 'вступление'}'")
+        return text.rstrip("\n") + (section.text[len(section.text.rstrip("\n")):] or "\n")
+
+    def _generate_llm_description(self, prompt, project_info):
+        """Генерирует описание README через ИИ, повторно используя сохраненные ответы"""
+        model = self.llm_route["model"]
+        generate, options = self._llm_generator(prompt, model)
+        existing_readme = project_info.get("existing_readme")
+        # Ключ запроса без README.md: по нему ответ узнается, только если не менялись модель,
+        # зависимости, манифесты, точка входа и остальные данные проекта
+        inputs_key = self.llm_cache.make_key(
+            model, self._construct_llm_prompt(project_info, use_readme=False) if existing_readme else prompt, options)
+
+        # README.md, который не менялся после прошлой генерации, дает новый запрос, но не новые данные
+        if existing_readme and not self.force_regenerate:
+            entry = self.llm_cache.find_by_response(existing_readme, inputs_key)
+            if entry is not None:
+                self.log("Кэш ИИ: README.md не изменялся после прошлой генерации, используется сохраненный ответ.")
+                self.metrics.add("llm", cache_hits=1)
+                if self.stream_llm:
+                    self.on_tokens(entry["response"])
+                return entry["response"]
+
+        # Предварительная генерация никого не задерживает, поэтому срок ответа к ней не применяется
+        description, from_cache = call_with_deadline(lambda: cached_generation(
+            self.llm_cache, model, prompt, generate,
+            options=options, force=self.force_regenerate, log=self.log,
+            speculative=self.speculative, cancel=self.cancel_generation, check_cancelled=self._check_cancelled,
+            context=inputs_key),
+            None if self.speculative else self.llm_route["deadline"], cancel=self.cancel_generation)
+        if from_cache:
+            self.metrics.add("llm", cache_hits=1)
+        if from_cache and self.stream_llm:
+            self.on_tokens(description)
+        return description
+
+    def _llm_generator(self, prompt, model):
+        """Функция генерации ответа на запрос и параметры генерации для ключа кэша"""
+        if self.stream_llm:
+            def generate():
+                if self._stages_failed:
+                    raise GenerationCancelled()
+                with self._resource("llm"):
+                    text, stats = self.ollama_client.generate_stream(prompt, on_tokens=self.on_tokens,
+                                                                     model_name=model)
+                self.log(format_generation_stats(stats))
+                self.log(format_service_stats(self.ollama_client.service.stats()))
+                self.metrics.add_generation_stats("llm", stats)
+                return text
+            return generate, None
+
+        def generate():
+            with self._resource("llm"):
+                return self.gemini_client.generate_readme_description(prompt)
+        return generate, {"client": "GeminiAPIClient"}
+
+    def _construct_section_prompt(self, project_info, section):
+        """Запрос к ИИ на один раздел README.md, данные для которого изменились"""
+        prompt = f"Обнови раздел файла README.md проекта GitHub '{project_info['name']}'. "
+        prompt += f"Тип проекта: {project_info['type']}. "
+        if project_info['technologies']:
+            prompt += f"Используемые технологии: {', '.join(sorted(project_info['technologies']))}. "
+        if project_info['dependencies']:
+            prompt += f"Основные зависимости: {', '.join(project_info['dependencies'][:10])}. "
+        if project_info['entry_point']:
+            prompt += f"Точка входа: {project_info['entry_point']}. "
+        if project_info['os_specific'] == ["Windows"]:
+            prompt += "Целевая операционная система: Windows, НЕ упоминай macOS и Linux. "
+        if project_info['license'] != "Не указано":
+            prompt += f"Лицензия: {project_info['license']}. "
+
+        instructions = ("Данные проекта изменились после создания этого раздела: перепиши его так, чтобы он им "
+                        "соответствовал, сохранив стиль, эмодзи и тон текста. ")
+        if section.id == PREAMBLE:
+            instructions += "Это вступление перед первым разделом: верни только его текст, без заголовков ##."
+        else:
+            instructions += (f"Сохрани заголовок раздела ('## {section.heading}'). "
+                             "Верни только этот раздел, начиная с заголовка, без других разделов.")
+
+        # Манифесты и начало точки входа заполняют бюджет токенов, оставшийся после текста раздела
+        builder = PromptContextBuilder(PROMPT_TOKEN_BUDGET - estimate_tokens(prompt + instructions + section.text)
+                                       - PROMPT_WRAPPER_TOKENS)
+        add_project_files(builder, self.project_path, project_info)
+        context = builder.build()
+        if context.get("files"):
+            prompt += f"Дополнительные сведения из файлов проекта:\n\n{context['files']}\n\n"
+        prompt += f"Текущий текст раздела:\n\n'''\n{section.text.strip()}\n'''\n\n"
+        return prompt + instructions
+
+    def _construct_llm_prompt(self, project_info, use_readme=True):
+        """Запрос к ИИ на весь README.md; use_readme=False строит запрос так, будто README.md еще нет"""
+        if not use_readme:
+            project_info = dict(project_info, existing_readme=None)
+        prompt = f"Сгенерируй креативное и привлекательное описание для проекта GitHub с названием '{project_info['name']}'. "
+
+        if not project_info.get("existing_readme"):
+            prompt += f"Тип проекта: {project_info['type']}. "
+            if project_info['technologies']:
+                prompt += f"Используемые технологии: {', '.join(project_info['technologies'])}. "
+            if project_info['dependencies']:
+                prompt += f"Основные зависимости: {', '.join(project_info['dependencies'][:10])}. "
+
+        instructions = ""
+        # Информация о целевой ОС
+        if project_info['os_specific']:
+            # Если проект работает только на Windows, не упоминаем macOS и Linux
+            if project_info['os_specific'] == ["Windows"]:
+                instructions += f"Целевая операционная система: Windows. "
+            else:
+                os_info = ', '.join(project_info['os_specific'])
+                instructions += f"Целевые операционные системы: {os_info}. "
+            
+        instructions += ("Создай структурированное описание в формате README.md для GitHub репозитория. " \
+                  "Включи раздел '## ⚙️ Предварительная настройка' ПЕРЕД разделом 'Установка'. В этом разделе укажи, что пользователю нужно установить GitHub CLI и выполнить команду `gh auth refresh -h github.com -s workflow` для предоставления прав на создание релизов. " \
+                  "Включи следующие разделы (каждый раздел начинается с ##): " \
+                  "1. Краткое описание проекта (2-3 предложения с эмодзи) " \
+                  "2. Особенности (список 3-5 ключевых особенностей с эмодзи, НЕ указывай информацию о поддерживаемых операционных системах, НЕ используй слова 'кроссплатформенный', НЕ упоминай macOS и Linux) " \
+                  "3. Технологии (список используемых технологий) " \
+                  "4. Зависимости (список основных зависимостей, если есть) " \
+                  "5. Установка (общие инструкции по установке) " \
+                  "6. Запуск (общие инструкции по запуску) " \
+                  "7. Использование (примеры использования, если возможно определить) " \
+                  "8. Конфигурация (информация о настройке, если применимо) " \
+                  "9. Разработка (инструкции для разработчиков, если проект имеет тесты) " \
+                  "НЕ используй markdown для заголовков, просто начинай каждый раздел с ##. " \
+                  "НЕ дублируй название проекта в описании. " \
+                  "Используй эмодзи для украшения текста. " \
+                  "Сделай описание информативным и привлекательным. " \
+                  "Пиши от лица частного разработчика, избегай официального тона речи (например, фраз типа 'Представляем вам!'). " \
+                  "НЕ упоминай лицензию, если она не определена. " \
+                  "НЕ упоминай macOS и Linux, если проект работает только на Windows.")
+
+        # Существующий README.md, манифесты и начало точки входа заполняют оставшийся бюджет токенов
+        # по убыванию важности, чтобы большой README не раздувал запрос
+        builder = PromptContextBuilder(PROMPT_TOKEN_BUDGET - estimate_tokens(prompt + instructions) - PROMPT_WRAPPER_TOKENS)
+        if project_info.get("existing_readme"):
+            add_readme_sections(builder, project_info["existing_readme"])
+        add_project_files(builder, self.project_path, project_info)
+        context = builder.build()
+
+        if context.get("readme"):
+            prompt += ("Используй следующий текст из существующего файла README.md как ОСНОВУ для создания нового описания. " \
+                      "Твоя задача — взять эту информацию, структурировать ее, улучшить и оформить в красивый README.md для GitHub. " \
+                      "Особенно обрати внимание на любые упоминания требований, таких как серверы или специфические зависимости (например, Ollama). " \
+                      f"Вот содержимое существующего README.md:\n\n'''\n{context['readme']}\n'''\n\n")
+        if context.get("files"):
+            prompt += f"Дополнительные сведения из файлов проекта:\n\n{context['files']}\n\n"
+        prompt += instructions
+
+        if use_readme:
+            self.log(f"Оценка размера запроса к ИИ: ~{estimate_tokens(prompt)} токенов из {PROMPT_TOKEN_BUDGET} "
+                     f"(фрагментов обрезано: {builder.truncated}, отброшено: {builder.dropped}).")
+        return prompt
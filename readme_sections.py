@@ -0,0 +1,198 @@
+import os
+import re
+import json
+import hashlib
+
+from app_paths import user_cache_dir
+
+# Пересоздание README.md по разделам: ИИ переписывает только разделы, данные для которых изменились; 0 - всегда целиком
+INCREMENTAL_README = os.environ.get("GITHUB_PUBLISHER_README_SECTIONS", "1") != "0"
+# Если устарело больше этой доли разделов, один запрос на весь README.md дешевле, чем запрос на каждый раздел
+MAX_STALE_SHARE = 0.5
+
+PREAMBLE = "preamble"
+SCREENSHOTS = "screenshots"
+
+# Вид раздела по ключевым словам заголовка и поля project_info, от которых зависит его текст.
+# Порядок важен: "Предварительная настройка" - это setup, а не configuration
+SECTION_KINDS = [
+    (SCREENSHOTS, re.compile(r"скриншот|screenshot", re.I), None),
+    ("setup", re.compile(r"предварительн|требовани|prerequisite|requirement", re.I), ("os_specific",)),
+    ("install", re.compile(r"установк|install", re.I), ("technologies", "dependencies", "os_specific")),
+    ("run", re.compile(r"запуск|getting started|quick ?start|\brun", re.I),
+     ("entry_point", "technologies", "type", "os_specific")),
+    ("usage", re.compile(r"использовани|usage", re.I), ("entry_point", "type", "description")),
+    ("configuration", re.compile(r"конфигурац|настройк|config", re.I), ("entry_point", "dependencies")),
+    ("development", re.compile(r"разработк|develop|test", re.I), ("technologies", "dependencies", "has_tests")),
+    ("technologies", re.compile(r"технолог|stack|tech", re.I), ("technologies",)),
+    ("dependencies", re.compile(r"зависимост|depend", re.I), ("dependencies",)),
+    ("features", re.compile(r"особенност|возможност|feature", re.I),
+     ("type", "description", "technologies", "dependencies")),
+    ("license", re.compile(r"лиценз|license", re.I), ("license",)),
+    ("about", re.compile(r"описани|о проекте|обзор|about|overview", re.I), ("name", "type", "description", "technologies")),
+]
+PREAMBLE_INPUTS = ("name", "type", "description", "technologies")
+# Разделы, которые не удалось распознать по заголовку, зависят от общих сведений о проекте
+DEFAULT_INPUTS = ("name", "type", "description")
+# Порядок в списках не влияет на текст раздела
+_UNORDERED_FIELDS = frozenset({"technologies", "dependencies", "os_specific"})
+
+_SECTION_HEADING = re.compile(r"^##\s+(.*?)\s*$")
+
+
+class Section:
+    """Раздел README.md: id, заголовок и исходный текст раздела вместе с завершающими пустыми строками"""
+
+    def __init__(self, section_id, heading, text):
+        self.id = section_id
+        self.heading = heading
+        self.text = text
+
+    @property
+    def inputs(self):
+        return section_inputs(self.id)
+
+
+def _kind(heading):
+    for kind, pattern, _ in SECTION_KINDS:
+        if pattern.search(heading):
+            return kind
+    slug = re.sub(r"[^\w]+", "-", heading.lower(), flags=re.U).strip("-")
+    return f"other:{slug or 'section'}"
+
+
+def section_inputs(section_id):
+    """Поля project_info, от которых зависит раздел; None - раздел не создается по данным проекта"""
+    kind = section_id.split("#", 1)[0]
+    if kind == PREAMBLE:
+        return PREAMBLE_INPUTS
+    for name, _, inputs in SECTION_KINDS:
+        if name == kind:
+            return inputs
+    return DEFAULT_INPUTS
+
+
+def split_sections(text):
+    """Делит README.md на разделы по заголовкам второго уровня (вне блоков кода).
+    Текст до первого такого заголовка - вступление (PREAMBLE). Склейка текстов разделов дает исходный текст;
+    повторяющиеся виды разделов получают суффикс "#2", "#3"."""
+    sections = []
+    heading, section_id, lines = "", PREAMBLE, []
+    seen = {}
+    in_code = False
+    for line in text.splitlines(keepends=True):
+        if line.lstrip().startswith("```"):
+            in_code = not in_code
+        match = None if in_code else _SECTION_HEADING.match(line.rstrip("\r\n"))
+        if match:
+            if lines:
+                sections.append(Section(section_id, heading, "".join(lines)))
+            heading = match.group(1)
+            kind = _kind(heading)
+            seen[kind] = seen.get(kind, 0) + 1
+            section_id = kind if seen[kind] == 1 else f"{kind}#{seen[kind]}"
+            lines = [line]
+        else:
+            lines.append(line)
+    if lines:
+        sections.append(Section(section_id, heading, "".join(lines)))
+    return sections
+
+
+def join_sections(sections):
+    return "".join(section.text for section in sections)
+
+
+def inputs_hash(section_id, project_info):
+    """Хэш данных проекта, по которым создается раздел"""
+    inputs = section_inputs(section_id)
+    if inputs is None:
+        return None
+    values = {}
+    for field in inputs:
+        value = project_info.get(field)
+        if field in _UNORDERED_FIELDS and value:
+            value = sorted(value)
+        values[field] = value
+    payload = json.dumps({"section": section_id.split("#", 1)[0], "inputs": values},
+                         sort_keys=True, ensure_ascii=False, default=str)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()[:16]
+
+
+def set_section(text, section_id, section_text, after=("about", PREAMBLE)):
+    """Заменяет раздел section_id в тексте README.md или вставляет его после первого найденного
+    из разделов after (иначе - в начало). Остальные разделы не меняются"""
+    sections = split_sections(text)
+    new_section = Section(section_id, "", section_text.strip("\n") + "\n\n")
+    for index, section in enumerate(sections):
+        if section.id == section_id:
+            sections[index] = new_section
+            break
+    else:
+        position = 0
+        for anchor in after:
+            indexes = [index for index, section in enumerate(sections) if section.id == anchor]
+            if indexes:
+                position = indexes[0] + 1
+                break
+        sections.insert(position, new_section)
+    # Разделы отделяются пустой строкой
+    for section in sections[:-1]:
+        if not section.text.endswith("\n\n"):
+            section.text = section.text.rstrip("\n") + "\n\n"
+    return join_sections(sections).rstrip("\n") + "\n"
+
+
+def find_section(text, section_id):
+    for section in split_sections(text or ""):
+        if section.id == section_id:
+            return section
+    return None
+
+
+def _state_path(project_path):
+    key = hashlib.sha1(os.path.abspath(project_path).encode("utf-8")).hexdigest()
+    return os.path.join(user_cache_dir("readme_sections"), f"{key}.json")
+
+
+def load_state(project_path):
+    """Состояние последней генерации README.md: {"source": "llm" | "template", "sections": {id: хэш данных}}"""
+    try:
+        with open(_state_path(project_path), "r", encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+
+def save_state(project_path, source, sections):
+    path = _state_path(project_path)
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump({"source": source, "sections": sections}, f, ensure_ascii=False, indent=1)
+    os.replace(tmp_path, path)
+
+
+def plan_update(readme_text, state, project_info, source):
+    """Разделы README.md и список устаревших разделов, которые нужно создать заново.
+    Возвращает None, если README.md нужно создать целиком: нет состояния прошлой генерации,
+    она была другим способом, из README.md пропали сгенерированные разделы или устарела большая их часть.
+    Разделы, добавленные пользователем (их нет в состоянии), и скриншоты не пересоздаются."""
+    if not readme_text or not state or state.get("source") != source:
+        return None
+    recorded = state.get("sections") or {}
+    sections = split_sections(readme_text)
+    ids = {section.id for section in sections}
+    if not recorded or any(section_id not in ids for section_id in recorded):
+        return None
+    stale = [section for section in sections
+             if section.id in recorded and recorded[section.id] != inputs_hash(section.id, project_info)]
+    generated = [section for section in sections if section.id in recorded]
+    if len(stale) > len(generated) * MAX_STALE_SHARE:
+        return None
+    return sections, stale
+
+
+def section_hashes(readme_text, project_info):
+    """Хэши данных для всех разделов README.md, которые создаются по данным проекта"""
+    return {section.id: inputs_hash(section.id, project_info) for section in split_sections(readme_text)
+            if section.inputs is not None}
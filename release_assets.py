@@ -0,0 +1,134 @@
+import os
+import time
+import threading
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+from github_client import GitHubAPIError
+
+# GitHub ограничивает размер файла релиза 2 ГБ
+MAX_ASSET_SIZE = 2 * 1024 * 1024 * 1024
+# Как часто сообщать о ходе загрузки (секунды)
+PROGRESS_INTERVAL = 0.25
+
+
+def format_size(size):
+    return f"{size / (1024 * 1024):.1f} МБ"
+
+
+class ReleaseAssetUploader:
+    """Параллельная загрузка файлов в релиз GitHub.
+    Файлы читаются с диска потоком; уже загруженные файлы (то же имя и размер) пропускаются,
+    поэтому прерванную загрузку можно продолжить повторным запуском. Незавершенная запись файла,
+    оставшаяся от оборванной загрузки, удаляется перед повтором.
+    progress(отправлено байт, всего байт, скорость байт/с) вызывается не чаще, чем раз в PROGRESS_INTERVAL."""
+
+    def __init__(self, github, repo_name, release, log=None, progress=None, max_parallel=3, max_attempts=3,
+                 retry_delay=2):
+        self.github = github
+        self.repo_name = repo_name
+        self.release = release
+        self.log = log or (lambda message: None)
+        self.progress = progress or (lambda sent, total, speed: None)
+        self.max_parallel = max_parallel
+        self.max_attempts = max_attempts
+        self.retry_delay = retry_delay
+        self._lock = threading.Lock()
+        self._sent = {}
+        self._total = 0
+        self._started = 0.0
+        self._last_report = 0.0
+        self.bytes_sent = 0
+
+    def _existing_assets(self):
+        return {asset["name"]: asset for asset in self.github.list_release_assets(self.repo_name, self.release["id"])}
+
+    def upload(self, paths):
+        """Загружает файлы и возвращает список загруженных записей; при ошибке выбрасывает исключение
+        после завершения остальных загрузок"""
+        # Файл релиза определяется именем: два разных файла с одним именем (dist/win/app.zip и
+        # dist/linux/app.zip) загрузить нельзя, а повтор после ошибки удалил бы уже загруженный файл
+        by_name = {}
+        for path in paths:
+            by_name.setdefault(os.path.basename(path), set()).add(os.path.abspath(path))
+        duplicates = {name: sorted(same) for name, same in by_name.items() if len(same) > 1}
+        if duplicates:
+            raise Exception("В релизе не может быть нескольких файлов с одним именем: " + "; ".join(
+                f"'{name}' - {', '.join(same)}" for name, same in sorted(duplicates.items())))
+        paths = list(dict.fromkeys(os.path.abspath(path) for path in paths))
+
+        existing = self._existing_assets()
+        pending = []
+        for path in paths:
+            name = os.path.basename(path)
+            size = os.path.getsize(path)
+            asset = existing.get(name)
+            if asset is not None and asset.get("state") == "uploaded" and asset.get("size") == size:
+                self.log(f"Файл '{name}' уже загружен в релиз, пропускаю.")
+                continue
+            if size > MAX_ASSET_SIZE:
+                self.log(f"Файл '{name}' слишком большой для прикрепления к релизу ({format_size(size)})")
+                continue
+            pending.append((path, name, size, asset))
+        if not pending:
+            return []
+
+        self._total = sum(size for _, _, size, _ in pending)
+        self._sent = {name: 0 for _, name, _, _ in pending}
+        self._started = time.perf_counter()
+        self.log(f"Загрузка файлов релиза: {len(pending)} шт., {format_size(self._total)}...")
+
+        uploaded = []
+        errors = []
+        with ThreadPoolExecutor(max_workers=self.max_parallel) as executor:
+            futures = {executor.submit(self._upload_one, path, name, size, asset): name
+                       for path, name, size, asset in pending}
+            for future in as_completed(futures):
+                try:
+                    uploaded.append(future.result())
+                except Exception as e:
+                    errors.append(f"{futures[future]}: {e}")
+
+        elapsed = time.perf_counter() - self._started
+        sent = self.bytes_sent = sum(self._sent.values())
+        self.log(f"Загружено {len(uploaded)} из {len(pending)} файлов, {format_size(sent)} за {elapsed:.1f} с "
+                 f"({format_size(sent / elapsed if elapsed > 0 else 0)}/с)")
+        if errors:
+            raise Exception("Не удалось загрузить файлы релиза: " + "; ".join(errors))
+        return uploaded
+
+    def _upload_one(self, path, name, size, stale_asset):
+        for attempt in range(1, self.max_attempts + 1):
+            if stale_asset is not None:
+                self.log(f"Удаление незавершенной загрузки '{name}' из релиза...")
+                self.github.delete_release_asset(self.repo_name, stale_asset["id"])
+            try:
+                asset = self.github.upload_release_asset(self.release, path, name,
+                                                         on_progress=lambda sent: self._on_progress(name, sent))
+                self._on_progress(name, size, force=True)
+                self.log(f"Файл '{name}' загружен в релиз ({format_size(size)}).")
+                return asset
+            except GitHubAPIError as e:
+                # Ошибки запроса (кроме конфликта с остатком прошлой загрузки) повтором не исправить
+                if (400 <= e.status_code < 500 and e.status_code != 422) or attempt == self.max_attempts:
+                    raise
+                error = e
+            except Exception as e:
+                if attempt == self.max_attempts:
+                    raise
+                error = e
+            self._on_progress(name, 0)
+            self.log(f"Загрузка '{name}' прервана ({error}), повтор {attempt + 1}/{self.max_attempts}...")
+            time.sleep(self.retry_delay * attempt)
+            # Оборванная загрузка могла оставить в релизе запись файла, которая помешает повтору
+            stale_asset = self._existing_assets().get(name)
+
+    def _on_progress(self, name, sent, force=False):
+        with self._lock:
+            self._sent[name] = sent
+            now = time.perf_counter()
+            if not force and now - self._last_report < PROGRESS_INTERVAL:
+                return
+            self._last_report = now
+            total_sent = sum(self._sent.values())
+            elapsed = now - self._started
+        self.progress(total_sent, self._total, total_sent / elapsed if elapsed > 0 else 0.0)
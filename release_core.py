@@ -0,0 +1,374 @@
+import os
+import re
+import json
+import subprocess
+
+from project_scanner import analyze_project
+from github_client import GitHubClient
+from release_assets import ReleaseAssetUploader, format_size
+from screenshot_optimizer import ScreenshotOptimizer
+from run_metrics import RunMetrics, command_stage, format_stage_summary
+from ollama_client import (
+    OllamaClient, GenerationCancelled, DEFAULT_MODEL, format_generation_stats, format_service_stats
+)
+from model_routing import DeadlineExceeded, route, call_with_deadline
+from llm_cache import LLMCache, cached_generation
+from readme_sections import SCREENSHOTS, find_section, set_section
+
+# Информация о релизе, которая используется, если ИИ не вернул корректный JSON
+DEFAULT_RELEASE_INFO = {
+    "tag": "v1.0.0",
+    "title": "Релиз v1.0.0",
+    "notes": "## Что нового\n- Реализована основная функциональность\n- Исправлены критические ошибки"
+}
+
+
+# Схема ответа ИИ с информацией о релизе: передается в Ollama (поле format), поэтому модель
+# отвечает только объектом JSON с этими полями, без текста вокруг
+RELEASE_INFO_SCHEMA = {
+    "type": "object",
+    "properties": {
+        "tag": {"type": "string"},
+        "title": {"type": "string"},
+        "notes": {"type": "string"},
+    },
+    "required": ["tag", "title", "notes"],
+}
+# Сколько раз запрашивать информацию о релизе, если ответ ИИ не прошел проверку
+RELEASE_INFO_ATTEMPTS = max(1, int(os.environ.get("GITHUB_PUBLISHER_RELEASE_ATTEMPTS", "2")))
+SEMVER_TAG = re.compile(r"^v?\d+\.\d+\.\d+(-[0-9A-Za-z.-]+)?(\+[0-9A-Za-z.-]+)?$")
+
+
+def validate_release_info(data):
+    """Проверяет информацию о релизе; возвращает список ошибок (пустой - данные корректны)"""
+    if not isinstance(data, dict):
+        return ["ответ не является объектом JSON"]
+    errors = [f"поле {field} отсутствует или пустое" for field in ("tag", "title", "notes")
+              if not isinstance(data.get(field), str) or not data[field].strip()]
+    if isinstance(data.get("tag"), str) and data["tag"].strip() and not SEMVER_TAG.match(data["tag"].strip()):
+        errors.append(f"тег '{data['tag']}' не в формате semver (например, v1.0.0)")
+    return errors
+
+
+def load_release_info(response_text):
+    """Разбирает и проверяет ответ ИИ: (release_data или None, список ошибок)"""
+    try:
+        data = json.loads(response_text or "")
+    except ValueError:
+        # Ответ без схемы (GeminiAPIClient) может содержать текст вокруг JSON
+        json_match = re.search(r'\{.*\}', response_text or "", re.DOTALL)
+        if not json_match:
+            return None, ["в ответе нет объекта JSON"]
+        try:
+            data = json.loads(json_match.group(0))
+        except ValueError as e:
+            return None, [f"некорректный JSON: {e}"]
+    errors = validate_release_info(data)
+    if errors:
+        return None, errors
+    return {field: data[field].strip() for field in ("tag", "title", "notes")}, []
+
+
+def build_release_prompt(project_info, errors=None):
+    """Формирует запрос к ИИ для генерации информации о релизе по схеме RELEASE_INFO_SCHEMA.
+    errors - ошибки предыдущего ответа, которые модель должна исправить."""
+    prompt = f"Сгенерируй информацию о первом релизе для проекта GitHub '{project_info['name']}'. "
+    prompt += f"Тип проекта: {project_info['type']}. "
+    if project_info['technologies']:
+        prompt += f"Используемые технологии: {', '.join(project_info['technologies'])}. "
+    if project_info['dependencies']:
+        prompt += f"Основные зависимости: {', '.join(project_info['dependencies'][:10])}. "
+    if project_info.get('description'):
+        prompt += f"Описание: {project_info['description']}. "
+    prompt += ("Поля ответа: \"tag\" - тег релиза в формате semver, например v1.0.0; "
+               "\"title\" - краткий заголовок релиза; "
+               "\"notes\" - примечания к релизу в формате markdown со списком основных возможностей.")
+    if errors:
+        prompt += f" Предыдущий ответ не прошел проверку: {'; '.join(errors)}. Исправь это."
+    return prompt
+
+
+class ReleasePublisher:
+    """Создание релиза на GitHub без зависимости от Qt: подготовка скриншота, обновление README.md
+    и создание релиза через GitHub API. Сообщения передаются через log(message),
+    ход выполнения - через progress(percent, message)."""
+
+    def __init__(self, project_path, repo_name, release_data, screenshot_path=None, log=None, progress=None,
+                 asset_paths=None, metrics=None):
+        self.project_path = project_path
+        self.repo_name = repo_name
+        self.release_data = release_data
+        self.screenshot_path = screenshot_path
+        self.asset_paths = list(asset_paths or [])  # дополнительные файлы релиза (сборки, архивы)
+        self.log = log or (lambda message: None)
+        self.progress = progress or (lambda percent, message: None)
+        # При автоматическом релизе метрики общие с ReleaseInfoGenerator
+        self.metrics = metrics or RunMetrics("release", project_path, repo_name)
+
+    def _run_command(self, command, cwd=None):
+        if cwd is None:
+            cwd = self.project_path
+        self.log(f"Выполнение команды: {command} в {cwd}")
+        stage = command_stage(command)
+        with self.metrics.stage(stage):
+            process = subprocess.run(command, cwd=cwd, shell=True, capture_output=True, text=True, encoding='utf-8')
+        self.metrics.add(stage, subprocesses=1)
+        if process.stdout:
+            self.log(f"Stdout: {process.stdout.strip()}")
+        if process.stderr:
+            self.log(f"Stderr: {process.stderr.strip()}")
+        if process.returncode != 0:
+            raise Exception(f"Команда завершилась с ошибкой (код {process.returncode}): {command}")
+        return process.stdout
+
+    def publish(self):
+        """Создает релиз в текущем потоке; при ошибке выбрасывает исключение.
+        Метрики запуска сохраняются в обоих случаях."""
+        try:
+            self._publish()
+        except Exception as e:
+            self.metrics.finish("error", e)
+            raise
+        self.log(format_stage_summary(self.metrics.finish()))
+
+    def _publish(self):
+        self.log(f"Рабочий поток запущен для создания релиза '{self.release_data['tag']}' для репозитория '{self.repo_name}'.")
+
+        # Подготавливаем скриншот, если он указан
+        self.progress(60, "Подготовка скриншота...")
+        screenshot_to_upload = None
+        if self.screenshot_path and os.path.exists(self.screenshot_path):
+            # Имя файла содержит хэш содержимого: тот же скриншот не добавляется в репозиторий повторно
+            optimizer = ScreenshotOptimizer(self.project_path, log=self.log)
+            with self.metrics.stage("screenshot"):
+                screenshot = optimizer.prepare(self.screenshot_path)
+            self.metrics.add("screenshot", files=1, bytes_in=optimizer.bytes_in, bytes_out=optimizer.bytes_out)
+
+            # В релиз прикрепляется только полноразмерный скриншот
+            screenshot_to_upload = screenshot["image"]
+            
+            # Добавляем скриншот в README.md
+            self._add_screenshot_to_readme(screenshot["image"], screenshot["thumbnail"])
+            
+            # Коммитим изменения в README.md
+            self._commit_and_push_changes()
+
+        # Создаем релиз через GitHub API
+        self.progress(80, "Создание релиза на GitHub...")
+        self.log(f"Создание релиза '{self.release_data['tag']}' через GitHub API...")
+        github = GitHubClient(log=self.log)
+        with self.metrics.stage("github_release"):
+            # Релиз с тем же тегом остается от прерванного запуска: в него догружаются недостающие файлы
+            release = github.get_release_by_tag(self.repo_name, self.release_data['tag'])
+            if release is not None:
+                self.log(f"Релиз '{self.release_data['tag']}' уже существует, догружаю недостающие файлы.")
+            else:
+                release = github.create_release(self.repo_name, self.release_data['tag'],
+                                                title=self.release_data['title'], notes=self.release_data['notes'])
+
+        # Прикрепляем скриншот и дополнительные файлы
+        assets = [path for path in [screenshot_to_upload] + self.asset_paths if path and os.path.exists(path)]
+        for path in self.asset_paths:
+            if not os.path.exists(path):
+                self.log(f"Файл для релиза не найден: {path}")
+        if assets:
+            uploader = ReleaseAssetUploader(github, self.repo_name, release, log=self.log,
+                                            progress=self._on_upload_progress)
+            with self.metrics.stage("upload"):
+                try:
+                    uploaded = uploader.upload(assets)
+                finally:
+                    self.metrics.add("upload", bytes_sent=uploader.bytes_sent)
+            self.metrics.add("upload", files=len(uploaded))
+
+        self.log(f"Страница релиза: {release['html_url']}")
+        self.log(f"Релиз '{self.release_data['tag']}' успешно создан для репозитория '{self.repo_name}'.")
+        self.progress(100, "Релиз создан")
+
+    def _on_upload_progress(self, sent, total, speed):
+        percent = 85 + int(14 * sent / total) if total else 99
+        self.progress(percent, f"Загрузка файлов релиза: {format_size(sent)} из {format_size(total)}, "
+                               f"{format_size(speed)}/с")
+
+    def _commit_and_push_changes(self):
+        """Коммитит и пушит изменения в репозиторий"""
+        try:
+            # Добавляем измененный README.md и скриншоты
+            self._run_command("git add README.md screenshots")
+            if not self._run_command("git status --porcelain -- README.md screenshots").strip():
+                self.log("README.md и скриншоты не изменились, коммит не нужен.")
+                return
+            
+            # Создаем коммит
+            self._run_command('git commit -m "Добавлен скриншот в README.md"')
+            
+            # Пушим изменения в текущую ветку (в репозитории может не быть ветки master)
+            self._run_command("git push origin HEAD")
+            
+            self.log("Изменения в README.md закоммичены и отправлены в репозиторий")
+        except Exception as e:
+            self.log(f"Ошибка при коммите и пушу изменений: {e}")
+
+    def _add_screenshot_to_readme(self, screenshot_path, thumbnail_path=None):
+        """Добавляет скриншот в README.md; если есть миниатюра, показывается она со ссылкой на полный размер"""
+        readme_path = os.path.join(self.project_path, "README.md")
+        
+        if not os.path.exists(readme_path):
+            self.log("README.md не найден, скриншот не будет добавлен.")
+            return
+            
+        try:
+            # Читаем содержимое README.md
+            with open(readme_path, "r", encoding="utf-8") as f:
+                content = f.read()
+                
+            if find_section(content, SCREENSHOTS) is not None:
+                self.log("Раздел со скриншотами уже существует в README.md, он будет обновлен.")
+
+            # Создаем относительный путь к скриншоту
+            screenshot_filename = os.path.basename(screenshot_path)
+            relative_screenshot_path = f"screenshots/{screenshot_filename}"
+            
+            # Создаем markdown для изображения
+            image_markdown = f"![Скриншот программы]({relative_screenshot_path})"
+            if thumbnail_path:
+                image_markdown = f"[![Скриншот программы](screenshots/{os.path.basename(thumbnail_path)})]({relative_screenshot_path})"
+
+            # Раздел заменяется на месте или вставляется после краткого описания; остальные разделы не меняются
+            content = set_section(content, SCREENSHOTS, f"## 📸 Скриншоты\n\n{image_markdown}\n")
+
+            # Записываем обновленное содержимое
+            with open(readme_path, "w", encoding="utf-8") as f:
+                f.write(content)
+                
+            self.log("Скриншот добавлен в README.md")
+        except Exception as e:
+            self.log(f"Ошибка при добавлении скриншота в README.md: {e}")
+
+
+class ReleaseInfoGenerator:
+    """Генерация информации о релизе без зависимости от Qt: анализ проекта и запрос к ИИ.
+    Модель и срок ответа выбираются по задаче "release" (model_routing), если не заданы явно."""
+
+    def __init__(self, project_path, repo_name, model_name=None, stream_llm=True, force_regenerate=False,
+                 log=None, on_tokens=None, progress=None, use_llm=True, metrics=None, speculative=False,
+                 deadline=None):
+        self.project_path = project_path
+        self.repo_name = repo_name
+        self.use_llm = use_llm
+        self.model_name = model_name
+        self.deadline = deadline
+        self.stream_llm = stream_llm
+        self.force_regenerate = force_regenerate
+        self.speculative = speculative  # предварительная генерация после выбора папки проекта
+        self.log = log or (lambda message: None)
+        self.on_tokens = on_tokens or (lambda text: None)
+        self.progress = progress or (lambda percent, message: None)
+        self.ollama_client = OllamaClient(model_name=model_name or DEFAULT_MODEL)
+        self.llm_cache = LLMCache()
+        self.metrics = metrics or RunMetrics("release", project_path, repo_name)
+
+    def cancel_generation(self):
+        """Прерывает потоковую генерацию информации о релизе"""
+        self.ollama_client.cancel()
+
+    def _check_cancelled(self):
+        if self.ollama_client.is_cancelled():
+            raise GenerationCancelled()
+
+    def generate(self):
+        """Анализирует проект и возвращает release_data (tag, title, notes).
+        При ошибке запуск завершается в метриках; при успехе их завершит ReleasePublisher."""
+        try:
+            return self._generate()
+        except GenerationCancelled as e:
+            self.metrics.finish("cancelled", e)
+            raise
+        except Exception as e:
+            self.metrics.finish("error", e)
+            raise
+
+    def _generate(self):
+        if not self.use_llm:
+            self.log("Генерация информации о релизе без использования ИИ: используются значения по умолчанию.")
+            return dict(DEFAULT_RELEASE_INFO)
+
+        self.progress(0, "Анализ проекта...")
+        self.log("Анализ проекта для генерации информации о релизе...")
+        with self.metrics.stage("scan"):
+            project_info = analyze_project(self.project_path, self.repo_name, log=self.log)
+
+        self.progress(20, "Генерация информации о релизе с помощью ИИ...")
+        self.log("Генерация информации о релизе с помощью ИИ...")
+        task_route = route("release", service=self.ollama_client.service, log=self.log)
+        self.model_name = self.model_name or task_route["model"]
+        deadline = task_route["deadline"] if self.deadline is None else self.deadline
+        self.log(f"Модель для информации о релизе: {self.model_name}"
+                 + (f", срок ответа {deadline:g} с." if deadline else "."))
+        try:
+            with self.metrics.stage("llm"):
+                # Предварительная генерация никого не задерживает, поэтому срок ответа к ней не применяется
+                release_info = call_with_deadline(lambda: self._generate_release_info(project_info),
+                                                  None if self.speculative else deadline,
+                                                  cancel=self.cancel_generation)
+        except DeadlineExceeded as e:
+            self.log(f"Генерация информации о релизе прервана: {e}. Используются значения по умолчанию.")
+            self.metrics.add("llm", deadline_missed=1)
+            return dict(DEFAULT_RELEASE_INFO)
+        return release_info
+
+    def _generate_release_info(self, project_info):
+        """Запрашивает информацию о релизе и проверяет ответ; ответ, не прошедший проверку, запрашивается
+        повторно (всего не более RELEASE_INFO_ATTEMPTS раз) с описанием ошибок, затем используются
+        значения по умолчанию"""
+        errors = []
+        for attempt in range(1, RELEASE_INFO_ATTEMPTS + 1):
+            response = self._request_release_info(project_info, errors)
+            release_info, errors = load_release_info(response)
+            if release_info is not None:
+                if attempt > 1:
+                    self.log(f"Информация о релизе получена с попытки {attempt} из {RELEASE_INFO_ATTEMPTS}.")
+                return release_info
+            self.metrics.add("llm", invalid_responses=1)
+            self.log(f"Ответ ИИ не прошел проверку (попытка {attempt} из {RELEASE_INFO_ATTEMPTS}): {'; '.join(errors)}.")
+        self.log(f"ИИ не вернул корректную информацию о релизе (попыток: {RELEASE_INFO_ATTEMPTS}). "
+                 f"Используются значения по умолчанию.")
+        return dict(DEFAULT_RELEASE_INFO)
+
+    def _request_release_info(self, project_info, errors):
+        """Один запрос к ИИ; проверенные ответы сохраняются в кэш и используются повторно"""
+        if self.stream_llm:
+            prompt = build_release_prompt(project_info, errors)
+
+            def generate():
+                text, stats = self.ollama_client.generate_stream(prompt, on_tokens=self.on_tokens,
+                                                                 model_name=self.model_name,
+                                                                 output_format=RELEASE_INFO_SCHEMA)
+                self.log(format_generation_stats(stats))
+                self.log(format_service_stats(self.ollama_client.service.stats()))
+                self.metrics.add_generation_stats("llm", stats)
+                return text
+            # Схема входит в ключ кэша: ответы, полученные без нее или по другой схеме, не используются
+            options = {"format": RELEASE_INFO_SCHEMA}
+        else:
+            # Запрос формирует сам GeminiAPIClient, поэтому ключом служат данные проекта
+            prompt = json.dumps(project_info, sort_keys=True, ensure_ascii=False, default=str)
+            # Повторный запрос получает свой ключ, иначе кэш вернул бы тот же ответ
+            if errors:
+                prompt += f"\n{'; '.join(errors)}"
+
+            def generate():
+                from gemini_api_client import GeminiAPIClient
+                return GeminiAPIClient(model_name=self.model_name).generate_release_info(project_info)
+            options = {"client": "GeminiAPIClient", "task": "release_info"}
+
+        release_info_json, from_cache = cached_generation(
+            self.llm_cache, self.model_name, prompt, generate,
+            options=options, force=self.force_regenerate, log=self.log,
+            speculative=self.speculative, cancel=self.cancel_generation, check_cancelled=self._check_cancelled,
+            accept=lambda text: load_release_info(text)[0] is not None)
+        if from_cache:
+            self.metrics.add("llm", cache_hits=1)
+        if from_cache and self.stream_llm:
+            self.on_tokens(release_info_json)
+        return release_info_json
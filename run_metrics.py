@@ -0,0 +1,178 @@
+import os
+import json
+import time
+import uuid
+import socket
+import threading
+from contextlib import contextmanager
+
+from app_paths import user_cache_dir
+
+# Файл с метриками для textfile collector node_exporter (Prometheus); пусто - не записывается
+PROMETHEUS_TEXTFILE = os.environ.get("GITHUB_PUBLISHER_PROMETHEUS_TEXTFILE", "")
+
+
+def command_stage(command):
+    """Имя этапа для команды оболочки: git_<подкоманда> для git, иначе имя программы"""
+    parts = command.split()
+    if not parts:
+        return "command"
+    if parts[0] == "git" and len(parts) > 1:
+        return f"git_{parts[1].replace('-', '_')}"
+    return parts[0]
+
+
+def format_stage_summary(record):
+    """Строка для лога: самые долгие этапы запуска"""
+    stages = sorted(record["stages"].items(), key=lambda item: -item[1]["seconds"])
+    parts = [f"{name} {entry['seconds']:.2f} с" for name, entry in stages if entry["seconds"] > 0]
+    return (f"Время запуска: {record['duration_seconds']:.1f} с, подпроцессов: {record['subprocesses']}. "
+            f"Этапы: {', '.join(parts) or 'нет'}")
+
+
+class RunMetrics:
+    """Метрики одного запуска публикации или релиза: время этапов, число подпроцессов,
+    переданные байты и статистика генерации Ollama. По завершении запуск дописывается
+    строкой JSON в metrics/runs.jsonl и, если задан GITHUB_PUBLISHER_PROMETHEUS_TEXTFILE,
+    экспортируется в формате Prometheus."""
+
+    def __init__(self, kind, project_path, repo_name, metrics_dir=None, prometheus_path=None):
+        self.kind = kind  # publish или release
+        self.project_path = project_path
+        self.repo_name = repo_name
+        self.metrics_dir = metrics_dir or user_cache_dir("metrics")
+        self.prometheus_path = PROMETHEUS_TEXTFILE if prometheus_path is None else prometheus_path
+        self.run_id = uuid.uuid4().hex
+        self.started = time.time()
+        self._started_perf = time.perf_counter()
+        self.stages = {}
+        self.record = None
+        self._lock = threading.Lock()
+
+    def _stage_entry(self, name):
+        return self.stages.setdefault(name, {"seconds": 0.0, "calls": 0})
+
+    @contextmanager
+    def stage(self, name):
+        """Измеряет время этапа; повторные вызовы одного этапа суммируются"""
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            elapsed = time.perf_counter() - started
+            with self._lock:
+                entry = self._stage_entry(name)
+                entry["seconds"] += elapsed
+                entry["calls"] += 1
+
+    def add(self, name, **counters):
+        """Добавляет значения счетчиков этапа (bytes_sent, subprocesses, eval_count, ...)"""
+        with self._lock:
+            entry = self._stage_entry(name)
+            for key, value in counters.items():
+                if value is not None:
+                    entry[key] = entry.get(key, 0) + value
+
+    def add_generation_stats(self, name, stats):
+        """Статистика генерации Ollama: загрузка модели, обработка запроса и генерация ответа"""
+        self.add(name, generations=1,
+                 load_seconds=stats.get("load_duration"),
+                 prompt_eval_count=stats.get("prompt_eval_count"),
+                 prompt_eval_seconds=stats.get("prompt_eval_duration"),
+                 eval_count=stats.get("eval_count"),
+                 eval_seconds=stats.get("eval_duration"),
+                 time_to_first_token=stats.get("time_to_first_token"))
+
+    def finish(self, status="ok", error=None):
+        """Завершает запуск и сохраняет метрики; повторный вызов ничего не делает"""
+        with self._lock:
+            if self.record is not None:
+                return self.record
+            self.record = {
+                "run_id": self.run_id,
+                "kind": self.kind,
+                "host": socket.gethostname(),
+                "project": self.project_path,
+                "repo": self.repo_name,
+                "started": self.started,
+                "duration_seconds": time.perf_counter() - self._started_perf,
+                "status": status,
+                "error": str(error) if error else None,
+                "subprocesses": sum(entry.get("subprocesses", 0) for entry in self.stages.values()),
+                # Копия: этапы, которые еще выполняются в других потоках, могут менять self.stages во время записи
+                "stages": {name: dict(entry) for name, entry in self.stages.items()},
+            }
+        try:
+            self._write_jsonl()
+            if self.prometheus_path:
+                self._write_prometheus()
+        except OSError:
+            # Метрики не должны прерывать публикацию
+            pass
+        return self.record
+
+    def _write_jsonl(self):
+        line = json.dumps(self.record, ensure_ascii=False, sort_keys=True)
+        with _write_lock, open(os.path.join(self.metrics_dir, "runs.jsonl"), "a", encoding="utf-8") as f:
+            f.write(line + "\n")
+
+    def _write_prometheus(self):
+        # В файле хранятся последние запуски каждого вида и накопленные счетчики запусков
+        state_path = os.path.join(self.metrics_dir, "prometheus_state.json")
+        with _write_lock:
+            try:
+                with open(state_path, "r", encoding="utf-8") as f:
+                    state = json.load(f)
+            except (OSError, ValueError):
+                state = {"last_runs": {}, "runs_total": {}}
+            state["last_runs"][self.kind] = self.record
+            counter_key = f"{self.kind}:{self.record['status']}"
+            state["runs_total"][counter_key] = state["runs_total"].get(counter_key, 0) + 1
+            _atomic_write(state_path, json.dumps(state, ensure_ascii=False))
+            _atomic_write(self.prometheus_path, format_prometheus(state))
+
+
+_write_lock = threading.Lock()
+
+
+def _atomic_write(path, text):
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        f.write(text)
+    os.replace(tmp_path, path)
+
+
+def _escape_label(value):
+    return str(value).replace("\\", "\\\\").replace("\"", "\\\"").replace("\n", "\\n")
+
+
+def format_prometheus(state):
+    """Текст в формате экспозиции Prometheus по последним запускам и счетчикам"""
+    lines = []
+
+    def metric(name, help_text, metric_type, samples):
+        lines.append(f"# HELP {name} {help_text}")
+        lines.append(f"# TYPE {name} {metric_type}")
+        for labels, value in samples:
+            label_text = ",".join(f'{key}="{_escape_label(val)}"' for key, val in labels.items())
+            lines.append(f"{name}{{{label_text}}} {value}")
+
+    last_runs = state["last_runs"]
+    metric("github_publisher_runs_total", "Number of finished runs by kind and status.", "counter",
+           [({"kind": key.split(":", 1)[0], "status": key.split(":", 1)[1]}, count)
+            for key, count in sorted(state["runs_total"].items())])
+    metric("github_publisher_last_run_timestamp_seconds", "Start time of the last run.", "gauge",
+           [({"kind": kind}, run["started"]) for kind, run in sorted(last_runs.items())])
+    metric("github_publisher_last_run_duration_seconds", "Wall time of the last run.", "gauge",
+           [({"kind": kind}, f"{run['duration_seconds']:.6f}") for kind, run in sorted(last_runs.items())])
+    metric("github_publisher_last_run_success", "1 if the last run succeeded.", "gauge",
+           [({"kind": kind}, int(run["status"] == "ok")) for kind, run in sorted(last_runs.items())])
+    metric("github_publisher_last_run_stage_seconds", "Wall time of a stage in the last run.", "gauge",
+           [({"kind": kind, "stage": stage}, f"{entry['seconds']:.6f}")
+            for kind, run in sorted(last_runs.items()) for stage, entry in sorted(run["stages"].items())])
+    metric("github_publisher_last_run_stage_value", "Stage counters of the last run "
+           "(subprocesses, bytes_sent, eval_count, ...).", "gauge",
+           [({"kind": kind, "stage": stage, "counter": key}, value)
+            for kind, run in sorted(last_runs.items()) for stage, entry in sorted(run["stages"].items())
+            for key, value in sorted(entry.items()) if key != "seconds"])
+    return "\n".join(lines) + "\n"
@@ -0,0 +1,205 @@
+import io
+import os
+import re
+import struct
+import hashlib
+import zlib
+
+# Ширина миниатюры скриншота, которая встраивается в README.md (пиксели)
+THUMBNAIL_WIDTH = int(os.environ.get("GITHUB_PUBLISHER_THUMBNAIL_WIDTH", "800"))
+# Максимальная сторона полноразмерного скриншота; 0 - не уменьшать
+SCREENSHOT_MAX_SIZE = int(os.environ.get("GITHUB_PUBLISHER_SCREENSHOT_MAX_SIZE", "0"))
+
+# Форматы без потерь, которые пересохраняются в PNG; JPEG, GIF и WebP сохраняются как есть
+LOSSLESS_FORMATS = frozenset({"PNG", "BMP", "TIFF", "PPM", "TGA", "ICO"})
+# Вспомогательные блоки PNG, влияющие на отображение; остальные (текст, время) отбрасываются
+PNG_KEEP_CHUNKS = frozenset({b"IHDR", b"PLTE", b"tRNS", b"gAMA", b"cHRM", b"sRGB", b"iCCP", b"sBIT", b"pHYs", b"IEND"})
+PNG_SIGNATURE = b"\x89PNG\r\n\x1a\n"
+
+_HASH_LENGTH = 12
+
+
+def file_sha256(path):
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(1024 * 1024), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def recompress_png(data):
+    """Пересжимает PNG без потерь средствами zlib (без Pillow): данные изображения сжимаются
+    с максимальным уровнем, метаданные отбрасываются. Возвращает None, если это не PNG"""
+    if not data.startswith(PNG_SIGNATURE):
+        return None
+    chunks = []
+    idat = []
+    position = len(PNG_SIGNATURE)
+    while position + 8 <= len(data):
+        length, chunk_type = struct.unpack(">I4s", data[position:position + 8])
+        body = data[position + 8:position + 8 + length]
+        position += 12 + length
+        if chunk_type == b"IDAT":
+            if not idat:
+                chunks.append((b"IDAT", None))
+            idat.append(body)
+        elif chunk_type in PNG_KEEP_CHUNKS:
+            chunks.append((chunk_type, body))
+    if not idat:
+        return None
+    compressed = zlib.compress(zlib.decompress(b"".join(idat)), 9)
+    result = [PNG_SIGNATURE]
+    for chunk_type, body in chunks:
+        body = compressed if body is None else body
+        result.append(struct.pack(">I", len(body)) + chunk_type + body +
+                      struct.pack(">I", zlib.crc32(chunk_type + body) & 0xffffffff))
+    return b"".join(result)
+
+
+class ScreenshotOptimizer:
+    """Подготовка скриншота для репозитория и релиза: файл получает имя с хэшем содержимого, поэтому
+    повторный релиз с тем же изображением не добавляет в репозиторий новую копию. Изображения без потерь
+    (BMP, PNG, ...) пересохраняются в PNG с максимальным сжатием, при необходимости уменьшаются до
+    max_size; для README.md создается миниатюра шириной thumbnail_width.
+    Pillow необязателен: без него PNG пересжимаются средствами zlib, а миниатюра не создается."""
+
+    def __init__(self, project_path, log=None, max_size=SCREENSHOT_MAX_SIZE, thumbnail_width=THUMBNAIL_WIDTH):
+        self.screenshots_dir = os.path.join(project_path, "screenshots")
+        self.log = log or (lambda message: None)
+        self.max_size = max_size
+        self.thumbnail_width = thumbnail_width
+        self.bytes_in = 0
+        self.bytes_out = 0
+
+    def _find_existing(self, content_hash):
+        """Ранее подготовленный скриншот с тем же содержимым исходного файла"""
+        if not os.path.isdir(self.screenshots_dir):
+            return None, None
+        pattern = re.compile(rf"-{content_hash[:_HASH_LENGTH]}(\.thumb)?\.\w+$")
+        image = thumbnail = None
+        for name in os.listdir(self.screenshots_dir):
+            match = pattern.search(name)
+            if match:
+                path = os.path.join(self.screenshots_dir, name)
+                if match.group(1):
+                    thumbnail = path
+                else:
+                    image = path
+        return image, thumbnail
+
+    def prepare(self, source_path):
+        """Возвращает {"image": полноразмерный скриншот в screenshots/, "thumbnail": миниатюра или None}"""
+        self.bytes_in = os.path.getsize(source_path)
+        # Скриншот, уже лежащий в screenshots/, используется как есть
+        if os.path.dirname(os.path.abspath(source_path)) == os.path.abspath(self.screenshots_dir):
+            self.bytes_out = self.bytes_in
+            thumbnail = re.sub(r"(\.\w+)$", r".thumb\1", source_path)
+            return {"image": source_path, "thumbnail": thumbnail if os.path.exists(thumbnail) else None}
+
+        content_hash = file_sha256(source_path)
+        image, thumbnail = self._find_existing(content_hash)
+        if image:
+            self.bytes_out = os.path.getsize(image)
+            self.log(f"Скриншот с тем же содержимым уже есть в репозитории: {os.path.basename(image)}")
+            return {"image": image, "thumbnail": thumbnail}
+
+        stem = re.sub(r"[^\w.-]+", "-", os.path.splitext(os.path.basename(source_path))[0]).strip("-") or "screenshot"
+        base_name = f"{stem}-{content_hash[:_HASH_LENGTH]}"
+        with open(source_path, "rb") as f:
+            original = f.read()
+        extension = os.path.splitext(source_path)[1].lower() or ".png"
+        try:
+            from PIL import Image
+        except ImportError:
+            Image = None
+        try:
+            if Image is None:
+                self.log("Pillow не установлен: скриншот не уменьшается, миниатюра не создается (pip install Pillow).")
+                data = original
+                if extension == ".png":
+                    data = min((original, recompress_png(original) or original), key=len)
+                extension, data, thumbnail_data = extension, data, None
+            else:
+                extension, data, thumbnail_data = self._optimize(Image, original, extension)
+        except (OSError, ValueError, zlib.error) as e:
+            # Оптимизация необязательна: поврежденный файл или формат, который не удалось разобрать (SVG),
+            # сохраняется как есть и не мешает созданию релиза. UnidentifiedImageError Pillow - подкласс OSError
+            self.log(f"Не удалось оптимизировать скриншот ({e}), он сохраняется без изменений и без миниатюры.")
+            data, thumbnail_data = original, None
+        result = self._store(base_name, extension, data, thumbnail_data)
+        self.bytes_out = len(data)
+        self.log(f"Скриншот подготовлен: {os.path.basename(result['image'])}, "
+                 f"{self.bytes_in / 1024:.0f} КБ -> {self.bytes_out / 1024:.0f} КБ"
+                 + (f", миниатюра {os.path.getsize(result['thumbnail']) / 1024:.0f} КБ" if result["thumbnail"] else ""))
+        return result
+
+    def _optimize(self, Image, original, extension):
+        """Возвращает (расширение, содержимое полноразмерного скриншота, содержимое миниатюры или None)"""
+        with Image.open(io.BytesIO(original)) as image:
+            image_format = image.format
+            animated = getattr(image, "is_animated", False)
+            width, height = image.size
+            resize = self.max_size and max(width, height) > self.max_size and not animated
+
+            if resize or image_format in LOSSLESS_FORMATS and not animated:
+                full = image.copy()
+                if resize:
+                    full.thumbnail((self.max_size, self.max_size), Image.LANCZOS)
+                    self.log(f"Скриншот уменьшен: {width}x{height} -> {full.size[0]}x{full.size[1]}")
+                if image_format == "JPEG":
+                    extension, data = ".jpg", self._encode(full, "JPEG")
+                else:
+                    extension, data = ".png", self._encode(full, "PNG")
+                    # Уже хорошо сжатый PNG пересохранение может только увеличить
+                    if not resize and image_format == "PNG":
+                        data = min((data, original, recompress_png(original) or original), key=len)
+            else:
+                # JPEG, GIF и WebP пересохранение только ухудшит или не уменьшит
+                data = original
+                full = image
+
+            thumbnail_data = None
+            if not animated and full.size[0] > self.thumbnail_width:
+                thumbnail = full.copy()
+                thumbnail.thumbnail((self.thumbnail_width, full.size[1]), Image.LANCZOS)
+                thumbnail_data = self._encode(thumbnail, "JPEG" if image_format == "JPEG" else "PNG")
+                # Сглаженная миниатюра простого интерфейса бывает тяжелее полного PNG: тогда она не нужна
+                if len(thumbnail_data) >= len(data):
+                    thumbnail_data = None
+        return extension, data, thumbnail_data
+
+    def _store(self, base_name, extension, data, thumbnail_data):
+        """Записывает файлы в screenshots/; если там уже есть файл с тем же содержимым, используется он"""
+        os.makedirs(self.screenshots_dir, exist_ok=True)
+        for name in sorted(os.listdir(self.screenshots_dir)):
+            path = os.path.join(self.screenshots_dir, name)
+            if ".thumb." in name or not os.path.isfile(path) or os.path.getsize(path) != len(data):
+                continue
+            with open(path, "rb") as f:
+                if f.read() == data:
+                    self.log(f"Скриншот с тем же изображением уже есть в репозитории: {name}")
+                    thumbnail = re.sub(r"(\.\w+)$", r".thumb\1", path)
+                    return {"image": path, "thumbnail": thumbnail if os.path.exists(thumbnail) else None}
+
+        image_path = os.path.join(self.screenshots_dir, base_name + extension)
+        with open(image_path, "wb") as f:
+            f.write(data)
+        thumbnail_path = None
+        if thumbnail_data:
+            thumbnail_path = os.path.join(self.screenshots_dir, f"{base_name}.thumb{extension}")
+            with open(thumbnail_path, "wb") as f:
+                f.write(thumbnail_data)
+        return {"image": image_path, "thumbnail": thumbnail_path}
+
+    @staticmethod
+    def _encode(image, image_format):
+        if image_format == "JPEG":
+            image = image.convert("RGB") if image.mode not in ("L", "RGB", "CMYK") else image
+            options = {"quality": 90, "optimize": True}
+        else:
+            if image.mode not in ("1", "L", "LA", "P", "RGB", "RGBA", "I", "I;16"):
+                image = image.convert("RGBA" if "A" in image.mode else "RGB")
+            options = {"optimize": True}
+        output = io.BytesIO()
+        image.save(output, image_format, **options)
+        return output.getvalue()
@@ -0,0 +1,80 @@
+import os
+import time
+import threading
+
+# Конвейер публикации и клиенты ИИ импортируются в фоновом потоке: модуль загружается окном при выборе папки
+
+# Предварительная генерация README.md (и информации о релизе) сразу после выбора папки проекта; 0 - отключить
+SPECULATIVE_GENERATION = os.environ.get("GITHUB_PUBLISHER_SPECULATIVE", "1") != "0"
+
+
+class SpeculativeGeneration:
+    """Предварительная генерация в фоне, пока пользователь заполняет форму: сканирование проекта,
+    описание README.md и, если release=True, информация о релизе. Ответы ИИ попадают в кэш по хэшу
+    запроса, поэтому публикация использует их, только если данные проекта и настройки не изменились;
+    генерацию, которая еще выполняется, публикация дожидается, а устаревшую - отменяет.
+    В папке проекта ничего не меняется."""
+
+    def __init__(self, project_path, repo_name, stream_llm=True, release=False, log=None):
+        self.project_path = project_path
+        self.repo_name = repo_name
+        self.stream_llm = stream_llm
+        self.release = release
+        self.log = log or (lambda message: None)
+        self._cancelled = False
+        self._pipeline = None
+        self._generator = None
+        self._thread = None
+
+    def start(self):
+        self._thread = threading.Thread(target=self._run, name="speculative-generation", daemon=True)
+        self._thread.start()
+        return self
+
+    def cancel(self):
+        """Прерывает предварительную генерацию (выбрана другая папка); можно вызывать из любого потока"""
+        self._cancelled = True
+        for task in (self._pipeline, self._generator):
+            if task is not None:
+                task.cancel_generation()
+
+    def is_running(self):
+        return self._thread is not None and self._thread.is_alive()
+
+    def _log(self, message):
+        self.log(f"[Предварительная генерация] {message}")
+
+    def _run(self):
+        from publisher_core import PublishPipeline
+        from release_core import ReleaseInfoGenerator
+        from ollama_client import GenerationCancelled
+        from run_metrics import RunMetrics
+
+        metrics = RunMetrics("speculative", self.project_path, self.repo_name)
+        started = time.perf_counter()
+        self._log("Анализ проекта и генерация README.md в фоне...")
+        try:
+            self._pipeline = PublishPipeline(self.project_path, self.repo_name, True, self.stream_llm,
+                                             log=self._log, metrics=metrics, speculative=True)
+            if self._cancelled:
+                raise GenerationCancelled()
+            self._pipeline.precompute_readme()
+            if self.release and not self._cancelled:
+                self._generator = ReleaseInfoGenerator(self.project_path, self.repo_name, stream_llm=self.stream_llm,
+                                                       log=self._log, metrics=metrics, speculative=True)
+                if self._cancelled:
+                    raise GenerationCancelled()
+                self._generator.generate()
+            if self._cancelled or self._pipeline.ollama_client.is_cancelled():
+                raise GenerationCancelled()
+        except GenerationCancelled as e:
+            metrics.finish("cancelled", e)
+            self._log("Остановлена: ее результат больше не нужен.")
+            return
+        except Exception as e:
+            metrics.finish("error", e)
+            self._log(f"Ошибка: {e}. Генерация будет выполнена при публикации.")
+            return
+        metrics.finish()
+        self._log(f"Готово за {time.perf_counter() - started:.1f} с: публикация использует готовый результат, "
+                  f"если проект не изменится.")
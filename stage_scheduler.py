@@ -0,0 +1,84 @@
+import threading
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+
+
+class StageScheduler:
+    """Выполняет этапы с зависимостями (DAG): этап запускается, как только завершены все этапы,
+    от которых он зависит, независимые этапы выполняются одновременно в пуле потоков.
+    Этап - функция func(results), где results - словарь результатов уже выполненных этапов.
+    При ошибке новые этапы не запускаются, вызываются on_failure(), выполняющиеся этапы
+    дожидаются завершения, и run() выбрасывает первую ошибку."""
+
+    def __init__(self, max_workers=4, log=None):
+        self.max_workers = max_workers
+        self.log = log or (lambda message: None)
+        self.stages = {}  # имя -> (функция, зависимости), в порядке добавления
+        self.results = {}
+        self._on_failure = []
+        self._lock = threading.Lock()
+
+    def add(self, name, func, after=()):
+        if name in self.stages:
+            raise ValueError(f"Этап '{name}' уже добавлен")
+        self.stages[name] = (func, tuple(after))
+
+    def on_failure(self, callback):
+        """callback() вызывается при первой ошибке, например чтобы прервать долгую генерацию ИИ"""
+        self._on_failure.append(callback)
+
+    def _check(self):
+        for name, (_, after) in self.stages.items():
+            for dependency in after:
+                if dependency not in self.stages:
+                    raise ValueError(f"Этап '{name}' зависит от неизвестного этапа '{dependency}'")
+        # Поиск цикла: этапы без невыполненных зависимостей снимаются, пока это возможно
+        remaining = {name: set(after) for name, (_, after) in self.stages.items()}
+        while remaining:
+            ready = [name for name, after in remaining.items() if not after]
+            if not ready:
+                raise ValueError(f"Циклическая зависимость этапов: {', '.join(sorted(remaining))}")
+            for name in ready:
+                del remaining[name]
+            for after in remaining.values():
+                after.difference_update(ready)
+
+    def _run_stage(self, name, func):
+        result = func(self.results)
+        with self._lock:
+            self.results[name] = result
+        return result
+
+    def run(self):
+        """Выполняет все этапы и возвращает словарь их результатов"""
+        self._check()
+        pending = dict(self.stages)
+        done = set()
+        running = {}
+        error = None
+        with ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="stage") as executor:
+            while pending or running:
+                if error is None:
+                    # Этапы запускаются в порядке добавления, как только готовы их зависимости
+                    for name, (func, after) in list(pending.items()):
+                        if done.issuperset(after):
+                            del pending[name]
+                            running[executor.submit(self._run_stage, name, func)] = name
+                if not running:
+                    break
+                finished, _ = wait(running, return_when=FIRST_COMPLETED)
+                for future in finished:
+                    name = running.pop(future)
+                    try:
+                        future.result()
+                        done.add(name)
+                    except BaseException as e:
+                        if error is None:
+                            error = e
+                            for callback in self._on_failure:
+                                try:
+                                    callback()
+                                except Exception as callback_error:
+                                    self.log(f"Ошибка при остановке этапов: {callback_error}")
+        if error is not None:
+            raise error
+        return self.results